@@ -25,6 +25,10 @@ from .extensions import mail
 from .extensions import security
 from .extensions import oauth
 from .extensions import rq
+from .extensions import templates
+from .extensions import permissions
+from .extensions import responses
+from .extensions import counts
 
 from .errors import load_errorhandlers
 
@@ -55,6 +59,16 @@ def create_application(name = __name__, env = 'testing'):
 
     rq.init_app(app)
 
+    # Setup the Template cache that is shared across requests
+    templates.configure(size=app.config.get('TEMPLATE_CACHE_SIZE'), ttl=app.config.get('TEMPLATE_CACHE_TTL'))
+    permissions.configure(ttl=app.config.get('TEMPLATE_CACHE_TTL'))
+
+    # Setup the public response cache that is shared by every worker
+    responses.configure(ttl=app.config.get('RESPONSE_CACHE_TTL'))
+
+    # Setup the Feature counts that are shared by every worker
+    counts.configure(ttl=app.config.get('FEATURE_COUNTS_TTL'))
+
     """
     Setup Flask Security 
     
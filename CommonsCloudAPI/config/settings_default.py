@@ -71,3 +71,72 @@ FILE_ATTACHMENTS_ALLOWED_EXTENSIONS = set([
   'jpeg',
   'gif'
 ])
+
+
+# Feature Storage
+#
+# Compare the schema we build from each Template's Fields to the schema in the
+# database catalog every time a model is built. This is expensive and should
+# only be turned on while debugging.
+STORAGE_SCHEMA_CHECK = False
+
+# The number of Features read from the database at a time while a list of
+# Features is being streamed to the user
+FEATURE_STREAM_BATCH_SIZE = 100
+
+# The number of Features inserted in each transaction while importing
+FEATURE_BATCH_CHUNK_SIZE = 1000
+
+# The number of CSV rows each import job is responsible for, larger files are
+# split into several jobs that run in parallel on however many workers exist
+FEATURE_IMPORT_CHUNK_ROWS = 50000
+
+# Templates
+#
+# The number of Templates (and their Fields) each worker process keeps in
+# memory and the number of seconds before they are loaded again.
+TEMPLATE_CACHE_SIZE = 256
+TEMPLATE_CACHE_TTL = 300
+
+# Responses
+#
+# The number of seconds complete responses for public Feature Collections are
+# kept in Redis. Any change to a Feature, Template, or Field removes them
+# right away, this only limits how long unused responses take up memory.
+RESPONSE_CACHE_TTL = 300
+
+# Feature Counts
+#
+# The number of seconds the Feature counts of a Feature Collection are kept
+# in Redis before they are counted again, this corrects any change we weren't
+# able to follow (e.g., an update made directly in the database).
+FEATURE_COUNTS_TTL = 3600
+
+# The number of distinct values along each axis that TopoJSON coordinates are
+# snapped to, unless the user asks for something else
+TOPOJSON_QUANTIZATION = 10000
+
+# The size of the grid vector tile coordinates are snapped to and how far
+# (in the same units) geometries extend past the edge of each tile
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+# The most Features a nearest Feature search can return
+NEAREST_MAX_RESULTS = 100
+
+# The width (in pixels at the requested zoom level) of the cells Features are
+# counted in when a region is aggregated instead of listed
+AGGREGATE_CELL_PIXELS = 64
+
+# Notifications
+#
+# Notifications are delivered by the RQ workers. One that fails is tried again
+# after NOTIFICATION_RETRY_DELAY seconds, then twice that, and so on, until it
+# has been tried NOTIFICATION_MAX_ATTEMPTS times and is recorded as a failure.
+#
+# Retries wait in the notification_retry table until they are due and are then
+# queued on the default queue, whenever Notifications are sent and by running
+# `python manage_notifications.py <environment> sweep` (e.g., every minute
+# from cron).
+NOTIFICATION_MAX_ATTEMPTS = 5
+NOTIFICATION_RETRY_DELAY = 30
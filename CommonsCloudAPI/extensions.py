@@ -30,6 +30,12 @@ from CommonsCloudAPI.utilities.sanitize import CommonsSanitize
 from CommonsCloudAPI.utilities.statuses import CommonsStatus
 
 from CommonsCloudAPI.utilities.oauth import CommonsOAuth2Provider
+from CommonsCloudAPI.utilities.registry import CommonsModelRegistry
+from CommonsCloudAPI.utilities.cache import CommonsCache
+from CommonsCloudAPI.utilities.generations import CommonsGenerations
+from CommonsCloudAPI.utilities.counts import CommonsCounts
+from CommonsCloudAPI.utilities.responses import CommonsResponseCache
+from CommonsCloudAPI.utilities.indexes import CommonsIndexes
 
 
 """
@@ -43,6 +49,13 @@ principal = Principal()
 status = CommonsStatus()
 sanitize = CommonsSanitize()
 rq = RQ()
+registry = CommonsModelRegistry()
+generations = CommonsGenerations()
+templates = CommonsCache()
+permissions = CommonsCache(size=16)
+counts = CommonsCounts()
+responses = CommonsResponseCache()
+indexes = CommonsIndexes()
 
 """
 Signals
@@ -17,6 +17,8 @@ Import Python/System Dependencies
 import uuid
 
 from collections import OrderedDict
+from datetime import datetime
+from datetime import timedelta
 
 
 """
@@ -24,6 +26,8 @@ Import Flask Dependencies
 """
 from flask import current_app
 
+from werkzeug.http import http_date
+
 
 """
 A Base Class for defining how content should be formatted, this class
@@ -53,12 +57,13 @@ class FormatContent(object):
       A flag to identify whether or not the content needs to be serialized
       before it is processed by our formatting tasks
   """
-  def __init__(self, data, serialize=False, exclude_fields=[], list_name=[], last_modified="", **extras):
+  def __init__(self, data, serialize=False, exclude_fields=[], list_name=[], last_modified="", etag="", **extras):
     self.the_content = data
     self.serialize = serialize
     self.exclude_fields = exclude_fields
     self.list_name = list_name
     self.last_modified = last_modified
+    self.etag = etag
     self.extras = extras
 
 
@@ -139,3 +144,47 @@ class FormatContent(object):
 
     return filename
 
+
+  """
+  Make sure we're caching the responses for 30 days to speed things up,
+  then setting modification and expiration dates appropriately
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (object) response
+      The Flask response object we are adding headers to
+
+  @return (object) response
+      The same response with our CORS and caching headers added
+
+  """
+  def set_headers(self, response):
+
+    today = datetime.utcnow()
+
+    expires_ = self.extras.get('expires', today + timedelta(+364))
+    max_age_ = self.extras.get('max_age', 'max-age=2592000')
+    last_modified_ = self.last_modified or self.extras.get('last_modified', today)
+
+    if isinstance(last_modified_, datetime):
+      last_modified_ = http_date(last_modified_)
+
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    response.headers.add('Access-Control-Allow-Headers', 'Authorization, Accept, Content-Type, X-Requested-With, Origin, Access-Control-Request-Method, Access-Control-Request-Headers, Cache-Control, Expires, Set-Cookie')
+    response.headers.add('Access-Control-Allow-Credentials', True)
+    response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, OPTIONS, DELETE')
+
+    response.headers.add('Last-Modified', last_modified_)
+    response.headers.add('Expires', expires_)
+    response.headers.add('Pragma', max_age_)
+    response.headers.add('Cache-Control', max_age_)
+
+    """
+    The ETag lets clients ask us if anything has changed since their last
+    request (see CommonsModel.not_modified)
+    """
+    if self.etag:
+      response.set_etag(self.etag, weak=True)
+
+    return response
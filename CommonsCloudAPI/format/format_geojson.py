@@ -11,17 +11,13 @@ limitations under the License.
 """
 
 
-"""
-Import Python Dependencies
-"""
-from datetime import datetime
-from datetime import timedelta
-
-
 """
 Import Flask Dependencies
 """
+from flask import json
 from flask import jsonify
+from flask import Response
+from flask import stream_with_context
 
 from geojson import Feature
 from geojson import FeatureCollection
@@ -42,6 +38,7 @@ A class for formatting objects in Java Script Object Notation or JSON
 @requires ForamtContent
 
 @method create
+@method stream
 
 """
 class GeoJSON(FormatContent):
@@ -61,12 +58,6 @@ class GeoJSON(FormatContent):
   """
   def create(self):
 
-    today = datetime.utcnow()
-
-    expires_ = self.extras.get('expires', today + timedelta(+364))
-    max_age_ = self.extras.get('max_age', 'max-age=2592000')
-    last_modified_ = self.extras.get('last_modified', today)
-
     # logger.warning('self.the_content %s', self.the_content.keys())
 
     if 'features' in self.the_content.keys():
@@ -117,18 +108,63 @@ class GeoJSON(FormatContent):
         response = jsonify(Feature(**arguments))
 
 
-    """
-    Make sure we're caching the responses for 30 days to speed things up,
-    then setting modification and expiration dates appropriately
-    """
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Authorization, Accept, Content-Type, X-Requested-With, Origin, Access-Control-Request-Method, Access-Control-Request-Headers, Cache-Control, Expires, Set-Cookie')
-    response.headers.add('Access-Control-Allow-Credentials', True)
-    response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, OPTIONS, DELETE')
+    return self.set_headers(response)
+
+
+  """
+  Creates a GeoJSON FeatureCollection that is sent to the user one Feature
+  at a time, instead of building the entire collection in memory first
+
+  @requires
+      from flask import Response
+      from flask import stream_with_context
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (object) response
+      A streaming response with the same structure as `create`
+
+  """
+  def stream(self):
+
+    response = Response(stream_with_context(self.generate()), mimetype='application/json')
+
+    return self.set_headers(response)
+
+
+  """
+  Yield the FeatureCollection envelope, each Feature, and finally the
+  properties (e.g., paging, statistics) as individual chunks of JSON
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (generator) chunks
+      Strings that together make up a valid GeoJSON document
+
+  """
+  def generate(self):
+
+    yield '{"type": "FeatureCollection", "features": ['
+
+    for index, feature in enumerate(self.the_content):
+
+      properties = {}
+
+      for property_ in feature:
+        if property_ != 'geometry':
+          properties[property_] = feature[property_]
+
+      this_feature = {
+        'type': 'Feature',
+        'geometry': feature.get('geometry', None),
+        'id': feature.get('id', None),
+        'properties': properties
+      }
 
-    response.headers.add('Last-Modified', last_modified_)
-    response.headers.add('Expires', expires_)
-    response.headers.add('Pragma', max_age_)
-    response.headers.add('Cache-Control', max_age_)
+      if index:
+        yield ','
+      yield json.dumps(this_feature)
 
-    return response
+    yield '], "properties": %s}' % (json.dumps(self.extras))
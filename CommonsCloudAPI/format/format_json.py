@@ -11,17 +11,13 @@ limitations under the License.
 """
 
 
-"""
-Import Python Dependencies
-"""
-from datetime import datetime
-from datetime import timedelta
-
-
 """
 Import Flask Dependencies
 """
+from flask import json
 from flask import jsonify
+from flask import Response
+from flask import stream_with_context
 
 
 """
@@ -39,6 +35,7 @@ A class for formatting objects in Java Script Object Notation or JSON
 @requires ForamtContent
 
 @method create
+@method stream
 
 """
 class JSON(FormatContent):
@@ -58,13 +55,7 @@ class JSON(FormatContent):
   """
   def create(self):
 
-    today = datetime.utcnow()
-
-    expires_ = self.extras.get('expires', today + timedelta(+364))
-    max_age_ = self.extras.get('max_age', 'max-age=2592000')
-    last_modified_ = self.extras.get('last_modified', today)
-
-    logger.warning('Extras %s %s', self.extras, self.extras.get('expires', expires_))
+    logger.warning('Extras %s', self.extras)
 
     content = {}
 
@@ -76,19 +67,49 @@ class JSON(FormatContent):
       "properties": self.extras
     })
 
-    """
-    Make sure we're caching the responses for 30 days to speed things up,
-    then setting modification and expiration dates appropriately
-    """
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Authorization, Accept, Content-Type, X-Requested-With, Origin, Access-Control-Request-Method, Access-Control-Request-Headers, Cache-Control, Expires, Set-Cookie')
-    response.headers.add('Access-Control-Allow-Credentials', True)
-    response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, OPTIONS, DELETE')
+    return self.set_headers(response)
+
+
+  """
+  Creates a JSON response that is sent to the user one Feature at a time,
+  instead of building the entire list in memory before sending it
+
+  @requires
+      from flask import Response
+      from flask import stream_with_context
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (object) response
+      A streaming response with the same structure as `create`
+
+  """
+  def stream(self):
+
+    response = Response(stream_with_context(self.generate()), mimetype='application/json')
+
+    return self.set_headers(response)
+
+
+  """
+  Yield the response envelope, each Feature, and finally the properties
+  (e.g., paging, statistics) as individual chunks of JSON
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (generator) chunks
+      Strings that together make up a valid JSON document
+
+  """
+  def generate(self):
 
-    response.headers.add('Last-Modified', last_modified_)
-    response.headers.add('Expires', expires_)
-    response.headers.add('Pragma', max_age_)
-    response.headers.add('Cache-Control', max_age_)
+    yield '{"response": {%s: [' % (json.dumps(self.list_name))
 
+    for index, object_ in enumerate(self.the_content):
+      if index:
+        yield ','
+      yield json.dumps(object_)
 
-    return response
+    yield '], "properties": %s}' % (json.dumps(self.extras))
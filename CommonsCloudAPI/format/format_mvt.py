@@ -0,0 +1,53 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import Flask Dependencies
+"""
+from flask import Response
+
+
+"""
+Import CommonsCloudAPI Dependencies
+"""
+from . import FormatContent
+
+
+"""
+A class for sending Mapbox Vector Tiles, which are encoded by PostGIS
+
+@requires ForamtContent
+
+@method create
+
+"""
+class MVT(FormatContent):
+
+  """
+  Creates a response containing a single vector tile
+
+  @requires
+      from flask import Response
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (object) response
+      A response with the binary tile as its body
+
+  """
+  def create(self):
+
+    response = Response(self.the_content or '', mimetype='application/vnd.mapbox-vector-tile')
+
+    return self.set_headers(response)
@@ -11,34 +11,25 @@ limitations under the License.
 """
 
 
-"""
-Import Python Dependencies
-"""
-from datetime import datetime
-from datetime import timedelta
-
 
 """
 Import Flask Dependencies
 """
+from flask import current_app
 from flask import jsonify
+from flask import request
 
-from geojson import Feature
-from geojson import FeatureCollection
-
-from topojson import topojson
 
 """
 Import CommonsCloudAPI Dependencies
 """
 from . import FormatContent
 
-from CommonsCloudAPI.extensions import db
-from CommonsCloudAPI.extensions import logger
+from CommonsCloudAPI.utilities.topology import encode_topology
 
 
 """
-A class for formatting objects in Java Script Object Notation or JSON
+A class for formatting objects in TopoJSON
 
 @requires ForamtContent
 
@@ -48,7 +39,12 @@ A class for formatting objects in Java Script Object Notation or JSON
 class TopoJSON(FormatContent):
 
   """
-  Creates a JSON file based on user requested content
+  Creates a TopoJSON Topology based on user requested content
+
+  Unlike GeoJSON, boundaries shared by neighboring Features are only sent
+  once and coordinates are quantized (see encode_topology). The number of
+  distinct values along each axis can be changed with the `quantization`
+  parameter, `quantization=0` sends the original coordinates.
 
   @requires
       from flask import jsonify
@@ -57,79 +53,31 @@ class TopoJSON(FormatContent):
       The object we are acting on behalf of
 
   @return (method) jsonify
-      A jsonified object ready for displayin the browser as JSON
+      A jsonified Topology ready for displaying in the browser
 
   """
   def create(self):
 
-    today = datetime.utcnow()
-
-    expires_ = self.extras.get('expires', today + timedelta(+364))
-    max_age_ = self.extras.get('max_age', 'max-age=2592000')
-    last_modified_ = self.extras.get('last_modified', today)
-
-    # logger.warning('self.the_content %s', self.the_content.keys())
-
-    if 'features' in self.the_content.keys():
-
-        features = []
+    quantization = request.args.get('quantization', current_app.config.get('TOPOJSON_QUANTIZATION', 10000))
 
-        for feature in self.the_content['features']:
+    try:
+      quantization = max(0, int(quantization))
+    except (TypeError, ValueError):
+      quantization = current_app.config.get('TOPOJSON_QUANTIZATION', 10000)
 
-          properties = {}
+    if quantization == 1:
+      quantization = 2
 
-          for property_ in feature:
-            if property_ != 'geometry':
-              properties[property_] = feature[property_]
+    list_name = self.list_name or 'features'
 
-          arguments = {
-            'geometry': feature.get('geometry', None),
-            'id': feature.get('id', None),
-            'properties': properties
-          }
-
-          try:
-            this_feature = Feature(**arguments)
-          except Exception, e:
-            logger.warning("Couldn't create object for GeoJSON %s > %s", feature.get('id', None), arguments)
-            this_feature = None
-
-          features.append(this_feature)
-
-        arguments = {
-          'properties': self.extras
-        }
-
-        response = jsonify(FeatureCollection(features, **arguments))
+    if list_name in self.the_content:
+      features = self.the_content[list_name]
     else:
+      features = [self.the_content]
 
-        properties = {}
-
-        for property_ in self.the_content:
-          if property_ != 'geometry':
-            properties[property_] = self.the_content[property_]
-
-        arguments = {
-          'geometry': self.the_content.get('geometry', None),
-          'id': self.the_content.get('id', None),
-          'properties': properties
-        }
-
-        response = jsonify(Feature(**arguments))
-
-
-    """
-    Make sure we're caching the responses for 30 days to speed things up,
-    then setting modification and expiration dates appropriately
-    """
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Authorization, Accept, Content-Type, X-Requested-With, Origin, Access-Control-Request-Method, Access-Control-Request-Headers, Cache-Control, Expires, Set-Cookie')
-    response.headers.add('Access-Control-Allow-Credentials', True)
-    response.headers.add('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, OPTIONS, DELETE')
+    topology = encode_topology(features, name=list_name, quantization=quantization)
+    topology['properties'] = self.extras
 
-    response.headers.add('Last-Modified', last_modified_)
-    response.headers.add('Expires', expires_)
-    response.headers.add('Pragma', max_age_)
-    response.headers.add('Cache-Control', max_age_)
+    response = jsonify(topology)
 
-    return response
+    return self.set_headers(response)
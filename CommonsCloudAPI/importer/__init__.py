@@ -9,3 +9,55 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+
+"""
+Import System Dependencies
+"""
+import os
+
+
+"""
+Import Flask Dependencies
+"""
+from flask import current_app
+from flask import has_app_context
+
+
+"""
+The application our import jobs run inside of when they are executed by an
+RQ worker, created the first time a job needs it
+"""
+_application = None
+
+
+"""
+Import jobs are executed by RQ workers, outside of any request, but they
+use the same models as the API does. This gives them an application context
+to do that in, creating the application for the worker process if one
+doesn't exist yet.
+
+The environment is read from COMMONSCLOUD_ENV (e.g., production, testing)
+and defaults to the same environment `create_application` does.
+
+@return (object) context
+    A Flask application context
+"""
+def importer_context():
+
+  global _application
+
+  if has_app_context():
+    return current_app._get_current_object().app_context()
+
+  if _application is None:
+
+    from CommonsCloudAPI import create_application
+
+    environment = os.environ.get('COMMONSCLOUD_ENV', None)
+
+    if environment:
+      _application = create_application(env=environment)
+    else:
+      _application = create_application()
+
+  return _application.app_context()
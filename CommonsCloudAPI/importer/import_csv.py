@@ -15,94 +15,531 @@ limitations under the License.
 Import Python/System Dependencies
 """
 import csv
+import itertools
 import json
+import os
+import resource
+import time
 import urllib2
 
+from datetime import datetime
+from decimal import InvalidOperation
+
 
 """
 Import Flask Dependencies
 """
+from flask import current_app
+
 from flask.ext.rq import job
 
+from sqlalchemy import text
+
 
 """
 Import Commons Cloud Dependencies
 """
+from CommonsCloudAPI.extensions import db
+from CommonsCloudAPI.extensions import logger
 from CommonsCloudAPI.extensions import rq
 
+from CommonsCloudAPI.importer import importer_context
+
+
+"""
+The number of row errors we keep in the Activity for each import, any more
+than this are only counted
+"""
+IMPORT_ERROR_LIMIT = 1000
+
 
 """
 Imports features from a CSV file based on user defined content
 
-@requires
-    import csv
-    from .forfmat import FormatContent
+The whole file is imported by a single job, see import_csv_chunk for how
+each part of the file is imported.
+
+@param (string) filename
+    The URL (or local path) of the CSV file
 
-@param (object) self
-    The object we are acting on behalf of
+@param (string) storage
+    The storage name of the Feature Collection
+
+@param (list) template_fields
+    A list of Field dictionaries (see Feature.safe_field_list)
+
+@param (int) activity_id
+    The unique ID of the Activity tracking this import
 
 """
 @job
 def import_csv(filename, storage, template_fields, activity_id):
+  return run_import(filename, storage, template_fields, activity_id, 0, None)
 
-  """
-  Ensure we have a valid URL, the nominal case is 
-  """
-  filename_ = validate_url(filename)
-  
-  """
-  List of new features that has been created
-  """
-  features = []
-  headers = []
 
-  print filename_
+"""
+Imports a range of rows from a CSV file based on user defined content
 
-  """
-  Open the CSV from a remote server (AmazonS3)
-  """
-  try:
-    response = urllib2.urlopen(filename_)
-    reader = csv.reader(response)
-  except urllib2.HTTPError as error:
-      reader = error.read()
+Large files are split into several of these jobs by Feature.feature_import
+so that they can run on every available worker at the same time. Each job
+is a pipeline of generators, so only a single chunk of rows is ever held in
+memory no matter how large the file is:
+
+1. Download only the header row and the bytes of our range of rows, and
+   read each row as it is downloaded
+2. Map the header row to our Fields and build a Feature from each row
+3. Coerce each value to the data type of its Field
+4. Group the Features into fixed size chunks and write each chunk straight
+   to the Feature Collection's storage table
+
+Each chunk adds its progress to the Activity as soon as it is written. When
+the job is done it adds its results to the Activity and, if it was the last
+job for the import to finish, marks the Activity as complete. A job that
+fails marks the Activity as failed.
+
+@param (string) filename
+    The URL (or local path) of the CSV file
+
+@param (string) storage
+    The storage name of the Feature Collection
+
+@param (list) template_fields
+    A list of Field dictionaries (see Feature.safe_field_list)
+
+@param (int) activity_id
+    The unique ID of the Activity tracking this import
+
+@param (int) start_row
+    The first row to import, counted from the first row after the header
+
+@param (int) end_row
+    The row to stop before, or None to import the rest of the file
+
+@param (tuple) byte_range
+    The byte offset of the end of the header row and of the start and end
+    of the rows to import (see Feature.feature_import_chunks). Only those
+    bytes are read, so each job reads its own part of the file instead of
+    the whole file. Without it every row before `start_row` is read and
+    skipped.
+
+"""
+@job
+def import_csv_chunk(filename, storage, template_fields, activity_id, start_row, end_row, byte_range=None):
+  return run_import(filename, storage, template_fields, activity_id, start_row, end_row, byte_range)
+
+
+def run_import(filename, storage, template_fields, activity_id, start_row, end_row, byte_range=None):
+
+  with importer_context():
+
+    from CommonsCloudAPI.models.activity import Activity
+    from CommonsCloudAPI.models.feature import Feature
+    from CommonsCloudAPI.models.template import get_template
+
+    progress = {
+      'start_row': start_row,
+      'end_row': end_row,
+      'processed': 0,
+      'created': 0,
+      'error_count': 0,
+      'errors': [],
+      'rows_per_second': 0,
+      'peak_rss_kb': 0,
+      'started': time.time()
+    }
+
+    try:
+      Feature_ = Feature()
+
+      storage_ = Feature_.validate_storage(storage)
+      Template_ = get_template(storage_)
+      Storage_ = Feature_.get_storage(Template_)
+
+      import_csv_started(activity_id)
+
+      chunk_size = current_app.config.get('FEATURE_BATCH_CHUNK_SIZE', 1000)
+
+      if byte_range:
+        rows = open_import_range(filename, *byte_range)
+      else:
+        rows = skip_import_rows(open_import_file(filename), start_row, end_row)
+
+      features = build_import_features(rows, template_fields)
+      features = coerce_import_features(Feature_, features, template_fields)
+
+      for chunk in chunk_import_features(features, chunk_size):
+        import_chunk(Feature_, chunk, Storage_, Template_, activity_id, progress)
+
+    except Exception as error:
+
+      """
+      Record the error and count the job as finished, so the Activity shows
+      that the import failed instead of waiting on this job forever
+      """
+      db.session.rollback()
+
+      logger.exception('Import of rows %s to %s into %s failed', start_row, end_row, storage)
+
+      progress['error'] = unicode(error)
+
+      import_csv_complete(activity_id, progress, failed=True)
+
+      raise
+
+    logger.info('Imported %d of %d features (rows %s to %s) into %s at %s rows per second', progress['created'], progress['processed'], start_row, end_row, storage_, progress['rows_per_second'])
+
+    if import_csv_complete(activity_id, progress):
+
+      activity_ = Activity.query.get(activity_id)
+
+      """
+      Send an email notifying the user of the completed import
+      """
+      if activity_.status == 'Complete':
+        Feature_.send_import_complete_email([activity_.notify])
+
+    return progress
+
+
+"""
+Mark an import as being processed, unless another of its jobs has already
+failed, and remember when the first of its jobs started
+"""
+def import_csv_started(activity_id):
+
+  statement = text("""
+    UPDATE activity
+       SET status = CASE WHEN status = 'Failed' THEN status ELSE 'Processing' END,
+           started = coalesce(started, :updated),
+           updated = :updated
+     WHERE id = :activity_id
+  """)
+
+  db.session.execute(statement, {
+    'updated': datetime.now(),
+    'activity_id': activity_id
+  })
+
+  db.session.commit()
+
+
+"""
+Write a single chunk of Features to the database and add its progress to
+the Activity
+
+The counters are added to in a single UPDATE, so jobs for the same import
+running on different workers never overwrite one another. The throughput is
+every row processed so far over the time since the first job started.
+"""
+def import_chunk(Feature_, features, Storage_, Template_, activity_id, progress):
+
+  offset = progress['start_row'] + progress['processed']
+
+  created, errors = Feature_.feature_bulk_create(features, Storage_, Template_, offset)
+
+  progress['processed'] += len(features)
+  progress['created'] += created
+  progress['error_count'] += len(errors)
+  progress['errors'] += errors[:max(0, IMPORT_ERROR_LIMIT - len(progress['errors']))]
+
+  elapsed = time.time() - progress['started']
+
+  if elapsed > 0:
+    progress['rows_per_second'] = round(progress['processed'] / elapsed, 2)
+
+  progress['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+  statement = text("""
+    UPDATE activity
+       SET rows_processed = coalesce(rows_processed, 0) + :processed,
+           rows_created = coalesce(rows_created, 0) + :created,
+           rows_failed = coalesce(rows_failed, 0) + :failed,
+           rows_per_second = round(((coalesce(rows_processed, 0) + :processed) / greatest(extract(epoch FROM :updated - coalesce(started, :updated)), 1))::numeric, 2),
+           peak_rss_kb = greatest(coalesce(peak_rss_kb, 0), :peak_rss_kb),
+           updated = :updated
+     WHERE id = :activity_id
+  """)
+
+  db.session.execute(statement, {
+    'processed': len(features),
+    'created': created,
+    'failed': len(errors),
+    'peak_rss_kb': progress['peak_rss_kb'],
+    'updated': datetime.now(),
+    'activity_id': activity_id
+  })
+
+  db.session.commit()
+
+
+"""
+Record that one of the jobs for an import has finished
+
+The results of the job are appended to the Activity as a line of JSON and
+the number of completed chunks is incremented in the same statement, so
+jobs finishing at the same time on different workers never overwrite one
+another. A job that failed marks the whole import as failed, and the last
+job to finish marks it complete unless one of them failed.
+
+@param (int) activity_id
+    The unique ID of the Activity tracking this import
+
+@param (dict) progress
+    The results of the job that just finished
+
+@param (bool) failed
+    True when the job stopped because of an error
+
+@return (bool) complete
+    True when this was the last job for the import to finish
+"""
+def import_csv_complete(activity_id, progress, failed=False):
+
+  statement = text("""
+    UPDATE activity
+       SET chunks_complete = coalesce(chunks_complete, 0) + 1,
+           result = coalesce(result, '') || :result,
+           status = CASE
+             WHEN :failed OR status = 'Failed' THEN 'Failed'
+             WHEN coalesce(chunks_complete, 0) + 1 >= greatest(coalesce(chunks_total, 0), 1) THEN 'Complete'
+             ELSE status
+           END,
+           updated = :updated
+     WHERE id = :activity_id
+ RETURNING chunks_complete, chunks_total
+  """)
+
+  counts = db.session.execute(statement, {
+    'result': json.dumps(progress) + '\n',
+    'failed': failed,
+    'updated': datetime.now(),
+    'activity_id': activity_id
+  }).first()
+
+  db.session.commit()
+
+  if counts is None:
+    return False
+
+  chunks_complete, chunks_total = counts
+
+  return chunks_complete >= (chunks_total or 1)
+
+
+"""
+Turn the rows of a CSV into Features, using the first row as the headers
+
+@param (generator) rows
+    The rows of the CSV file
 
-  """
-  Process each row of the CSV and save each row as a separate Feature
-  """
-  for index, row in enumerate(reader):
+@param (list) template_fields
+    A list of Field dictionaries
 
-    if not index:
+@return (generator) features
+    A Feature dictionary for each row after the header row
+"""
+def build_import_features(rows, template_fields):
+
+  headers = None
+
+  for row in rows:
+
+    if headers is None:
       headers = process_import_headers(row, template_fields)
       continue
 
-    feature_object = build_feature_object(row, headers)
+    yield build_feature_object(row, headers)
 
-    features.append(feature_object)
 
-  """
-  Send list of Features to our batch import function
-  """
-  batch_url = ('http://api.commonscloud.org/v2/type_%s/batch.json') % (storage)
-  # batch_url = ('http://127.0.0.1:5000/v2/type_%s/batch.json') % (storage)
-  data = {
-    'features': features,
-    'activity_id': activity_id
-  }
-  content_length = len(data)
-  timeout = 3600
+"""
+Convert the values of each Feature to the data types of their Fields.
+Values that can't be converted are left alone so that the bulk create can
+report them as errors for the row they belong to.
+
+@param (object) Feature_
+    A Feature object
+
+@param (generator) features
+    Feature dictionaries
+
+@param (list) template_fields
+    A list of Field dictionaries
+
+@return (generator) features
+    Feature dictionaries with converted values
+"""
+def coerce_import_features(Feature_, features, template_fields):
+
+  data_types = dict((field.get('name'), field.get('data_type')) for field in template_fields)
+
+  for feature in features:
+
+    for name, value in feature.items():
+
+      if isinstance(value, basestring):
+        value = value.strip()
+
+      if name in data_types:
+        try:
+          value = Feature_.feature_bulk_value(value, data_types[name])
+        except (ValueError, TypeError, InvalidOperation):
+          pass
+
+      feature[name] = value
+
+    yield feature
+
+
+"""
+Group Features into lists of a fixed size
+
+@param (generator) features
+    Feature dictionaries
+
+@param (int) chunk_size
+    The number of Features in each chunk
+
+@return (generator) chunks
+    Lists of no more than `chunk_size` Features
+"""
+def chunk_import_features(features, chunk_size):
+
+  chunk = []
+
+  for feature in features:
+
+    chunk.append(feature)
+
+    if len(chunk) >= chunk_size:
+      yield chunk
+      chunk = []
+
+  if chunk:
+    yield chunk
 
-  req = urllib2.Request(batch_url)
-  req.add_header('Content-Type', 'application/json')
-  # req.add_header('Content-Length', content_length)
 
-  response = urllib2.urlopen(req, json.dumps(data), timeout)
+"""
+Open the CSV from a remote server (AmazonS3) or, when it exists, from the
+local file system
+
+@param (string) filename
+    The URL or path of the CSV file
+
+@return (object) reader
+    A csv.reader that reads the file a row at a time
+"""
+def open_import_file(filename):
+
+  if os.path.exists(filename):
+    return csv.reader(open(filename, 'rb'))
+
+  response = urllib2.urlopen(validate_url(filename))
+
+  return csv.reader(response)
+
+
+"""
+Open the header row and a range of rows of the CSV, reading only their
+bytes from a remote server (with an HTTP Range request) or the local file
+system
+
+@param (string) filename
+    The URL or path of the CSV file
+
+@param (int) header_end
+    The byte offset of the end of the header row
+
+@param (int) start_byte
+    The byte offset of the first row to read
+
+@param (int) end_byte
+    The byte offset to stop reading at
+
+@return (object) reader
+    A csv.reader that reads the header row and then the range of rows
+"""
+def open_import_range(filename, header_end, start_byte, end_byte):
+
+  lines = itertools.chain(read_import_bytes(filename, 0, header_end), read_import_bytes(filename, start_byte, end_byte))
+
+  return csv.reader(lines)
+
+
+"""
+Read the lines between two byte offsets of a file, a line at a time
+
+A server that doesn't support Range requests sends the whole file, in that
+case everything before `start` is read and thrown away.
+
+@param (string) filename
+    The URL or path of the file
+
+@param (int) start
+    The byte offset of the first line
+
+@param (int) end
+    The byte offset to stop reading at, this must be the end of a line
+
+@return (generator) lines
+"""
+def read_import_bytes(filename, start, end):
+
+  if end <= start:
+    return
+
+  if os.path.exists(filename):
+    stream = open(filename, 'rb')
+    stream.seek(start)
+  else:
+    stream = urllib2.urlopen(urllib2.Request(validate_url(filename), headers={
+      'Range': 'bytes=%d-%d' % (start, end - 1)
+    }))
+
+    if stream.getcode() != 206:
+      skipped = 0
+      while skipped < start:
+        data = stream.read(min(start - skipped, 65536))
+        if not data:
+          break
+        skipped += len(data)
+
+  try:
+    remaining = end - start
+
+    while remaining > 0:
+      line = stream.readline(remaining)
+      if not line:
+        break
+      remaining -= len(line)
+      yield line
+  finally:
+    stream.close()
+
+
+"""
+Keep the header row and a range of the rows after it, the rows are skipped
+before they are turned into Features
+
+@param (object) rows
+    A csv.reader
+
+@param (int) start_row
+    The first row to keep, counted from the first row after the header
+
+@param (int) end_row
+    The row to stop before, or None to keep the rest of the rows
+
+@return (generator) rows
+"""
+def skip_import_rows(rows, start_row, end_row):
+
+  for header in rows:
+    yield header
+    break
 
+  for row in itertools.islice(rows, start_row, end_row):
+    yield row
 
-  """
-  Return a list of newly created Features
-  """
-  return response
 
 def build_feature_object(data, columns):
 
@@ -36,7 +36,7 @@ Define our individual models
 """
 class Activity(db.Model, CommonsModel):
 
-    __public__ = ['id', 'name', 'description', 'result', 'created', 'updated', 'status', 'template_id']
+    __public__ = ['id', 'name', 'description', 'result', 'created', 'updated', 'status', 'chunks_total', 'chunks_complete', 'started', 'rows_processed', 'rows_created', 'rows_failed', 'rows_per_second', 'peak_rss_kb', 'template_id']
     __tablename__ = 'activity'
     __table_args__ = {
         'extend_existing': True
@@ -50,9 +50,17 @@ class Activity(db.Model, CommonsModel):
     updated = db.Column(db.DateTime)
     status = db.Column(db.String(24))
     notify = db.Column(db.Text)
+    chunks_total = db.Column(db.Integer, default=0)
+    chunks_complete = db.Column(db.Integer, default=0)
+    started = db.Column(db.DateTime)
+    rows_processed = db.Column(db.Integer, default=0)
+    rows_created = db.Column(db.Integer, default=0)
+    rows_failed = db.Column(db.Integer, default=0)
+    rows_per_second = db.Column(db.Float, default=0)
+    peak_rss_kb = db.Column(db.Integer, default=0)
     template_id = db.Column(db.Integer, db.ForeignKey('template.id'))
 
-    def __init__(self, name="", description="", result="", created=datetime.now(), updated=datetime.now(), status=True, notify=[], template_id=""):
+    def __init__(self, name="", description="", result="", created=datetime.now(), updated=datetime.now(), status=True, notify=[], template_id="", chunks_total=0, chunks_complete=0):
         self.name = name
         self.description = description
         self.result = result
@@ -61,6 +69,8 @@ class Activity(db.Model, CommonsModel):
         self.status = status
         self.notify = notify
         self.template_id = template_id
+        self.chunks_total = chunks_total
+        self.chunks_complete = chunks_complete
 
     def activity_get(self, activity_id):
       activity_ = Activity.query.get(activity_id)
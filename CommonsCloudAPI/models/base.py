@@ -25,7 +25,9 @@ limitations under the License.
 """
 Import Python Dependencies
 """
+import hashlib
 import re
+import types
 import uuid
 import datetime
 
@@ -39,11 +41,11 @@ Import Flask Dependencies
 """
 from flask import abort
 from flask import request
+from flask import current_app
+from flask import Response
 
 import json
 
-from geoalchemy2.types import Geometry
-
 from sqlalchemy.orm import ColumnProperty
 
 from flask.ext.restless.helpers import to_dict
@@ -53,14 +55,21 @@ Import Commons Cloud Dependencies
 """
 from CommonsCloudAPI.extensions import db
 from CommonsCloudAPI.extensions import logger
+from CommonsCloudAPI.extensions import registry
 from CommonsCloudAPI.extensions import status as status_
 
+from CommonsCloudAPI.utilities.permissions import get_permissions
+
 from CommonsCloudAPI.format.format_csv import CSV
 from CommonsCloudAPI.format.format_geojson import GeoJSON
 from CommonsCloudAPI.format.format_json import JSON
+from CommonsCloudAPI.format.format_mvt import MVT
+from CommonsCloudAPI.format.format_topojson import TopoJSON
 
 from geoalchemy2.elements import WKBElement
-import geoalchemy2.functions as func
+
+from CommonsCloudAPI.utilities.geometry import GeoJSONGeometry
+from CommonsCloudAPI.utilities.geometry import wkb_to_geojson
 
 
 class CommonsModel(object):
@@ -117,9 +126,7 @@ class CommonsModel(object):
   def serialize_field(self, key, value):
 
     if 'geometry' in key and isinstance(value, WKBElement):
-      if db.session is not None:
-        geojson = str(db.session.scalar(func.ST_AsGeoJSON(value))) # To change precision of the geometry add a numeric value after the `value` variable
-        return json.loads(geojson)
+      return wkb_to_geojson(value.data)
     elif 'geometry' in key and isinstance(value, dict):
       return value
     elif 'geometry' in key and isinstance(value, str):
@@ -161,6 +168,25 @@ class CommonsModel(object):
 
       return list_
 
+  """
+  Serialize the objects in a generator as they are requested, so that they
+  can be streamed to the user without keeping the entire list in memory
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (generator) _content
+      A generator of objects to be serialized
+
+  @return (generator) result
+      A generator of dictionaries of the contents of our objects
+
+  """
+  def serialize_stream(self, _content):
+
+      for object_ in _content:
+        yield self.serialize_object(object_)
+
   """
   Remove all characters except for spaces and alpha-numeric characters,
   replace all spaces in a string with underscores, change all uppercase
@@ -193,6 +219,23 @@ class CommonsModel(object):
   """
   def generate_field_type(self, field, template):
 
+    if field.data_type == 'relationship':
+      return self.generate_relationship_field(field, template)
+    elif field.data_type == 'file':
+      return self.generate_attachment_field(field, template)
+
+    return self.get_field_type(field.data_type)
+
+  """
+  The PostgreSQL data type for each of the field types that are stored as a
+  column in the Template's storage table. Fields that aren't stored as a
+  column (e.g., relationship, file, fieldset) return None.
+
+  @param (string) data_type
+      The `data_type` of a Field object
+  """
+  def get_field_type(self, data_type):
+
     fields = {
       "float": db.Float(),
       "whole_number": db.Integer(),
@@ -207,12 +250,7 @@ class CommonsModel(object):
       "list": db.String(255)
     }
 
-    if field.data_type == 'relationship':
-      return self.generate_relationship_field(field, template)
-    elif field.data_type == 'file':
-      return self.generate_attachment_field(field, template)
-
-    return fields[field.data_type]
+    return fields.get(data_type, None)
 
   def generate_relationship_field(self, field, template):
 
@@ -260,18 +298,7 @@ class CommonsModel(object):
     """
     attachment_table_name = self.generate_template_hash(_prefix='attachment_')
 
-    new_table = db.Table(attachment_table_name, db.metadata,
-      db.Column('id', db.Integer, primary_key=True),
-      db.Column('caption', db.String(255)),
-      db.Column('credit', db.String(255)),
-      db.Column('credit_link', db.String(255)),
-      db.Column('filename', db.String(255)),
-      db.Column('filepath', db.String(255)),
-      db.Column('filetype', db.String(255)),
-      db.Column('filesize', db.Integer()),
-      db.Column('created', db.DateTime()),
-      db.Column('status', db.String(24), nullable=False)
-    )
+    new_table = db.Table(attachment_table_name, db.metadata, *self.get_attachment_columns())
 
     db.metadata.bind = db.engine
 
@@ -326,13 +353,7 @@ class CommonsModel(object):
     """
     Create a new custom table for a Feature Type
     """
-    new_table = db.Table(table_name, db.metadata,
-      db.Column('id', db.Integer(), primary_key=True),
-      db.Column('created', db.DateTime(), default=datetime.datetime.now()),
-      db.Column('updated', db.DateTime(), default=datetime.datetime.now()),
-      db.Column('geometry', Geometry('GEOMETRY'), nullable=True),
-      db.Column('status', db.String(24), nullable=False)
-    )
+    new_table = db.Table(table_name, db.metadata, *self.get_storage_columns())
 
 
     """
@@ -353,20 +374,10 @@ class CommonsModel(object):
     """
     users_table_name = table_name + '_users'
 
-    """
-    """
-    feature_id = table_name + '.id'
-
     """
     Create a new custom table for a Feature Type
     """
-    new_table = db.Table(users_table_name, db.metadata,
-      db.Column('user_id', db.Integer(), db.ForeignKey('user.id'), primary_key=True),
-      db.Column('feature_id', db.Integer(), db.ForeignKey(feature_id), primary_key=True),
-      db.Column('read', db.Boolean()),
-      db.Column('write', db.Boolean()),
-      db.Column('is_admin', db.Boolean())
-    )
+    new_table = db.Table(users_table_name, db.metadata, *self.get_storage_permission_columns(table_name))
 
     """
     Make sure everything commits to the database
@@ -394,9 +405,11 @@ class CommonsModel(object):
       return abort(404)
 
     """
-    Create a new custom table for a Feature Type
+    Load the existing table for this Feature Type, minus the field we are
+    about to add to it
     """
-    existing_table = db.Table(template.storage, db.metadata, autoload=True, autoload_with=db.engine)
+    existing_fields = [field_ for field_ in template.fields if field_.id != field.id]
+    existing_table = self.get_storage_table(template.storage, existing_fields)
 
     """
     We must bind the engine to the metadata here in order for our fields to
@@ -475,13 +488,16 @@ class CommonsModel(object):
 
     return new_column
 
-  def get_storage(self, template, fields=[], is_relationship=False, relationship=True):
+  def get_storage(self, template, fields=[], is_relationship=False, relationship=True, cached=True):
 
     if type(template) is str:
       class_name = str(template)
       relationships = []
+      storage_fields = None
+      version = None
     else:
       class_name = str(template.storage)
+      storage_fields = template.fields
 
       """
       Check to see if we need to load the full model or a slim model.
@@ -494,16 +510,40 @@ class CommonsModel(object):
       else:
         relationships = []
 
-    logger.debug('Dynamic Model executed for %s', class_name)
+      version = self.storage_version(template, relationship)
 
-    arguments = {
-      "class_name": class_name,
-      "relationships": relationships
-    }
+    """
+    Building a model is expensive, so we hand back the model we have already
+    built for this storage as long as the Template's fields haven't changed
+    since we built it.
+
+    Relationship models are built alongside the model that references them
+    and are never cached on their own, because the backref they receive is
+    specific to the parent model being built.
+    """
+    registry_key = (class_name, 'full' if relationships else 'slim')
 
-    class_arguments = self.get_class_arguments(**arguments)
+    Model = None
 
-    Model = type(class_name, (db.Model,), class_arguments)
+    if cached:
+      Model = registry.get(registry_key, version)
+
+    if Model is None:
+
+      logger.debug('Dynamic Model executed for %s', class_name)
+
+      arguments = {
+        "class_name": class_name,
+        "relationships": relationships,
+        "fields": storage_fields
+      }
+
+      class_arguments = self.get_class_arguments(**arguments)
+
+      Model = type(class_name, (db.Model,), class_arguments)
+
+      if cached:
+        registry.set(registry_key, version, Model)
 
 
     """
@@ -527,7 +567,9 @@ class CommonsModel(object):
 
       # Remove all duplicate names before passing along to public fields
       # self.__public__ = list(set(public_fields))
-      self.__public__['default'] = public_fields
+      self.__public__ = {
+        'default': public_fields
+      }
 
     return Model
 
@@ -537,7 +579,7 @@ class CommonsModel(object):
   us in building reliable SQLAlchemy models capable
   of handling many-to-many relationships.
   """
-  def get_class_arguments(self, class_name, relationships):
+  def get_class_arguments(self, class_name, relationships, fields=None):
 
     """
     Start an empty object to store all of our Class Arguments
@@ -546,10 +588,10 @@ class CommonsModel(object):
 
 
     """
-    Automatically load all of our basic table fields and other
-    meta information
+    Build all of our basic table fields and other meta information from
+    the Fields that make up the Template
     """
-    class_arguments['__table__'] = db.Table(class_name, db.metadata, autoload=True, autoload_with=db.engine)
+    class_arguments['__table__'] = self.get_storage_table(class_name, fields)
     class_arguments['__tablename__'] = class_name
     class_arguments['__table_args__'] = {
       "extend_existing": True
@@ -581,7 +623,7 @@ class CommonsModel(object):
 
         table_name = str(relationship.relationship)
 
-        RelationshipModel = self.get_storage(table_name, is_relationship=True)
+        RelationshipModel = self.get_storage(table_name, is_relationship=True, cached=False)
 
 
         """
@@ -591,25 +633,275 @@ class CommonsModel(object):
         parent_id_key = str(class_name) + '.id'
         child_id_key = table_name + '.id'
 
-        association_table = db.Table(str(relationship.association), db.metadata,
-            db.Column('parent_id', db.Integer, db.ForeignKey(parent_id_key), primary_key=True),
-            db.Column('child_id', db.Integer, db.ForeignKey(child_id_key), primary_key=True),
-            extend_existing = True,
-            autoload = True,
-            autoload_with = db.engine
-        )
+        association_columns = [
+          db.Column('parent_id', db.Integer, db.ForeignKey(parent_id_key), primary_key=True),
+          db.Column('child_id', db.Integer, db.ForeignKey(child_id_key), primary_key=True)
+        ]
+
+        association_table = self.compile_storage_table(str(relationship.association), association_columns)
 
         class_arguments[table_name] = db.relationship(RelationshipModel, secondary=association_table, cascade="", backref=class_name)
     
     logger.debug('Relationships > %s', relationship_message)
 
+    """
+    Keep track of the storage this model references so that the registry can
+    discard it when one of those storages changes
+    """
+    class_arguments['__relationships__'] = [str(relationship.relationship) for relationship in relationships]
+
     return class_arguments
 
 
+  """
+  The columns that every Feature storage table is created with. The `owner`
+  column isn't included because it is added after the User permissions for
+  the Template have been created.
+  """
+  def get_storage_columns(self):
+
+    return [
+      db.Column('id', db.Integer(), primary_key=True),
+      db.Column('created', db.DateTime(), default=datetime.datetime.now),
+      db.Column('updated', db.DateTime(), default=datetime.datetime.now),
+      db.Column('geometry', GeoJSONGeometry('GEOMETRY'), nullable=True),
+      db.Column('status', db.String(24), nullable=False)
+    ]
+
+
+  """
+  The columns of the `_users` table that holds Feature level permissions
+  """
+  def get_storage_permission_columns(self, table_name):
+
+    feature_id = table_name + '.id'
+
+    return [
+      db.Column('user_id', db.Integer(), db.ForeignKey('user.id'), primary_key=True),
+      db.Column('feature_id', db.Integer(), db.ForeignKey(feature_id), primary_key=True),
+      db.Column('read', db.Boolean()),
+      db.Column('write', db.Boolean()),
+      db.Column('is_admin', db.Boolean())
+    ]
+
+
+  """
+  The columns of an `attachment_` table
+  """
+  def get_attachment_columns(self):
+
+    return [
+      db.Column('id', db.Integer, primary_key=True),
+      db.Column('caption', db.String(255)),
+      db.Column('credit', db.String(255)),
+      db.Column('credit_link', db.String(255)),
+      db.Column('filename', db.String(255)),
+      db.Column('filepath', db.String(255)),
+      db.Column('filetype', db.String(255)),
+      db.Column('filesize', db.Integer()),
+      db.Column('created', db.DateTime()),
+      db.Column('status', db.String(24), nullable=False)
+    ]
+
+
+  """
+  Build the SQLAlchemy Table for a storage straight from what we already know
+  about it, instead of asking the database catalog for every column.
+
+  1. `type_` tables are built from the Fields that make up their Template
+  2. `_users`, `attachment_` and `ref_` tables always have the same columns
+
+  Anything we can't describe ourselves falls back to reflection.
+
+  @param (string) class_name
+      The name of the table (e.g., type_XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX)
+
+  @param (list) fields
+      A list of fully qualified Field objects for `type_` tables. When no
+      fields are given the Template is looked up by the table name.
+
+  @return (object) table
+      A SQLAlchemy Table object bound to our db.metadata
+  """
+  def get_storage_table(self, class_name, fields=None):
+
+    if class_name.endswith('_users'):
+      return self.compile_storage_table(class_name, self.get_storage_permission_columns(class_name[:-len('_users')]))
+    elif class_name.startswith('attachment_'):
+      return self.compile_storage_table(class_name, self.get_attachment_columns())
+    elif class_name.startswith('ref_'):
+
+      """
+      When an association table is loaded on its own we don't know which
+      tables it points to, so we prefer the version that was built alongside
+      the model that references it
+      """
+      association_columns = [
+        db.Column('parent_id', db.Integer, primary_key=True),
+        db.Column('child_id', db.Integer, primary_key=True)
+      ]
+
+      return self.compile_storage_table(class_name, association_columns, replace=False)
+
+    if fields is None and class_name.startswith('type_'):
+      fields = self.get_storage_fields(class_name)
+
+    if fields is None:
+      logger.warning('Could not build a schema for %s, loading it from the database instead', class_name)
+      return db.Table(class_name, db.metadata, autoload=True, autoload_with=db.engine, extend_existing=True)
+
+    columns = self.get_storage_columns()
+    columns.append(db.Column('owner', db.Integer, db.ForeignKey('user.id')))
+
+    for field in fields:
+      field_type = self.get_field_type(field.data_type)
+      if field_type is not None:
+        columns.append(db.Column(field.name, field_type))
+
+    table = self.compile_storage_table(class_name, columns)
+
+    if current_app.config.get('STORAGE_SCHEMA_CHECK', False):
+      for difference in self.storage_schema_check(table):
+        logger.warning('Schema check for %s: %s', class_name, difference)
+
+    return table
+
+
+  """
+  Get the Fields for a storage that was requested by name only, such as the
+  other side of a relationship
+  """
+  def get_storage_fields(self, class_name):
+
+    from CommonsCloudAPI.models.template import get_template
+
+    template = get_template(class_name)
+
+    if template is None:
+      return None
+
+    return template.fields
+
+
+  """
+  Add a Table to our db.metadata, reusing the Table that is already there if
+  it has the same columns, otherwise replacing it.
+
+  @param (string) table_name
+      The name of the table
+
+  @param (list) columns
+      A list of db.Column objects that make up the table
+
+  @param (bool) replace
+      Whether an existing Table with different columns should be replaced
+      or simply reused as it is
+
+  @return (object) table
+      A SQLAlchemy Table object bound to our db.metadata
+  """
+  def compile_storage_table(self, table_name, columns, replace=True):
+
+    existing_table = db.metadata.tables.get(table_name, None)
+
+    if existing_table is not None:
+
+      if not replace:
+        return existing_table
+
+      existing_signature = self.storage_table_signature(existing_table.c)
+      compiled_signature = self.storage_table_signature(columns)
+
+      if existing_signature == compiled_signature:
+        return existing_table
+
+      db.metadata.remove(existing_table)
+
+    return db.Table(table_name, db.metadata, *columns)
+
+
+  """
+  A comparable description of a list of columns, their types, and the
+  tables they reference
+  """
+  def storage_table_signature(self, columns):
+
+    signature = []
+
+    for column in columns:
+      foreign_keys = sorted([foreign_key._get_colspec() for foreign_key in column.foreign_keys])
+      signature.append((column.name, column.type._type_affinity, tuple(foreign_keys)))
+
+    return sorted(signature)
+
+
+  """
+  Compare a compiled Table to what actually exists in the database catalog.
+  This is much more expensive than compiling the Table and is only used
+  when the STORAGE_SCHEMA_CHECK setting is enabled.
+
+  @param (object) table
+      A compiled SQLAlchemy Table object
+
+  @return (list) differences
+      A list of messages describing how the two differ, empty if they match
+  """
+  def storage_schema_check(self, table):
+
+    catalog_table = db.Table(table.name, MetaData(), autoload=True, autoload_with=db.engine)
+
+    differences = []
+
+    for column in table.c:
+      if column.name not in catalog_table.c:
+        differences.append('`%s` is defined by the Fields but missing from the database' % (column.name))
+      elif column.type._type_affinity is not catalog_table.c[column.name].type._type_affinity:
+        differences.append('`%s` is a %s in the Fields but a %s in the database' % (column.name, column.type, catalog_table.c[column.name].type))
+
+    for column in catalog_table.c:
+      if column.name not in table.c:
+        differences.append('`%s` exists in the database but not in the Fields' % (column.name))
+
+    return differences
+
+
   """
   Create a list of fields that need to have relationships loaded
   for them to operate properly
   """
+  """
+  The schema version of a Template's model (see CommonsModelRegistry.version)
+
+  A full model includes models of the Templates it has relationships with,
+  so their Fields are part of its version. Related Templates come from the
+  Template cache, which every worker reloads once a Template or its Fields
+  change, so a change to a related Template rebuilds the model in every
+  worker, not only the one that made the change.
+
+  @param (object) template
+      A fully qualified Template object
+
+  @param (boolean) relationship
+      Whether the model includes its relationships
+
+  @return (string) version
+      A hash representing the current schema of the model
+  """
+  def storage_version(self, template, relationship=True):
+
+    from CommonsCloudAPI.models.template import get_template
+
+    fields = list(template.fields)
+
+    if relationship:
+      for field in self.get_relationship_fields(template.fields):
+        related = get_template(field.relationship) if field.relationship else None
+        if related is not None:
+          fields += list(related.fields)
+
+    return registry.version(fields)
+
+
   def get_relationship_fields(self, fields):
 
     relationships = []
@@ -664,6 +956,93 @@ class CommonsModel(object):
     return True
 
 
+  """
+  Check the If-None-Match header of the current request against what the
+  response would be built from, so that we can skip building a response the
+  user already has
+
+  If-Modified-Since is not answered, the last time the content was updated
+  doesn't change when a Feature is deleted or the Template's Fields change,
+  only the `etag` does
+
+  @param (object) self
+
+  @param (str) etag
+      A validator that changes whenever the response would change
+
+  @param (datetime) last_modified
+      The last time the content of the response changed
+
+  @return (tuple)
+      A `304 Not Modified` response and status code, or None when the full
+      response needs to be built
+  """
+  def not_modified(self, etag, last_modified=None):
+
+    if not request.if_none_match or not request.if_none_match.contains_weak(etag):
+      return None
+
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+
+    if last_modified:
+      response.last_modified = last_modified
+
+    response.headers.add('Access-Control-Allow-Origin', '*')
+
+    return response, 304
+
+
+  """
+  Serve a response from the response cache, or a `304 Not Modified` if the
+  user already has it
+
+  The decision is made from the cached ETag alone (see not_modified), the
+  cached Last-Modified date doesn't change when a Feature is deleted or the
+  Template's Fields change
+
+  @param (object) self
+
+  @param (object) cached_response
+      A Flask response from CommonsResponseCache.get
+
+  @return (object) response
+      The cached response, or a `304 Not Modified` response and status code
+  """
+  def serve_cached_response(self, cached_response):
+
+    etag, weak = cached_response.get_etag()
+
+    if etag:
+      not_modified = self.not_modified(etag, cached_response.last_modified)
+      if not_modified:
+        return not_modified
+
+    return cached_response
+
+
+  """
+  A validator for a response, built from anything that would change the
+  response if it changed (e.g., the last time the content was updated, the
+  number of objects, the schema, and the request itself)
+
+  @param (object) self
+
+  @param (list) parts
+      The values the response depends on
+
+  @return (str) etag
+      A short hash of the values and of the current request
+  """
+  def response_etag(self, *parts):
+
+    user_id = getattr(getattr(self, 'current_user', None), 'id', None)
+
+    signature = [request.path, request.query_string, user_id] + [str(part) for part in parts]
+
+    return hashlib.md5(repr(signature)).hexdigest()
+
+
   """
   Create a valid response to be served to the user
 
@@ -681,7 +1060,37 @@ class CommonsModel(object):
       message describing why the content couldn't be delivered
 
   """
-  def endpoint_response(self, the_content, extension='json', list_name='', exclude_fields=[], code=200, last_modified="", **extras):
+  def endpoint_response(self, the_content, extension='json', list_name='', exclude_fields=[], code=200, last_modified="", etag="", **extras):
+
+    """
+    Vector tiles are already encoded by the database, only the tile endpoint
+    builds them, any other content can't be served as a vector tile
+    """
+    if (extension == 'mvt'):
+
+      if not isinstance(the_content, basestring):
+        return status_.status_415(), 415
+
+      return MVT(the_content, last_modified=last_modified, etag=etag, **extras).create(), code
+
+    """
+    Lists that are generated as they are read from the database are streamed
+    to the user as they are serialized
+    """
+    if isinstance(the_content, types.GeneratorType):
+
+      the_content = self.serialize_stream(the_content)
+
+      if (extension == 'json'):
+        return JSON(the_content, list_name=list_name, exclude_fields=exclude_fields, last_modified=last_modified, etag=etag, **extras).stream(), code
+      elif (extension == 'geojson'):
+        return GeoJSON(the_content, list_name=list_name, exclude_fields=exclude_fields, last_modified=last_modified, etag=etag, **extras).stream(), code
+      elif (extension == 'topojson'):
+        return TopoJSON({list_name: list(the_content)}, list_name=list_name, exclude_fields=exclude_fields, last_modified=last_modified, etag=etag, **extras).create(), code
+      elif (extension == 'csv'):
+        return CSV({list_name: list(the_content)}, exclude_fields=exclude_fields).create(), code
+
+      return status_.status_415(), 415
 
     """
     Make sure the content is ready to be served
@@ -699,12 +1108,17 @@ class CommonsModel(object):
     """
     if (extension == 'json'):
 
-      this_data = JSON(the_content, list_name=list_name, exclude_fields=exclude_fields, **extras)
+      this_data = JSON(the_content, list_name=list_name, exclude_fields=exclude_fields, last_modified=last_modified, etag=etag, **extras)
       return this_data.create(), code
 
     elif (extension == 'geojson'):
 
-      this_data = GeoJSON(the_content, list_name=list_name, exclude_fields=exclude_fields, **extras)
+      this_data = GeoJSON(the_content, list_name=list_name, exclude_fields=exclude_fields, last_modified=last_modified, etag=etag, **extras)
+      return this_data.create(), code
+
+    elif (extension == 'topojson'):
+
+      this_data = TopoJSON(the_content, list_name=list_name, exclude_fields=exclude_fields, last_modified=last_modified, etag=etag, **extras)
       return this_data.create(), code
 
     elif (extension == 'csv'):
@@ -748,16 +1162,12 @@ class CommonsModel(object):
   """
   def allowed_applications(self, permission_type='read'):
 
-    applications_ = []
-
     if not hasattr(self.current_user, 'id'):
       logger.warning('User did\'t submit their information %s', \
           self.current_user)
       return status_.status_401('You need to be logged in to access applications'), 401
 
-    for application in self.current_user.applications:
-      if permission_type and getattr(application, permission_type):
-        applications_.append(application.application_id)
+    applications_ = list(get_permissions(self.current_user).allowed('applications', permission_type))
 
     return applications_
 
@@ -773,15 +1183,11 @@ class CommonsModel(object):
   """
   def allowed_templates(self, permission_type='read'):
 
-    templates_ = []
-
     if not hasattr(self.current_user, 'id'):
       logger.warning('User did\'t submit their information %s', \
           self.current_user)
       return status_.status_401('You need to be logged in to access applications'), 401
 
-    for template in self.current_user.templates:
-      if permission_type and getattr(template, permission_type):
-        templates_.append(template.template_id)
+    templates_ = list(get_permissions(self.current_user).allowed('templates', permission_type))
 
     return templates_
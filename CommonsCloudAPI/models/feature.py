@@ -17,7 +17,9 @@ Import Python Dependencies
 import ast
 import boto
 import csv
+import hashlib
 import json
+import math
 import os.path
 import re
 import sys
@@ -26,6 +28,8 @@ import uuid
 import xlsxwriter
 
 from datetime import datetime
+from decimal import Decimal
+from decimal import InvalidOperation
 from uuid import uuid4
 
 from functools import wraps
@@ -42,13 +46,17 @@ from flask import render_template
 
 from flask.ext.restless.views import API
 from flask.ext.restless.views import FunctionAPI
-from flask.ext.restless.search import search
+from flask.ext.restless.search import create_query
+from flask.ext.restless.helpers import get_relations
+from flask.ext.restless.helpers import to_dict
 
 from flask.ext.mail import Message
 
 from flask.ext.rq import get_queue
 
 from sqlalchemy.exc import DataError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import defer
 
 """
 Import Commons Cloud Dependencies
@@ -57,25 +65,36 @@ from CommonsCloudAPI.models.base import CommonsModel
 
 from CommonsCloudAPI.models.activity import Activity
 from CommonsCloudAPI.models.template import Template
+from CommonsCloudAPI.models.template import get_template
 from CommonsCloudAPI.models.field import Field
 from CommonsCloudAPI.models.statistic import Statistic
 from CommonsCloudAPI.models.user import User
 
+from CommonsCloudAPI.extensions import counts
 from CommonsCloudAPI.extensions import db
 from CommonsCloudAPI.extensions import rq
 from CommonsCloudAPI.extensions import logger
 from CommonsCloudAPI.extensions import oauth
+from CommonsCloudAPI.extensions import responses
 from CommonsCloudAPI.extensions import sanitize
 from CommonsCloudAPI.extensions import status as status_
 
+from CommonsCloudAPI.utilities.cursor import CURSOR_KEYS
+from CommonsCloudAPI.utilities.cursor import decode_cursor
+from CommonsCloudAPI.utilities.cursor import encode_cursor
+from CommonsCloudAPI.utilities.geometry import SPATIAL_PREDICATES
 from CommonsCloudAPI.utilities.geometry import ST_GeomFromGeoJSON
+from CommonsCloudAPI.utilities.geometry import tile_bounds
 
 from CommonsCloudAPI.signals import trigger_feature_created
+from CommonsCloudAPI.signals import trigger_feature_deleted
+from CommonsCloudAPI.signals import trigger_feature_updated
 
 from geoalchemy2.elements import WKBElement
 import geoalchemy2.functions as geofunc
 
 from CommonsCloudAPI.importer.import_csv import import_csv
+from CommonsCloudAPI.importer.import_csv import import_csv_chunk
 
 
 """
@@ -93,7 +112,7 @@ class is_public(object):
 
           storage = self.validate_storage(kwargs['storage'])
 
-          this_template = Template.query.filter_by(storage=storage).first()
+          this_template = get_template(storage)
 
           keywords = kwargs
 
@@ -127,7 +146,7 @@ class is_crowdsourced(object):
 
           storage = self.validate_storage(kwargs['storage'])
 
-          this_template = Template.query.filter_by(storage=storage).first()
+          this_template = get_template(storage)
 
           keywords = kwargs
 
@@ -167,7 +186,7 @@ class Feature(CommonsModel):
           logger.warning('Inside Current APP Context');
 
         storage = self.validate_storage(storage_)
-        Template_ = Template.query.filter_by(storage=storage).first()
+        Template_ = get_template(storage)
         Storage_ = self.get_storage(Template_)
 
         # logger.warning('request_object: %s; %s;', request_object.data, request_object.form)
@@ -186,20 +205,30 @@ class Feature(CommonsModel):
         activity_.updated = datetime.now()
         db.session.commit()
 
-        for feature in features.get('features', []):
-          try:
-            new_feature = self.feature_create_from_object(feature, Storage_, Template_, storage, [], bulk=True)
-            logger.warning('new_feature %s', new_feature.id)
-          except DataError, e:
-            logger.error('An unknown error occured while importing data')
-            db.session.rollback()
-            sys.exc_clear()
+        """
+        Features are inserted in chunks, each chunk is a single transaction
+        no matter how many Features or relationships it contains
+        """
+        features_ = features.get('features', [])
+        chunk_size = current_app.config.get('FEATURE_BATCH_CHUNK_SIZE', 1000)
 
-          continue
+        created = 0
+        errors = []
+
+        for start in range(0, len(features_), chunk_size):
+          chunk_created, chunk_errors = self.feature_bulk_create(features_[start:start + chunk_size], Storage_, Template_, start)
+          created += chunk_created
+          errors += chunk_errors
+
+        logger.info('Imported %d of %d features into %s with %d errors', created, len(features_), storage, len(errors))
 
         activity_id = features.get('activity_id', [])
         activity_ = Activity.query.get(activity_id)
         activity_.status = 'Complete'
+        activity_.result = json.dumps({
+          'created': created,
+          'errors': errors
+        })
         activity_.updated = datetime.now()
         db.session.commit()
 
@@ -210,10 +239,278 @@ class Feature(CommonsModel):
 
         return status_.status_200(), 200
 
+    """
+    Create a chunk of Features, along with their relationships, in a single
+    transaction using multi-row INSERTs
+
+    Each Feature is converted to the data types of its Template's Fields
+    before anything is sent to the database. If the database rejects the
+    chunk, the rows are inserted one at a time so that we can report which
+    rows failed without losing the rest of the chunk.
+
+    @param (list) features
+        A list of Feature dictionaries
+
+    @param (object) Storage_
+        The dynamic model for the Feature Collection
+
+    @param (object) Template_
+        A fully qualified Template object
+
+    @param (int) offset
+        The position of the first Feature in the complete import, used
+        for reporting errors
+
+    @return (tuple) created, errors
+        The number of Features that were created and a list of errors
+        describing each row that couldn't be imported
+    """
+    def feature_bulk_create(self, features, Storage_, Template_, offset=0):
+
+        errors = []
+
+        data_types = {}
+
+        for field in Template_.fields:
+          if self.get_field_type(field.data_type) is not None:
+            data_types[field.name] = field.data_type
+
+        relationships = self._get_fields_of_type(Template_, 'relationship')
+
+        """
+        Step 1: Convert every Feature to a row of our Feature table
+        """
+        rows = []
+        row_numbers = []
+        children = []
+
+        creation_datetime = datetime.now()
+
+        for index, content_ in enumerate(features):
+          try:
+            row = self.feature_bulk_row(content_, data_types, creation_datetime)
+            child_ids = dict((relationship, self.feature_bulk_relationship_ids(content_.get(relationship, None))) for relationship in relationships)
+          except (ValueError, TypeError, InvalidOperation) as e:
+            errors.append({
+              'row': offset + index,
+              'error': str(e)
+            })
+            continue
+
+          rows.append(row)
+          row_numbers.append(offset + index)
+          children.append(child_ids)
+
+        if not rows:
+          return 0, errors
+
+        """
+        Step 2: Insert the rows, keeping track of the new Feature ids
+        """
+        feature_ids = self.feature_bulk_insert(Storage_.__table__, rows, row_numbers, errors)
+
+        """
+        Step 3: Associate the new Features with the Features they reference
+        """
+        for relationship in relationships:
+
+          assoc_ = self._feature_relationship_associate(Template_, relationship)
+          Association_ = self.get_storage(str(assoc_))
+
+          association_rows = []
+          association_row_numbers = []
+
+          for feature_id, row_number, child_ids in zip(feature_ids, row_numbers, children):
+
+            if feature_id is None:
+              continue
+
+            for child_id in child_ids[relationship]:
+              association_rows.append({
+                'parent_id': feature_id,
+                'child_id': child_id
+              })
+              association_row_numbers.append(row_number)
+
+          if association_rows:
+            self.feature_bulk_insert(Association_.__table__, association_rows, association_row_numbers, errors)
+
+        db.session.commit()
+
+        created = len([feature_id for feature_id in feature_ids if feature_id is not None])
+
+        """
+        These rows were inserted without the ORM, so the Feature counts for
+        this Feature Collection can't be adjusted and need to be loaded again
+        """
+        if created:
+          counts.forget(Storage_.__tablename__)
+          responses.invalidate(Storage_.__tablename__)
+
+        return created, errors
+
+    """
+    Convert a Feature dictionary into a row for the Feature table, ignoring
+    anything that isn't a column of the table
+
+    @param (dict) content_
+        A single Feature
+
+    @param (dict) data_types
+        The data type of each Field, keyed by the Field name
+
+    @param (datetime) creation_datetime
+        The date and time to use as the created and updated date
+
+    @return (dict) row
+        The values for each column of the Feature table
+    """
+    def feature_bulk_row(self, content_, data_types, creation_datetime):
+
+        row = {
+          'created': creation_datetime,
+          'updated': creation_datetime,
+          'status': content_.get('status', None) or 'public',
+          'owner': content_.get('owner', None),
+          'geometry': None
+        }
+
+        geometry_ = content_.get('geometry', None)
+
+        if geometry_:
+          if not isinstance(geometry_, basestring):
+            geometry_ = json.dumps(geometry_)
+          row['geometry'] = ST_GeomFromGeoJSON(geometry_)
+
+        for name, data_type in data_types.items():
+          row[name] = self.feature_bulk_value(content_.get(name, None), data_type)
+
+        return row
+
+    """
+    Convert a single value to the data type of its Field
+
+    @param (object) value
+        The value submitted for the Field
+
+    @param (string) data_type
+        The data type of the Field (e.g., float, whole_number, boolean)
+
+    @return (object) value
+        The converted value
+
+    @raise ValueError
+        When the value cannot be converted to the data type of the Field
+    """
+    def feature_bulk_value(self, value, data_type):
+
+      if value is None or (isinstance(value, basestring) and not value.strip()):
+        return None
+
+      if data_type == 'float':
+        return float(value)
+      elif data_type == 'whole_number':
+        return int(Decimal(str(value).strip()))
+      elif data_type == 'boolean':
+        if isinstance(value, bool):
+          return value
+        if str(value).strip().lower() in ('true', 't', 'yes', 'y', '1'):
+          return True
+        if str(value).strip().lower() in ('false', 'f', 'no', 'n', '0'):
+          return False
+        raise ValueError('`%s` is not a valid boolean' % (value))
+      elif isinstance(value, (list, dict)):
+        return json.dumps(value)
+
+      return value
+
+    """
+    The ids of the Features a relationship Field references, whether they
+    were submitted as a list of objects, a list of ids, or a JSON string
+    """
+    def feature_bulk_relationship_ids(self, content):
+
+      if not content:
+        return []
+
+      if isinstance(content, basestring):
+        content = json.loads(content)
+
+      if not isinstance(content, list):
+        content = [content]
+
+      child_ids = []
+
+      for child_feature in content:
+
+        if isinstance(child_feature, dict):
+          child_feature = child_feature.get('id', None)
+
+        if child_feature is None or child_feature == '':
+          continue
+
+        child_ids.append(int(child_feature))
+
+      return child_ids
+
+    """
+    Insert a list of rows into a table with a single multi-row INSERT
+
+    The INSERT is wrapped in a SAVEPOINT. If the database rejects it, each
+    row is inserted in a SAVEPOINT of its own so that a bad row only
+    removes itself from the import and is reported in `errors`.
+
+    @param (object) table
+        The SQLAlchemy Table to insert into
+
+    @param (list) rows
+        A list of dictionaries with the same keys
+
+    @param (list) row_numbers
+        The position of each row in the complete import
+
+    @param (list) errors
+        The list we should add any errors to
+
+    @return (list) ids
+        The `id` (or `parent_id`) of each inserted row, or None for each
+        row that failed
+    """
+    def feature_bulk_insert(self, table, rows, row_numbers, errors):
+
+      returning = table.c.id if 'id' in table.c else table.c.parent_id
+
+      try:
+        db.session.begin_nested()
+        result = db.session.execute(table.insert().values(rows).returning(returning))
+        ids = [row[0] for row in result]
+        db.session.commit()
+        return ids
+      except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning('Bulk insert into %s failed, inserting one row at a time: %s', table.name, e)
+
+      ids = []
+
+      for row, row_number in zip(rows, row_numbers):
+        try:
+          db.session.begin_nested()
+          ids.append(db.session.execute(table.insert().values(row).returning(returning)).scalar())
+          db.session.commit()
+        except SQLAlchemyError as e:
+          db.session.rollback()
+          ids.append(None)
+          errors.append({
+            'row': row_number,
+            'error': str(getattr(e, 'orig', e))
+          })
+
+      return ids
+
     def feature_create(self, request_object, storage_):
 
         storage = self.validate_storage(storage_)
-        Template_ = Template.query.filter_by(storage=storage).first()
+        Template_ = get_template(storage)
 
         feature_create_access = self.feature_create_check_access(Template_)
 
@@ -379,19 +676,39 @@ class Feature(CommonsModel):
 
         storage = self.validate_storage(storage_)
 
-        Template_ = Template.query.filter_by(storage=storage).first()
+        Template_ = get_template(storage)
 
         Model_ = self.get_storage(Template_, Template_.fields)
 
         endpoint_ = API(db.session, Model_)
-        
+
+        """
+        Before we load and serialize the entire Feature, check to see if the
+        user already has the current version of it. We only answer with a
+        `304 Not Modified` here when the user can obviously see the Feature,
+        everyone else goes through the full access check below.
+        """
+        feature = db.session.query(Model_.updated, Model_.status, Model_.owner).filter(Model_.id == feature_id).first()
+
+        if feature is not None:
+
+          self.validator = {
+            'etag': self.response_etag(feature_id, feature.updated, feature.status, self.storage_version(Template_)),
+            'last_modified': feature.updated
+          }
+
+          if feature.status == 'public' or (hasattr(self.current_user, 'id') and self.current_user.id == feature.owner):
+            not_modified = self.not_modified(**self.validator)
+            if not_modified:
+              return not_modified
+
         return self.feature_read_check_access(feature_id, storage_, Template_, Model_, endpoint_)
 
     def feature_get_relationship(self, storage_, feature_id, relationship):
 
         storage = self.validate_storage(storage_)
 
-        this_template = Template.query.filter_by(storage=storage).first()
+        this_template = get_template(storage)
 
         Storage_ = self.get_storage(this_template, this_template.fields)
 
@@ -407,7 +724,7 @@ class Feature(CommonsModel):
         relationships = []
 
         rstorage = self.validate_storage(relationship)
-        rtemplate = Template.query.filter_by(storage=rstorage).first()
+        rtemplate = get_template(rstorage)
 
         logger.warning('%s %s', rtemplate.name, type(rtemplate))
 
@@ -430,7 +747,7 @@ class Feature(CommonsModel):
 
         storage = self.validate_storage(storage_)
 
-        this_template = Template.query.filter_by(storage=storage).first()
+        this_template = get_template(storage)
 
         Storage_ = self.get_storage(this_template, this_template.fields)
 
@@ -447,7 +764,7 @@ class Feature(CommonsModel):
 
         relationship_ = str('attachment_' + relationship)
         rstorage = self.validate_storage(relationship_)
-        rtemplate = Template.query.filter_by(storage=rstorage).first()
+        rtemplate = get_template(rstorage)
 
         logger.warning('rtemplate %s', type(rtemplate))
 
@@ -472,7 +789,7 @@ class Feature(CommonsModel):
       Prepare a dynamic model so we can submit Features to the database
       """
       storage = self.validate_storage(storage_)
-      Template_ = Template.query.filter_by(storage=storage).first()
+      Template_ = get_template(storage)
       Storage_ = self.get_storage(Template_)
 
       feature_ = Storage_.query.get(feature_id)
@@ -527,8 +844,8 @@ class Feature(CommonsModel):
       if hasattr(feature_, 'status'):
         feature_.status = sanitize.sanitize_string(content_.get('status', feature_.status))
 
-      if hasattr(feature_, 'geometry'):
-        feature_.geometry = content_.get('geometry', feature_.geometry)
+      if hasattr(feature_, 'geometry') and 'geometry' in content_:
+        feature_.geometry = content_.get('geometry')
 
       #
       # @todo We should be able to transfer the ownership of a feature, but
@@ -644,23 +961,29 @@ class Feature(CommonsModel):
             #
             new_feature_attachments = self.feature_attachments(**details)
 
-      return self.feature_get(storage_, feature_id)
+      """
+      Trigger: trigger_feature_updated
+      """
+      trigger_feature_updated.send(current_app._get_current_object(),
+                           storage=storage, template=Template_, feature=feature_)
 
-    def feature_statistic(self, Model_, Template_):
+      return self.feature_get(storage_, feature_id)
 
-        logger.warning('get_statistics')    
+    def feature_statistic(self, Model_, Template_, query=None):
 
-        search_params = json.loads(request.args.get('q', '{}'))
+        logger.debug('feature_statistic')
 
-        results = search(db.session, Model_, search_params)
+        if query is None:
+          search_params = json.loads(request.args.get('q', '{}'))
+          query = create_query(db.session, Model_, search_params)
 
-        return self.get_statistics(results.get('statistics'), Template_)
+        return self.get_statistics(query, Template_, Model_)
 
     def feature_list(self, storage_, results_per_page=25, show_statistics=False, relationship=True):
 
         storage = self.validate_storage(storage_)
 
-        Template_ = Template.query.filter_by(storage=storage).first()
+        Template_ = get_template(storage)
 
         Model_ = self.get_storage(Template_, Template_.fields, relationship=relationship)
 
@@ -681,256 +1004,1434 @@ class Feature(CommonsModel):
 
 
     """
-    The Feature Collection/Template is marked as a public resource and therefore requires no
-    further authentication on the requesting user's behalf. The API should select a list of 
-    Features with a Feature Status of 'public' and display them to the user. All other Feature
-    Status' should be hidden at this point (e.g., private, crowd, draft)
-    """
-    def feature_list_public(self, storage_, Template_, Model_, endpoint_, results_per_page=25):
+    The Feature Collection/Template is marked as a public resource and therefore requires no
+    further authentication on the requesting user's behalf. The API should select a list of 
+    Features with a Feature Status of 'public' and display them to the user. All other Feature
+    Status' should be hidden at this point (e.g., private, crowd, draft)
+    """
+    def feature_list_public(self, storage_, Template_, Model_, endpoint_, results_per_page=25):
+
+        search_params = json.loads(request.args.get('q', '{}'))
+
+        """
+        Only display public posts
+        """
+        public_filter = {
+          "name": "status",
+          "op": "eq",
+          "val": "public"
+        }
+
+        if 'filters' in search_params:
+          search_params['filters'].append(public_filter)
+        else:
+          search_params = {
+            "filters": [public_filter]
+          }
+
+        validator = self.feature_list_validator(Template_, Model_)
+
+        not_modified = self.not_modified(**validator)
+        if not_modified:
+          return not_modified
+
+        results = self.feature_query_results(Model_, search_params, results_per_page, status='public')
+
+        if type(results) is tuple:
+          return results
+
+        return {
+          'results': results,
+          'model': Model_,
+          'template': Template_,
+          'etag': validator['etag'],
+          'last_modified': validator['last_modified']
+        }
+
+    """
+    The Feature Collection/Template was marked as a not is_public and therefore requires that the 
+    requesting user have at minimum 'read' access to this Feature Collection being requested. Varying
+    Features may be displayed based on the user's exact permissions. Use cases covered here are:
+
+    1. A user with `read/write` permission to the Template_ being requested will display Features (a) with a status
+       of 'public', (b) with owner === current_user.id, or (c) with Feature 'read' permission or higher
+
+    2. A user with 'is_moderator/is_admin' permission to the Template_ being requested will display all Features in
+       the Feature Collection
+    """
+    def feature_list_secure(self, storage_, Template_, Model_, endpoint_, results_per_page=25):
+
+        search_params = json.loads(request.args.get('q', '{}'))
+
+        """
+        If the Template has Feature level permission enabled, then we need to build a list
+        of Feature IDs from this Feature Collection, that the user can access.
+
+        We need to make sure though that we merge together 'public' features with the 'explicitly allowed'
+        features, this meets one of the following criteria:
+
+        1. User has Feature `read` (including `is_admin`, `is_moderator`) permission
+        2. User has Template `is_moderator` or `is_admin` permission
+        3. User id matches Feature.owner
+
+        """
+
+        permission_filter = None
+
+        """
+        Check to see if the current_user has Feature Collection/Template is_moderator or is_admin
+        level of permissions. If so, then they should see every Feature in the Collection regardless
+        of Feature Status (e.g., published, private, draft, crowd) and Feature-level Permission
+        """
+        if Template_.id in self.allowed_templates(permission_type='is_moderator') or \
+            Template_.id in self.allowed_templates(permission_type='is_admin'):
+            # Do nothing, go ahead and display everything, this is just a stub for any
+            # future necessary admin or moderator specific permissions.
+            pass
+        else:
+          """
+          Display all Features marked as 'public' within the Collection, all
+          Features the user is the 'owner' of, and (if this Template has Feature
+          Level ACL enabled) all Features the user has Feature-level 'read' or
+          higher access to
+          """
+          permission_filter = self.feature_permission_filter(storage_, Template_, Model_)
+
+        validator = self.feature_list_validator(Template_, Model_)
+
+        not_modified = self.not_modified(**validator)
+        if not_modified:
+          return not_modified
+
+        results = self.feature_query_results(Model_, search_params, results_per_page, permission_filter)
+
+        if type(results) is tuple:
+          return results
+
+        return {
+          'results': results,
+          'model': Model_,
+          'template': Template_,
+          'etag': validator['etag'],
+          'last_modified': validator['last_modified']
+        }
+
+    """
+    The key a response for a public Feature Collection is cached under (see
+    CommonsResponseCache), made from everything that can change the response
+
+    Only anonymous JSON, GeoJSON, TopoJSON, and vector tile requests for
+    public Feature Collections are cached, every other request depends on
+    who the user is or is written to a file. Vector tiles are only built by
+    the tile endpoint, so no other endpoint caches them.
+
+    @param (string) storage_
+        The storage name of the Feature Collection
+
+    @param (string) extension
+        The format of the response (e.g., json, geojson)
+
+    @return (dict) cache
+        The `storage` and `key` of the response, the key includes the
+        current generation of the Feature Collection so it must be read
+        before the response is built. None if the response shouldn't be
+        cached
+    """
+    def feature_response_cache_key(self, storage_, extension):
+
+        if hasattr(self.current_user, 'id') or extension not in ('json', 'geojson', 'topojson', 'mvt'):
+          return None
+
+        if extension == 'mvt' and request.endpoint != 'feature.feature_tile':
+          return None
+
+        storage = self.validate_storage(storage_)
+
+        Template_ = get_template(storage)
+
+        if Template_ is None or not Template_.is_public:
+          return None
+
+        try:
+          search_params = json.dumps(json.loads(request.args.get('q', '{}')), sort_keys=True)
+        except ValueError:
+          return None
+
+        geometry_options = self.feature_geometry_options()
+
+        if type(geometry_options) is tuple:
+          return None
+
+        arguments = sorted((name, value) for name, value in request.args.items(multi=True) if name not in ('q', 'simplify', 'zoom', 'precision'))
+
+        signature = [request.path, extension, search_params, arguments, sorted(geometry_options.items()), self.storage_version(Template_)]
+
+        key = responses.key(storage, hashlib.md5(repr(signature)).hexdigest())
+
+        if key is None:
+          return None
+
+        return {
+          'storage': storage,
+          'key': key
+        }
+
+    """
+    A validator for a list of Features that is cheap enough to check before
+    we search for or serialize any Features
+
+    The list changes whenever a Feature is updated (the most recent `updated`
+    date), created or deleted (the number of Features), or the Template's
+    Fields change. The request itself (e.g., filters, page) and the user are
+    part of the ETag as well (see CommonsModel.response_etag).
+
+    @param (object) Template_
+        The Template of the Feature Collection
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (dict) validator
+        The `etag` and `last_modified` date of the list
+    """
+    def feature_list_validator(self, Template_, Model_):
+
+        last_modified = self.features_last_modified(Model_)
+
+        total_features = sum(self.feature_status_counts(Model_).values())
+
+        return {
+          'etag': self.response_etag(last_modified, total_features, self.storage_version(Template_)),
+          'last_modified': last_modified
+        }
+
+    """
+    Build the requested page of Features from the user's search parameters
+
+    Rather than loading the entire page and converting every Feature into
+    a dictionary before we respond, we hand back a generator that reads the
+    Features from a server side cursor as the response is being sent
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (dict) search_params
+        The Flask-Restless search parameters (e.g., filters, order_by)
+
+    @param (int) results_per_page
+        The number of Features to display on each page
+
+    @param (object) permission_filter
+        An optional SQL expression limiting the Features the user can see
+
+    @param (string) status
+        The Feature status every Feature in the list is limited to, if any
+
+    @return (dict) results
+        The paging information and a generator of Feature dictionaries
+    """
+    def feature_query_results(self, Model_, search_params, results_per_page=25, permission_filter=None, status=None):
+
+        geometry_options = self.feature_geometry_options()
+
+        if type(geometry_options) is tuple:
+          return geometry_options
+
+        bbox_filter = self.feature_bbox_filter(Model_)
+
+        if type(bbox_filter) is tuple:
+          return bbox_filter
+
+        spatial_filter = self.feature_spatial_request_filter(Model_)
+
+        if type(spatial_filter) is tuple:
+          return spatial_filter
+
+        query = create_query(db.session, Model_, search_params)
+
+        if permission_filter is not None:
+          query = query.filter(permission_filter)
+
+        if bbox_filter is not None:
+          query = query.filter(bbox_filter)
+
+        if spatial_filter is not None:
+          query = query.filter(spatial_filter)
+
+        """
+        A list that is only limited by its Feature status can be counted
+        without looking at the Features themselves
+        """
+        status_filter = {
+          "name": "status",
+          "op": "eq",
+          "val": status
+        }
+
+        filters = [filter_ for filter_ in search_params.get('filters', []) if not (status and filter_ == status_filter)]
+
+        unfiltered = permission_filter is None and bbox_filter is None and spatial_filter is None and not filters
+
+        if request.args.get('cursor', None) is not None:
+          return self.feature_cursor_results(Model_, query, search_params, results_per_page, status, unfiltered, geometry_options)
+
+        if not search_params.get('order_by', None):
+          query = query.order_by(Model_.id)
+
+        page = int(request.args.get('page', 1))
+
+        if page < 1:
+          page = 1
+
+        num_results = self.feature_count(Model_, query, status, unfiltered)
+
+        if results_per_page:
+          total_pages = int(math.ceil(num_results / float(results_per_page))) if num_results is not None else None
+          page_query = query.limit(results_per_page).offset((page - 1) * results_per_page)
+        else:
+          total_pages = 1
+          page_query = query
+
+        return {
+          'objects': self.feature_stream(Model_, page_query, geometry_options),
+          'page': page,
+          'total_pages': total_pages,
+          'num_results': num_results,
+          'query': query
+        }
+
+    """
+    Build a page of Features that starts after the position in the user's
+    `cursor`, instead of skipping over every Feature on the earlier pages
+
+    The Features are ordered by `id`, or by `updated` and then `id` when
+    `cursor_key=updated` is requested, and the page is selected with a
+    row comparison against the last Feature of the previous page. This lets
+    the database go straight to the page using an index, so the last page
+    costs the same as the first. An empty `cursor` requests the first page.
+
+    `updated` can be NULL, and a row comparison with NULL is never true, so
+    Features that have never been updated are paged through separately. They
+    come after every Feature that has been updated (PostgreSQL sorts NULLs
+    last), ordered by `id`.
+
+    Counting every Feature that matches is skipped unless a `count` is
+    requested (see feature_count).
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (object) query
+        The filtered (but not ordered or paged) SQLAlchemy query
+
+    @param (dict) search_params
+        The Flask-Restless search parameters (e.g., filters, order_by)
+
+    @param (int) results_per_page
+        The number of Features to display on each page
+
+    @param (string) status
+        The Feature status every Feature in the list is limited to, if any
+
+    @param (boolean) unfiltered
+        True when the list is only limited by its Feature status
+
+    @param (dict) geometry_options
+        How the geometry of each Feature should be simplified (see
+        feature_geometry_options)
+
+    @return (dict) results
+        A generator of Feature dictionaries and the cursor for the next page
+    """
+    def feature_cursor_results(self, Model_, query, search_params, results_per_page=25, status=None, unfiltered=False, geometry_options=None):
+
+        if search_params.get('order_by', None):
+          return status_.status_400('You can\'t use `order_by` while paging with a `cursor`'), 400
+
+        cursor = request.args.get('cursor', '')
+
+        if cursor:
+          try:
+            key, position = decode_cursor(cursor)
+          except ValueError as error:
+            return status_.status_400(str(error)), 400
+        else:
+          key = request.args.get('cursor_key', 'id')
+          position = None
+
+        if key not in CURSOR_KEYS:
+          return status_.status_400('The `cursor_key` must be one of %s' % (', '.join(sorted(CURSOR_KEYS)))), 400
+
+        columns = [getattr(Model_, column) for column in CURSOR_KEYS[key]]
+
+        num_results = self.feature_count(Model_, query, status, unfiltered, default='none')
+
+        if position is None:
+          page_queries = [query]
+        elif key == 'updated' and position[0] is None:
+          page_queries = [query.filter(Model_.updated == None, Model_.id > position[1])]
+        elif key == 'updated':
+          page_queries = [query.filter(db.tuple_(*columns) > db.tuple_(*position)), query.filter(Model_.updated == None)]
+        else:
+          page_queries = [query.filter(db.tuple_(*columns) > db.tuple_(*position))]
+
+        if not results_per_page:
+          results_per_page = 25
+
+        """
+        Read one Feature more than we need, so that we know if there is a
+        next page without having to count
+        """
+        geometry = self.feature_geometry_column(Model_, geometry_options)
+
+        rows = []
+
+        for page_query in page_queries:
+
+          if len(rows) > results_per_page:
+            break
+
+          page_query = page_query.order_by(*columns)
+
+          if geometry is not None:
+            page_query = page_query.options(defer('geometry')).add_columns(geometry)
+
+          rows += page_query.limit(results_per_page + 1 - len(rows)).all()
+
+        next_cursor = None
+
+        if len(rows) > results_per_page:
+          rows = rows[:results_per_page]
+          last_feature = rows[-1][0] if geometry is not None else rows[-1]
+          next_cursor = encode_cursor(key, [getattr(last_feature, column) for column in CURSOR_KEYS[key]])
+
+        deep = dict((relation, {}) for relation in get_relations(Model_))
+
+        return {
+          'objects': (self.feature_dict(row, deep, geometry is not None) for row in rows),
+          'page': None,
+          'total_pages': None,
+          'num_results': num_results,
+          'next': next_cursor,
+          'query': query
+        }
+
+    """
+    Count the Features in a list the way the user asked us to with the
+    `count` parameter
+
+    exact:    COUNT every Feature that matches the query
+    estimate: Use the Feature counts we keep for each Feature Collection when
+              the list is only limited by status, otherwise use the number
+              of rows the database planner expects the query to return
+    none:     Don't count the Features at all
+
+    When the user doesn't ask, lists that are only limited by status use
+    `estimate` (which is exact for them) and every other list uses `exact`.
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (object) query
+        The filtered SQLAlchemy query
+
+    @param (string) status
+        The Feature status every Feature in the list is limited to, if any
+
+    @param (boolean) unfiltered
+        True when the list is only limited by its Feature status
+
+    @param (string) default
+        The type of count to use when the user doesn't ask for one
+
+    @return (int) count
+        The number of Features, or None when they weren't counted
+    """
+    def feature_count(self, Model_, query, status=None, unfiltered=False, default=None):
+
+        count = request.args.get('count', None)
+
+        if count not in ('exact', 'estimate', 'none'):
+          count = default or ('estimate' if unfiltered else 'exact')
+
+        if count == 'none':
+          return None
+
+        if count == 'exact':
+          return query.order_by(None).count()
+
+        if unfiltered:
+
+          status_counts = self.feature_status_counts(Model_)
+
+          if status_counts is not None:
+            if status:
+              return status_counts.get(status, 0)
+            return sum(status_counts.values())
+
+          if not status:
+            return self.feature_count_reltuples(Model_)
+
+        return self.feature_count_estimate(query)
+
+    """
+    The number of Features with each status in a Feature Collection
+
+    These are kept in Redis and only counted in the database when we don't
+    have them yet (see CommonsCounts)
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (dict) counts
+        The number of Features with each status
+    """
+    def feature_status_counts(self, Model_):
+
+        storage = Model_.__tablename__
+
+        status_counts = counts.get(storage)
+
+        if status_counts is None:
+
+          version = counts.version(storage)
+
+          rows = db.session.query(Model_.status, db.func.count(Model_.id)).group_by(Model_.status).all()
+
+          status_counts = dict((status or '', count) for status, count in rows)
+
+          counts.set(storage, status_counts, version)
+
+        return status_counts
+
+    """
+    The number of rows Postgres believes are in the storage table, as of the
+    last time it was analyzed
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (int) count
+        The estimated number of Features
+    """
+    def feature_count_reltuples(self, Model_):
+
+        statement = db.text("SELECT reltuples FROM pg_class WHERE relname = :storage AND relkind = 'r'")
+
+        reltuples = db.session.execute(statement, {'storage': Model_.__tablename__}).scalar()
+
+        return max(0, int(reltuples or 0))
+
+    """
+    The number of rows the database planner expects a query to return
+
+    @param (object) query
+        The filtered SQLAlchemy query
+
+    @return (int) count
+        The estimated number of Features
+    """
+    def feature_count_estimate(self, query):
+
+        compiled = query.order_by(None).statement.compile(dialect=db.engine.dialect)
+
+        plan = db.session.connection().execute('EXPLAIN (FORMAT JSON) %s' % (compiled), compiled.params).scalar()
+
+        if isinstance(plan, basestring):
+          plan = json.loads(plan)
+
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    """
+    Read Features from a query in batches, converting each of them into a
+    dictionary (including any relationships) only as it is needed
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (object) query
+        The SQLAlchemy query to read Features from
+
+    @param (dict) geometry_options
+        How the geometry of each Feature should be simplified (see
+        feature_geometry_options)
+
+    @param (list) properties
+        Labeled SQL expressions to select alongside each Feature, each is
+        added to the Feature dictionary under its label
+
+    @return (generator) features
+        A generator of Feature dictionaries
+    """
+    def feature_stream(self, Model_, query, geometry_options=None, properties=None):
+
+        deep = dict((relation, {}) for relation in get_relations(Model_))
+
+        batch_size = current_app.config.get('FEATURE_STREAM_BATCH_SIZE', 100)
+
+        geometry = self.feature_geometry_column(Model_, geometry_options)
+
+        if geometry is not None:
+          query = query.options(defer('geometry')).add_columns(geometry)
+
+        properties = properties or []
+
+        if properties:
+          query = query.add_columns(*properties)
+
+        query = query.execution_options(stream_results=True).yield_per(batch_size)
+
+        for row in query:
+
+          if not properties:
+            yield self.feature_dict(row, deep, geometry is not None)
+            continue
+
+          values = row[len(row) - len(properties):]
+          row = row[:len(row) - len(properties)]
+
+          feature_ = self.feature_dict(row if geometry is not None else row[0], deep, geometry is not None)
+
+          for property_, value in zip(properties, values):
+            feature_[property_.name] = value
+
+          yield feature_
+
+    """
+    Read the `bbox=minx,miny,maxx,maxy` parameter of the request (in WGS84
+    longitude and latitude) and build a filter for the Features whose
+    bounding box overlaps it
+
+    The `&&` operator only compares bounding boxes, so it is answered from
+    the spatial index on the geometry column without looking at any of the
+    geometries themselves.
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (object) bbox_filter
+        A SQL expression, or None when no `bbox` was requested
+    """
+    def feature_bbox_filter(self, Model_):
+
+        bbox = request.args.get('bbox', None)
+
+        if not bbox:
+          return None
+
+        try:
+          minx, miny, maxx, maxy = [float(value) for value in bbox.split(',')]
+        except ValueError:
+          return status_.status_400('The `bbox` parameter must be four numbers, minx,miny,maxx,maxy'), 400
+
+        if minx > maxx or miny > maxy:
+          return status_.status_400('The `bbox` parameter must be four numbers, minx,miny,maxx,maxy'), 400
+
+        envelope = db.func.ST_MakeEnvelope(minx, miny, maxx, maxy, 4326)
+
+        return Model_.geometry.op('&&')(envelope)
+
+    """
+    Read the `geometry`, `predicate`, and `distance` parameters of the request
+    and build a filter for the Features with that spatial relationship to the
+    geometry (see feature_spatial_filter)
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (string) default
+        The predicate to use when the request doesn't have a `predicate`
+
+    @return (object) spatial_filter
+        A SQL expression, or None when no `geometry` was requested
+    """
+    def feature_spatial_request_filter(self, Model_, default='intersects'):
+
+        geometry = request.args.get('geometry', None)
+
+        if not geometry:
+          return None
+
+        predicate = request.args.get('predicate', default)
+
+        if predicate not in SPATIAL_PREDICATES:
+          return status_.status_400('The `predicate` parameter must be one of %s' % (', '.join(SPATIAL_PREDICATES))), 400
+
+        distance = None
+
+        if predicate == 'dwithin':
+          try:
+            distance = float(request.args.get('distance', ''))
+          except ValueError:
+            distance = -1
+
+          if distance < 0:
+            return status_.status_400('The `dwithin` predicate needs a `distance` in meters'), 400
+
+        geometry_ = self.feature_spatial_geometry(geometry)
+
+        if not self.feature_spatial_valid(geometry_):
+          logger.warning('The geometry you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.')
+          return status_.status_400('The geometry you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.'), 400
+
+        return self.feature_spatial_filter(Model_, predicate, geometry_, distance)
+
+    """
+    Build a filter for the Features with a spatial relationship to a geometry
+
+    Every predicate is one of the PostGIS functions that check the bounding
+    boxes of the geometries with the spatial index before comparing the
+    geometries themselves. `dwithin` measures its distance in meters on the
+    spheroid, which is answered from the index on the geometry as geography
+    that is created for every Feature Collection (see CommonsIndexes).
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (string) predicate
+        One of SPATIAL_PREDICATES
+
+    @param (object) geometry
+        The geometry, or a SQL expression from feature_spatial_geometry
+
+    @param (float) distance
+        The distance in meters, only used by `dwithin`
+
+    @return (object) spatial_filter
+        A SQL expression
+    """
+    def feature_spatial_filter(self, Model_, predicate, geometry, distance=None):
+
+        geometry_ = self.feature_spatial_geometry(geometry)
+
+        if predicate == 'within':
+          return db.func.ST_Within(Model_.geometry, geometry_)
+        elif predicate == 'contains':
+          return db.func.ST_Contains(Model_.geometry, geometry_)
+        elif predicate == 'dwithin':
+          return db.func.ST_DWithin(db.func.geography(Model_.geometry), db.func.geography(geometry_), distance)
+
+        return db.func.ST_Intersects(Model_.geometry, geometry_)
+
+    """
+    Turn a geometry into a SQL expression that sends it to the database as a
+    bound parameter, in WGS84 longitude and latitude
+
+    A geometry without an SRID is assumed to already be in WGS84, one with an
+    SRID (e.g., `SRID=3857;POINT(...)` or EWKB) is transformed into it
+
+    @param (object) geometry
+        A WKBElement, a GeoJSON dictionary or string, WKT or EWKT, or a
+        point as an `x y` string. SQL expressions are returned as they are.
+
+    @return (object) geometry_
+        A SQL expression
+    """
+    def feature_spatial_geometry(self, geometry):
+
+        if isinstance(geometry, WKBElement):
+          geometry_ = db.func.ST_GeomFromEWKB(db.literal(buffer(bytes(geometry.data))))
+        elif isinstance(geometry, dict):
+          geometry_ = db.func.ST_GeomFromGeoJSON(db.literal(json.dumps(geometry)))
+        elif isinstance(geometry, basestring):
+          geometry = geometry.strip()
+
+          if geometry.startswith('{'):
+            geometry_ = db.func.ST_GeomFromGeoJSON(db.literal(geometry))
+          elif re.match(r'^-?[0-9.]+\s+-?[0-9.]+$', geometry):
+            geometry_ = db.func.ST_GeomFromEWKT(db.literal('POINT(%s)' % (geometry)))
+          else:
+            geometry_ = db.func.ST_GeomFromEWKT(db.literal(geometry))
+        else:
+          return geometry
+
+        return db.case([(db.func.ST_SRID(geometry_) == 0, db.func.ST_SetSRID(geometry_, 4326))], else_=db.func.ST_Transform(geometry_, 4326))
+
+    """
+    Check that a geometry from the user can be read and is valid, before it
+    is used to search a Feature Collection
+
+    @param (object) geometry_
+        A SQL expression from feature_spatial_geometry
+
+    @return (boolean) valid
+    """
+    def feature_spatial_valid(self, geometry_):
+
+        try:
+          return bool(db.session.scalar(db.select([db.func.ST_IsValid(geometry_)])))
+        except SQLAlchemyError as error:
+          db.session.rollback()
+          logger.warning('Unable to read the geometry %s', error)
+          return False
+
+    """
+    Convert a Feature, or a Feature and its simplified geometry, into a
+    dictionary
+
+    @param (object) row
+        A Feature, or a (Feature, GeoJSON) row when the geometry was selected
+        separately by feature_geometry_column
+
+    @param (dict) deep
+        The relationships to include
+
+    @param (boolean) simplified
+        True when the row includes a separately selected geometry
+
+    @return (dict) feature
+        The Feature dictionary
+    """
+    def feature_dict(self, row, deep, simplified=False):
+
+        if not simplified:
+          return to_dict(row, deep)
+
+        feature, geometry = row
+
+        feature_ = to_dict(feature, deep, exclude=['geometry'])
+        feature_['geometry'] = json.loads(geometry) if geometry else None
+
+        return feature_
+
+    """
+    Read the `simplify`, `zoom`, and `precision` parameters of the request
+
+    simplify:  The tolerance (in degrees) used to simplify each geometry
+    zoom:      A web map zoom level, used to pick a tolerance of about one
+               pixel when `simplify` isn't given
+    precision: The number of decimal places in each coordinate
+
+    @return (dict) options
+        The `tolerance` and `precision` to use, each of which may be None
+    """
+    def feature_geometry_options(self):
+
+        tolerance = None
+        precision = None
+
+        try:
+          if request.args.get('simplify', None):
+            tolerance = float(request.args.get('simplify'))
+          elif request.args.get('zoom', None):
+            zoom = int(request.args.get('zoom'))
+            if zoom < 0 or zoom > 30:
+              raise ValueError
+            tolerance = 360.0 / (256 * 2 ** zoom)
+
+          if request.args.get('precision', None):
+            precision = int(request.args.get('precision'))
+            if precision < 0 or precision > 15:
+              raise ValueError
+        except ValueError:
+          return status_.status_400('The `simplify` parameter must be a number, `zoom` a whole number from 0 to 30, and `precision` a whole number from 0 to 15'), 400
+
+        if tolerance is not None and tolerance <= 0:
+          tolerance = None
+
+        return {
+          'tolerance': tolerance,
+          'precision': precision
+        }
+
+    """
+    Build the expression that selects a simplified and/or less precise
+    version of each geometry as GeoJSON, so the database does the work and
+    only the vertices the user needs are ever sent to us
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (dict) geometry_options
+        The `tolerance` and `precision` (see feature_geometry_options) and,
+        optionally, a `clip` box to cut each geometry to
+
+    @return (object) geometry
+        A labeled SQL expression, or None when the geometry should be
+        selected as it is
+    """
+    def feature_geometry_column(self, Model_, geometry_options=None):
+
+        geometry_options = geometry_options or {}
+
+        tolerance = geometry_options.get('tolerance', None)
+        precision = geometry_options.get('precision', None)
+        clip = geometry_options.get('clip', None)
+
+        if (tolerance is None and precision is None and clip is None) or not hasattr(Model_, 'geometry'):
+          return None
+
+        geometry = Model_.geometry
+
+        if clip is not None:
+          geometry = db.func.ST_ClipByBox2D(geometry, clip)
+
+        if tolerance is not None:
+          geometry = db.func.ST_SimplifyPreserveTopology(geometry, tolerance)
+
+        if precision is not None:
+          return db.func.ST_AsGeoJSON(geometry, precision).label('geometry_geojson')
+
+        return db.func.ST_AsGeoJSON(geometry).label('geometry_geojson')
+
+    def feature_delete(self, storage_, feature_id):
+
+        storage = self.validate_storage(storage_)
+
+        Template_ = get_template(storage)
+
+        Storage_ = self.get_storage(Template_)
+
+        feature = Storage_.query.get(feature_id)
+
+        """
+        Check to see if the User that wants to update this Feature is allowed to. This function will
+        ABORT the `feature_update` method if user access does not match. 
+        """
+        feature_write_access = self.feature_write_check_access(feature, storage, Template_, Storage_)
+        if not feature_write_access:
+          return status_.status_403(), 403
+
+        if not hasattr(feature, 'id'):
+            return abort(404)
+
+        db.session.delete(feature)
+        db.session.commit()
+
+        """
+        Trigger: trigger_feature_deleted
+        """
+        trigger_feature_deleted.send(current_app._get_current_object(),
+                             storage=storage, template=Template_, feature_id=feature_id)
+
+        return status_.status_204(), 204
+
+    def attachment_delete(self, storage_, feature_id, attachment_storage_, attachment_id):
+
+        storage = self.validate_storage(storage_)
+        attachment_storage = self.validate_storage(attachment_storage_)
+
+        Template_ = get_template(storage)
+        Attachment_ = self.get_storage(str(attachment_storage))
+        
+        assoc_ = self._feature_relationship_associate(Template_, attachment_storage)
+        Relationship_ = self.get_storage(str(assoc_))
+
+        if not Template_.id in self.allowed_templates(permission_type='read'):
+          return status_.status_401('That isn\'t your feature'), 401
+
+        try:
+          """
+          Step 1: Delete the feature <> attachment relationship
+          """
+          relationship_ = Relationship_.query.filter_by(parent_id=feature_id).filter_by(child_id=attachment_id).first()
+          # logger.warning('existing_relationship %s %s', existing_relationship.parent_id, existing_relationship.child_id)
+          db.session.delete(relationship_)
+          db.session.commit()
+
+          """
+          Step 2: Delete the attachment record
+          """
+          attachment = Attachment_.query.get(attachment_id)
+
+          if not hasattr(attachment, 'id'):
+              return abort(404)
+
+          db.session.delete(attachment)
+          db.session.commit()
+
+          """
+          Step 3: Delete the media from Amazon
+          """
+          # self.s3_delete()
+
+          return True
+  
+        except:
+          return status_.status_400('Something went wrong and we couldn\'t delete that attachment'), 400
+
+    """
+    A single web map tile of a Feature Collection, either as a Mapbox Vector
+    Tile (encoded by PostGIS with ST_AsMVT) or as a GeoJSON tile
+
+    Only Features whose bounding box overlaps the tile are read (using the
+    spatial index), each geometry is clipped to the tile and simplified to
+    about one pixel at the tile's zoom level, and the same permission rules
+    as feature_list apply.
+
+    @param (string) storage_
+        The storage name of the Feature Collection
+
+    @param (int) z
+        The zoom level of the tile
+
+    @param (int) x
+        The column of the tile
+
+    @param (int) y
+        The row of the tile
+
+    @param (string) extension
+        Either `mvt` or `geojson`
+
+    @return (dict) tile
+        The `content` of the tile and its `etag` and `last_modified` date
+    """
+    def feature_tile(self, storage_, z, x, y, extension='mvt'):
+
+        if z < 0 or z > 30 or x < 0 or y < 0 or x >= 2 ** z or y >= 2 ** z:
+          return status_.status_400('There is no tile %d/%d/%d' % (z, x, y)), 400
+
+        storage = self.validate_storage(storage_)
+
+        Template_ = get_template(storage)
+
+        if Template_ is None:
+          return abort(404)
+
+        Model_ = self.get_storage(Template_, Template_.fields, relationship=False)
+
+        read_filter = self.feature_read_filter(storage_, Template_, Model_)
+
+        validator = self.feature_list_validator(Template_, Model_)
+
+        not_modified = self.not_modified(**validator)
+        if not_modified:
+          return not_modified
+
+        envelope = db.func.ST_MakeEnvelope(*(list(tile_bounds(z, x, y)) + [3857]))
+        region = db.func.ST_Transform(envelope, 4326)
+
+        filters = [Model_.geometry.op('&&')(region)]
+
+        if read_filter is not None:
+          filters.append(read_filter)
+
+        if extension == 'geojson':
+          geometry_options = {
+            'clip': region,
+            'tolerance': 360.0 / (256 * 2 ** z),
+            'precision': 6
+          }
+          content = self.feature_stream(Model_, Model_.query.filter(*filters), geometry_options)
+        else:
+          content = self.feature_tile_mvt(Model_, envelope, filters)
+
+        return {
+          'content': content,
+          'etag': validator['etag'],
+          'last_modified': validator['last_modified']
+        }
+
+    """
+    The Features closest to a point, nearest first, each with its `distance`
+    from the point in meters
+
+    The Features are ordered with the PostGIS `<->` operator on the geography
+    of each geometry, which walks the spatial index on geography(geometry)
+    (see CommonsIndexes) outward from the point instead of measuring the
+    distance to every Feature. The same permission rules as feature_list
+    apply.
+
+    @param (string) storage_
+        The storage name of the Feature Collection
+
+    @return (dict) nearest
+        The `content` (a generator of Feature dictionaries) and its `etag`
+        and `last_modified` date
+    """
+    def feature_nearest(self, storage_):
+
+        try:
+          lng = float(request.args.get('lng', ''))
+          lat = float(request.args.get('lat', ''))
+        except ValueError:
+          return status_.status_400('The `lng` and `lat` parameters must be numbers'), 400
+
+        if not -180 <= lng <= 180 or not -90 <= lat <= 90:
+          return status_.status_400('The `lng` and `lat` parameters must be a longitude and latitude in WGS84'), 400
+
+        maximum = current_app.config.get('NEAREST_MAX_RESULTS', 100)
+
+        try:
+          k = int(request.args.get('k', 10))
+        except ValueError:
+          k = 0
+
+        if k < 1 or k > maximum:
+          return status_.status_400('The `k` parameter must be a whole number from 1 to %d' % (maximum)), 400
+
+        geometry_options = self.feature_geometry_options()
+
+        if type(geometry_options) is tuple:
+          return geometry_options
+
+        storage = self.validate_storage(storage_)
+
+        Template_ = get_template(storage)
+
+        if Template_ is None:
+          return abort(404)
+
+        Model_ = self.get_storage(Template_, Template_.fields)
+
+        self.__public__['default'].append('distance')
+
+        read_filter = self.feature_read_filter(storage_, Template_, Model_)
+
+        validator = self.feature_list_validator(Template_, Model_)
+
+        not_modified = self.not_modified(**validator)
+        if not_modified:
+          return not_modified
+
+        point = db.func.geography(db.func.ST_SetSRID(db.func.ST_MakePoint(lng, lat), 4326))
+        geography = db.func.geography(Model_.geometry)
+
+        query = Model_.query.filter(Model_.geometry != None)
+
+        if read_filter is not None:
+          query = query.filter(read_filter)
+
+        query = query.order_by(geography.op('<->')(point)).limit(k)
+
+        distance = db.func.ST_Distance(geography, point).label('distance')
+
+        return {
+          'content': self.feature_stream(Model_, query, geometry_options, [distance]),
+          'etag': validator['etag'],
+          'last_modified': validator['last_modified']
+        }
+
+    """
+    Encode the Features of a tile as a Mapbox Vector Tile
+
+    Every column except the geometry becomes a property of the Feature, any
+    that aren't numbers or booleans are sent as text.
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @param (object) envelope
+        The bounds of the tile in Web Mercator
+
+    @param (list) filters
+        The SQL expressions selecting the Features in the tile
+
+    @return (str) tile
+        The binary vector tile
+    """
+    def feature_tile_mvt(self, Model_, envelope, filters):
+
+        extent = current_app.config.get('TILE_EXTENT', 4096)
+        buffer_ = current_app.config.get('TILE_BUFFER', 64)
+
+        columns = []
+
+        for column in Model_.__table__.columns:
+          if column.name == 'geometry':
+            continue
+          elif isinstance(column.type, (db.Integer, db.Float, db.Numeric, db.Boolean)):
+            columns.append(column)
+          else:
+            columns.append(db.cast(column, db.Text).label(column.name))
+
+        columns.append(db.func.ST_AsMVTGeom(db.func.ST_Transform(Model_.geometry, 3857), envelope, extent, buffer_, True).label('geom'))
+
+        tile = db.select(columns).where(db.and_(*filters)).alias('tile')
+
+        statement = db.select([db.func.ST_AsMVT(db.literal_column('tile'), Model_.__tablename__, extent, 'geom')]).select_from(tile)
+
+        content = db.session.execute(statement).scalar()
+
+        return str(content) if content is not None else ''
+
+    """
+    The SQL expression that limits a Feature Collection to the Features the
+    current user may read, following the same rules as feature_list
+
+    @param (string) storage_
+        The storage name of the Feature Collection
+
+    @param (object) Template_
+        A fully qualified Template object
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (object) read_filter
+        A SQL expression, or None when the user can read every Feature
+    """
+    def feature_read_filter(self, storage_, Template_, Model_):
+
+        if Template_.is_public and not self.current_user:
+          return Model_.status == 'public'
+
+        if not Template_.id in self.allowed_templates():
+          logger.warning('User has no access to this template')
+          abort(403)
+
+        if Template_.id in self.allowed_templates(permission_type='is_moderator') or \
+            Template_.id in self.allowed_templates(permission_type='is_admin'):
+          return None
+
+        return self.feature_permission_filter(storage_, Template_, Model_)
+
+    """
+    The Features that intersect a geometry
+
+    @param (string) storage_
+        The storage name of the Feature Collection
+
+    @param (object) geometry
+        Any geometry feature_spatial_geometry accepts, including a point as
+        an `x y` string
+
+    @param (dict) geometry_options
+        When given, the Features are streamed as dictionaries with their
+        geometry simplified (see feature_geometry_options), otherwise a list
+        of Feature objects is returned
+
+    @return (list) features
+    """
+    def feature_get_intersection(self, storage_, geometry, geometry_options=None):
+
+        storage = self.validate_storage(storage_)
+
+        this_template = get_template(storage)
+
+        Storage_ = self.get_storage(this_template)
+
+        query = Storage_.query.filter(self.feature_spatial_filter(Storage_, 'intersects', geometry))
+
+        if geometry_options is not None:
+          return self.feature_stream(Storage_, query, geometry_options)
+
+        return query.all()
+
+
+    """
+    The Features with a spatial relationship to a region
 
-        search_params = json.loads(request.args.get('q', '{}'))
+    @param (string) storage_
+        The storage name of the Feature Collection
 
-        """
-        Only display public posts
-        """
-        public_filter = {
-          "name": "status",
-          "op": "eq",
-          "val": "public"
-        }
+    @param (string) geometry
+        The region as WKT, EWKT, or GeoJSON
 
-        if 'filters' in search_params:
-          search_params['filters'].append(public_filter)
-        else:
-          search_params = {
-            "filters": [public_filter]
-          }
+    @param (dict) geometry_options
+        When given, the Features are streamed as dictionaries with their
+        geometry simplified (see feature_geometry_options), otherwise a list
+        of Feature objects is returned
 
-        results = endpoint_._search(search_params)
+    @param (string) predicate
+        One of SPATIAL_PREDICATES
 
-        return {
-          'results': results.get('results'),
-          'model': Model_,
-          'template': Template_
-        }
+    @param (float) distance
+        The distance in meters, only used by `dwithin`
 
+    @return (list) features
     """
-    The Feature Collection/Template was marked as a not is_public and therefore requires that the 
-    requesting user have at minimum 'read' access to this Feature Collection being requested. Varying
-    Features may be displayed based on the user's exact permissions. Use cases covered here are:
+    def feature_get_content_for_region(self, storage_, geometry, geometry_options=None, predicate='intersects', distance=None):
 
-    1. A user with `read/write` permission to the Template_ being requested will display Features (a) with a status
-       of 'public', (b) with owner === current_user.id, or (c) with Feature 'read' permission or higher
+        storage = self.validate_storage(storage_)
 
-    2. A user with 'is_moderator/is_admin' permission to the Template_ being requested will display all Features in
-       the Feature Collection
-    """
-    def feature_list_secure(self, storage_, Template_, Model_, endpoint_, results_per_page=25):
+        Template_ = get_template(storage)
 
-        search_params = json.loads(request.args.get('q', '{}'))
+        Storage_ = self.get_storage(Template_, Template_.fields)
 
-        """
-        If the Template has Feature level permission enabled, then we need to build a list
-        of Feature IDs from this Feature Collection, that the user can access.
+        region_filter = self.feature_region_filter(Storage_, geometry, predicate, distance)
 
-        We need to make sure though that we merge together 'public' features with the 'explicitly allowed'
-        features, this meets one of the following criteria:
+        if type(region_filter) is tuple:
+          return region_filter
 
-        1. User has Feature `read` (including `is_admin`, `is_moderator`) permission
-        2. User has Template `is_moderator` or `is_admin` permission
-        3. User id matches Feature.owner
+        query = Storage_.query.filter(region_filter)
 
-        """
+        if geometry_options is not None:
+          return self.feature_stream(Storage_, query, geometry_options)
 
-        """
-        Check to see if the current_user has Feature Collection/Template is_moderator or is_admin
-        level of permissions. If so, then they should see every Feature in the Collection regardless
-        of Feature Status (e.g., published, private, draft, crowd) and Feature-level Permission
-        """
-        if Template_.id in self.allowed_templates(permission_type='is_moderator') or \
-            Template_.id in self.allowed_templates(permission_type='is_admin'):
-            # Do nothing, go ahead and display everything, this is just a stub for any
-            # future necessary admin or moderator specific permissions.
-            pass
-        else:
-          permissions = []
+        return query.all()
 
-          """
-          Display all Features marked as 'public' within the Collection
-          """
-          permissions.append({
-            "name": "status",
-            "op": "eq",
-            "val": "public"
-          })
+    """
+    Build the filter for the Features with a spatial relationship to a
+    region requested by the user
 
-          """
-          Display all Features user is the 'owner' of in this Collection
-          """
-          permissions.append({
-            "name": "owner",
-            "op": "eq",
-            "val": self.current_user.id
-          })
+    @param (object) Storage_
+        The dynamic model for the Feature Collection
 
-          """
-          Check to see if this template has Feature Level ACL enabled
-          """
-          if Template_.has_acl:
-            """
-            Display all Features user has Feature-level 'read' or higher access to, within this Collection
-            """
-            allowed_features = self.allowed_features(storage=storage_, permission_type='read')
-            permissions.append({
-              "name": "id",
-              "op": "in",
-              "val": allowed_features
-            })
+    @param (string) geometry
+        The region as WKT, EWKT, or GeoJSON
 
-          """
-          Combine new Filters with the preexisting_fitlers defined by the user in the original Request
+    @param (string) predicate
+        One of SPATIAL_PREDICATES
 
-          If there are no existing search filters then we need to start an entirely new object and
-          add our access_filters as a list to that object
-          """
-          if 'filters' in search_params:
-            search_params['permissions'] = permissions
-          else:
-            search_params = {
-              "filters": [],
-              "permissions": permissions
-            }
+    @param (float) distance
+        The distance in meters, only used by `dwithin`
 
+    @return (object) region_filter
+        A SQL expression, or a 400 response when the region isn't valid
+    """
+    def feature_region_filter(self, Storage_, geometry, predicate='intersects', distance=None):
 
-        results = endpoint_._search(search_params)
+        if not isinstance(geometry, basestring) or predicate not in SPATIAL_PREDICATES:
+          logger.warning('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.')
+          return status_.status_400('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.'), 400
 
-        return {
-          'results': results.get('results'),
-          'model': Model_,
-          'template': Template_
-        }
+        if predicate == 'dwithin' and (distance is None or distance < 0):
+          return status_.status_400('The `dwithin` predicate needs a `distance` in meters'), 400
 
-    def feature_delete(self, storage_, feature_id):
+        region = self.feature_spatial_geometry(geometry)
 
-        storage = self.validate_storage(storage_)
+        if not self.feature_spatial_valid(region):
+          logger.warning('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.')
+          return status_.status_400('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.'), 400
 
-        Template_ = Template.query.filter_by(storage=storage).first()
+        return self.feature_spatial_filter(Storage_, predicate, region, distance)
 
-        Storage_ = self.get_storage(Template_)
+    """
+    The Features in a region counted in cells, instead of listed one by one,
+    so that a map can draw clusters without downloading every Feature
 
-        feature = Storage_.query.get(feature_id)
+    Each Feature is placed in a cell by its centroid, either by snapping the
+    centroid to a grid (`aggregate=grid`) or by its geohash (`aggregate=geohash`).
+    Cells are about AGGREGATE_CELL_PIXELS wide at the requested `zoom`, or
+    `cell` degrees wide. The database does all of the counting, only one row
+    per cell is sent back. The same permission rules as feature_list apply.
 
-        """
-        Check to see if the User that wants to update this Feature is allowed to. This function will
-        ABORT the `feature_update` method if user access does not match. 
-        """
-        feature_write_access = self.feature_write_check_access(feature, storage, Template_, Storage_)
-        if not feature_write_access:
-          return status_.status_403(), 403
+    @param (string) storage_
+        The storage name of the Feature Collection
 
-        if not hasattr(feature, 'id'):
-            return abort(404)
+    @param (string) geometry
+        The region as WKT, EWKT, or GeoJSON
 
-        db.session.delete(feature)
-        db.session.commit()
+    @param (string) aggregate
+        Either `grid` or `geohash`
 
-        return status_.status_204(), 204
+    @param (string) predicate
+        One of SPATIAL_PREDICATES
 
-    def attachment_delete(self, storage_, feature_id, attachment_storage_, attachment_id):
+    @param (float) distance
+        The distance in meters, only used by `dwithin`
 
-        storage = self.validate_storage(storage_)
-        attachment_storage = self.validate_storage(attachment_storage_)
+    @param (boolean) show_statistics
+        Include the value of each of the Template's Statistics in every cell
 
-        Template_ = Template.query.filter_by(storage=storage).first()
-        Attachment_ = self.get_storage(str(attachment_storage))
-        
-        assoc_ = self._feature_relationship_associate(Template_, attachment_storage)
-        Relationship_ = self.get_storage(str(assoc_))
+    @return (generator) cells
+        A dictionary for each cell with its `id`, the `count` of Features,
+        the centroid of those Features as its `geometry`, and the value of
+        each Statistic by name
+    """
+    def feature_get_region_aggregate(self, storage_, geometry, aggregate='grid', predicate='intersects', distance=None, show_statistics=False):
 
-        if not Template_.id in self.allowed_templates(permission_type='read'):
-          return status_.status_401('That isn\'t your feature'), 401
+        if aggregate not in ('grid', 'geohash'):
+          return status_.status_400('The `aggregate` parameter must be either `grid` or `geohash`'), 400
 
         try:
-          """
-          Step 1: Delete the feature <> attachment relationship
-          """
-          relationship_ = Relationship_.query.filter_by(parent_id=feature_id).filter_by(child_id=attachment_id).first()
-          # logger.warning('existing_relationship %s %s', existing_relationship.parent_id, existing_relationship.child_id)
-          db.session.delete(relationship_)
-          db.session.commit()
+          if request.args.get('cell', None):
+            cell = float(request.args.get('cell'))
+          elif request.args.get('zoom', None):
+            zoom = int(request.args.get('zoom'))
+            if zoom < 0 or zoom > 30:
+              raise ValueError
+            cell = (360.0 / 2 ** zoom) * current_app.config.get('AGGREGATE_CELL_PIXELS', 64) / 256
+          else:
+            raise ValueError
+        except ValueError:
+          return status_.status_400('Aggregating a region needs a `zoom` (a whole number from 0 to 30) or a `cell` size in degrees'), 400
 
-          """
-          Step 2: Delete the attachment record
-          """
-          attachment = Attachment_.query.get(attachment_id)
+        if cell <= 0:
+          return status_.status_400('Aggregating a region needs a `zoom` (a whole number from 0 to 30) or a `cell` size in degrees'), 400
 
-          if not hasattr(attachment, 'id'):
-              return abort(404)
+        storage = self.validate_storage(storage_)
 
-          db.session.delete(attachment)
-          db.session.commit()
+        Template_ = get_template(storage)
 
-          """
-          Step 3: Delete the media from Amazon
-          """
-          # self.s3_delete()
+        if Template_ is None:
+          return abort(404)
 
-          return True
-  
-        except:
-          return status_.status_400('Something went wrong and we couldn\'t delete that attachment'), 400
+        Storage_ = self.get_storage(Template_, Template_.fields, relationship=False)
 
-    def feature_get_intersection(self, storage_, geometry):
+        region_filter = self.feature_region_filter(Storage_, geometry, predicate, distance)
 
-        storage = self.validate_storage(storage_)
+        if type(region_filter) is tuple:
+          return region_filter
 
-        this_template = Template.query.filter_by(storage=storage).first()
+        read_filter = self.feature_read_filter(storage_, Template_, Storage_)
 
-        Storage_ = self.get_storage(this_template)
+        centroid = db.func.ST_Centroid(Storage_.geometry)
 
-        if isinstance(geometry, WKBElement):
-            if db.session is not None:
-              string = str(db.session.scalar(geofunc.ST_AsGeoJSON(geometry)))
-              geojson = json.loads(string)
-              geometries = geojson.get('geometries', None)
-              coordinates = geometries[0].get('coordinates', None)
-              logger.debug('XXgeometries[0].get(coordinates, None), %s', coordinates)
-              coordinates_ = [str(coordinates[0]), str(coordinates[1])]
-              clean_geometry = ' '.join(coordinates_)
+        if aggregate == 'geohash':
+          key = db.func.ST_GeoHash(centroid, self.feature_geohash_precision(cell))
         else:
-          clean_geometry = geometry
+          key = db.func.ST_AsText(db.func.ST_SnapToGrid(centroid, cell))
 
-        point = str('SRID=4326;POINT(%s)' % clean_geometry)
+        columns = [
+          key.label('cell'),
+          db.func.count().label('count'),
+          db.func.ST_AsGeoJSON(db.func.ST_Centroid(db.func.ST_Collect(centroid))).label('centroid')
+        ]
 
-        select_statement = db.select([Storage_]).where(geofunc.ST_Intersects(point, Storage_.geometry))
+        statistics = []
 
-        features = Storage_.query.select_entity_from(select_statement).all()
+        if show_statistics:
+          fields = dict((field.id, field) for field in Template_.fields)
 
-        return features
+          for statistic in Statistic.query.filter(Statistic.field_id.in_(fields.keys() or [0])).all():
 
+            aggregate_ = self.get_statistic_aggregate(statistic, fields.get(statistic.field_id, None), Storage_)
 
-    def feature_get_content_for_region(self, storage_, geometry):
+            if aggregate_ is not None:
+              statistics.append(statistic.name)
+              columns.append(aggregate_)
 
-        storage = self.validate_storage(storage_)
+        query = db.session.query(*columns).filter(region_filter)
 
-        Template_ = Template.query.filter_by(storage=storage).first()
+        if read_filter is not None:
+          query = query.filter(read_filter)
 
-        Storage_ = self.get_storage(Template_, Template_.fields)
+        query = query.group_by(key)
 
-        if not isinstance(geometry, unicode):
-          logger.warning('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.')
-          return status_.status_400('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.'), 400
+        """
+        Each cell is serialized with only these keys (see serialize_object)
+        """
+        self.__public__ = {
+          'default': ['id', 'count', 'geometry'] + statistics
+        }
 
-        region = db.session.scalar(geofunc.ST_IsValid(str(geometry)))
+        return self.feature_aggregate_cells(query, statistics)
 
-        if not region:
-          logger.warning('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.')
-          return status_.status_400('The region you submitted was not valid, please see http://postgis.net/docs/ST_IsValid.html to better understand why you\'re seeing this message.'), 400
+    def feature_aggregate_cells(self, query, statistics):
+
+        for row in query:
 
-        select_statement = db.select([Storage_]).where(geofunc.ST_Intersects(Storage_.geometry, geometry))
-        features = Storage_.query.select_entity_from(select_statement).all()
+          cell = {
+            'id': row[0],
+            'count': row[1],
+            'geometry': json.loads(row[2]) if row[2] else None
+          }
+
+          for name, value in zip(statistics, row[3:]):
+            cell[name] = self.get_statistic_value(value)
+
+          yield cell
+
+    """
+    The shortest geohash with cells no wider than `cell` degrees, a geohash
+    of `precision` characters alternates its 5 * precision bits between
+    longitude and latitude starting with longitude
+
+    @param (float) cell
+        The width of a cell in degrees
+
+    @return (int) precision
+    """
+    def feature_geohash_precision(self, cell):
 
-        return features
+        for precision in range(1, 13):
+          if 360.0 / 2 ** ((5 * precision + 1) // 2) <= cell:
+            return precision
+
+        return 12
 
 
     def feature_attachments(self, child_table, content, parent_id, assoc_):
@@ -1010,50 +2511,126 @@ class Feature(CommonsModel):
 
     """
     Determine statistics for this query
+
+    Every Statistic for the Template is compiled into a single aggregate
+    SELECT over the same filtered query that produced the Features, so the
+    database does all of the math and we only ever read back one row.
+
+    @param (object) query
+        The filtered (but not paginated) query for the Feature Collection
+
+    @param (object) template
+        A fully qualified Template object
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (list) statistics_list
+        A list of dictionaries containing the name, units, and value of
+        each Statistic
     """
-    def get_statistics(self, query_results, template):
+    def get_statistics(self, query, template, Model_):
 
-      logger.warning('get_statistics')    
+      logger.debug('get_statistics')
       statistics_list = []
 
-      statistic_field_id_list = self._statistic_field_id_list(template.fields)
-      
-      statistics = Statistic.query.filter(Statistic.field_id.in_(statistic_field_id_list)).all()
-      
+      fields = dict((field.id, field) for field in template.fields)
+
+      if not fields:
+        return statistics_list
+
+      statistics = Statistic.query.filter(Statistic.field_id.in_(fields.keys())).all()
+
+      aggregates = []
+      aggregate_statistics = []
+
       for statistic in statistics:
-        
-        this_statistic_field = Field.query.get(statistic.field_id)
-        this_statistic_value = self.get_statistic_value(statistic, query_results, this_statistic_field)
-        
+
         this_statistic = {
           "name": statistic.name,
           "units": statistic.units,
-          "value": this_statistic_value
+          "value": None
         }
-        
+
         statistics_list.append(this_statistic)
-        
+
+        aggregate = self.get_statistic_aggregate(statistic, fields.get(statistic.field_id, None), Model_)
+
+        if aggregate is None:
+          logger.warning('Statistic %s (%s) could not be calculated', statistic.id, statistic.function)
+          continue
+
+        aggregates.append(aggregate)
+        aggregate_statistics.append(this_statistic)
+
+      if aggregates:
+        values = query.order_by(None).limit(None).offset(None).with_entities(*aggregates).one()
+
+        for this_statistic, value in zip(aggregate_statistics, values):
+          this_statistic['value'] = self.get_statistic_value(value)
+
       return statistics_list
-        
+
     """
-    Return a single value for a given field
+    Build the SQL aggregate for a single Statistic
+
+    @param (object) statistic
+        A fully qualified Statistic object
+
+    @param (object) field
+        The Field the Statistic is calculated from
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (object) aggregate
+        A SQLAlchemy aggregate expression or None if the Statistic's
+        function or Field isn't one we can calculate
     """
-    def get_statistic_value(self, statistic_object, query_results, field):
-          
-      try:
-        if 'sum' in statistic_object.function:
-          return self.get_statistic_value_sum(query_results, field)
+    def get_statistic_aggregate(self, statistic, field, Model_):
 
-      except Exception as e:
-        logger.warning(e)
-          
-    def get_statistic_value_sum(self, query_results, field, product = 0):
+      if field is None or not hasattr(Model_, field.name):
+        return None
+
+      function = (statistic.function or '').strip().lower().replace(' ', '_')
+
+      column = getattr(Model_, field.name)
+
+      """
+      Numeric functions need a number to work with, some Fields store their
+      numbers as text so we convert them (and empty strings) first
+      """
+      if function in ('sum', 'avg', 'average', 'mean'):
+        if not isinstance(column.type, (db.Integer, db.Float, db.Numeric)):
+          column = db.cast(db.func.nullif(db.cast(column, db.Text), ''), db.Numeric)
+
+      if function == 'sum':
+        return db.func.coalesce(db.func.sum(column), 0)
+      elif function in ('avg', 'average', 'mean'):
+        return db.func.avg(column)
+      elif function == 'min':
+        return db.func.min(column)
+      elif function == 'max':
+        return db.func.max(column)
+      elif function == 'count':
+        return db.func.count(column)
+      elif function in ('count_distinct', 'distinct'):
+        return db.func.count(db.distinct(column))
 
-      for result in query_results:
-        field_value = getattr(result, field.name, '')
-        product = product+int(field_value or 0)
+      return None
 
-      return product
+    """
+    Convert the value returned by the database into something that can be
+    serialized by our formatters
+    """
+    def get_statistic_value(self, value):
+
+      if isinstance(value, Decimal):
+        if value == value.to_integral_value():
+          return int(value)
+        return float(value)
+
+      return value
 
     def _statistic_field_id_list(self, fields):
 
@@ -1134,7 +2711,7 @@ class Feature(CommonsModel):
       logger.warning('Creating an Excel template for the %s feature collection', storage_)
 
       storage = self.validate_storage(storage_)
-      Template_ = Template.query.filter_by(storage=storage).first()
+      Template_ = get_template(storage)
       Storage_ = self.get_storage(Template_)
 
       """
@@ -1175,10 +2752,13 @@ class Feature(CommonsModel):
     def feature_import(self, request_object, storage_):
 
       file_ = request_object.files.get('import')
+
+      chunks = self.feature_import_chunks(file_)
+
       output = self.s3_upload(file_)
   
       storage = self.validate_storage(storage_)
-      Template_ = Template.query.filter_by(storage=storage).first()
+      Template_ = get_template(storage)
 
       fields = self.safe_field_list(Template_.fields)
 
@@ -1191,16 +2771,80 @@ class Feature(CommonsModel):
         'result': '',
         'status': 'pending',
         'template_id': Template_.id,
-        'notify': self.current_user.email
+        'notify': self.current_user.email,
+        'chunks_total': len(chunks)
       }
       activity = Activity(**new_activity)
       db.session.add(activity)
       db.session.commit()
 
-      job = get_queue().enqueue_call(func=import_csv, args=(str(output), str(storage_), fields, activity.id), timeout=3600)
+      """
+      Each chunk is a separate job, so a large file is imported by every
+      available worker at once. The last chunk to finish completes the
+      Activity (see import_csv_complete).
+      """
+      for start_row, end_row, byte_range in chunks:
+        get_queue().enqueue_call(func=import_csv_chunk, args=(str(output), str(storage_), fields, activity.id, start_row, end_row, byte_range), timeout=3600)
 
       return activity
 
+    """
+    Split an uploaded CSV file into ranges of rows that can be imported
+    independently of one another
+
+    @param (object) self
+
+    @param (object) file_
+        The uploaded file from the request
+
+    @return (list) chunks
+        A list of (start_row, end_row, byte_range) tuples, rows are counted
+        from the first row after the header row and `byte_range` is the
+        byte offset of the end of the header row and of the start and end
+        of the chunk's rows, so each job only has to read its own rows
+    """
+    def feature_import_chunks(self, file_):
+
+      chunk_rows = current_app.config.get('FEATURE_IMPORT_CHUNK_ROWS', 50000)
+
+      file_.stream.seek(0)
+
+      """
+      A row can span several lines (e.g., a quoted value with a line break),
+      csv.reader only reads the lines it needs for each row, so the bytes
+      read so far always end on a row
+      """
+      position = [0]
+
+      def lines():
+        for line in iter(file_.stream.readline, ''):
+          position[0] += len(line)
+          yield line
+
+      offsets = []
+      total_rows = -1
+
+      for row in csv.reader(lines()):
+        total_rows += 1
+        if total_rows % chunk_rows == 0:
+          offsets.append(position[0])
+
+      file_.stream.seek(0)
+
+      if total_rows < 1:
+        return [(0, 0, None)]
+
+      header_end = offsets[0]
+      offsets = offsets[1:] if total_rows % chunk_rows == 0 else offsets[1:] + [position[0]]
+
+      chunks = []
+
+      for index, start_row in enumerate(range(0, total_rows, chunk_rows)):
+        start_byte = offsets[index - 1] if index else header_end
+        chunks.append((start_row, min(start_row + chunk_rows, total_rows), (header_end, start_byte, offsets[index])))
+
+      return chunks
+
     def safe_field_list(self, fields):
 
       safe_fields = []
@@ -1293,6 +2937,78 @@ class Feature(CommonsModel):
       return features_
 
 
+    """
+    Build the SQL expression that limits a Feature Collection to the Features
+    the current user is allowed to read
+
+    Instead of loading every Feature the user has been granted access to and
+    sending those IDs back to the database, the `_users` table is checked
+    with a correlated EXISTS, so the cost doesn't grow with the number of
+    Features that have been shared with the user.
+
+    @param (string) storage
+        The storage name of the Feature Collection
+
+    @param (object) Template_
+        A fully qualified Template object
+
+    @param (object) Model_
+        The dynamic model for the Feature Collection
+
+    @return (object) permission_filter
+        A SQL expression to be added to the Feature query
+    """
+    def feature_permission_filter(self, storage, Template_, Model_):
+
+      permissions = [
+        Model_.status == 'public',
+        Model_.owner == self.current_user.id
+      ]
+
+      if Template_.has_acl:
+        UserFeatures = self.get_storage(self.validate_storage(str(storage + '_users')))
+
+        permissions.append(db.exists().where(db.and_(
+          UserFeatures.feature_id == Model_.id,
+          UserFeatures.user_id == self.current_user.id,
+          db.or_(UserFeatures.read == True, UserFeatures.is_admin == True)
+        )))
+
+      return db.or_(*permissions)
+
+
+    """
+    Check whether the current user has a specific Feature-level permission
+    for a single Feature, using the primary key of the `_users` table rather
+    than loading every Feature the user has access to
+
+    @param (string) storage
+        The storage name of the Feature Collection
+
+    @param (int) feature_id
+        The unique ID of the Feature
+
+    @param (string) permission_type
+        The permission to check for (e.g., read, write, is_admin)
+
+    @return (bool) allowed
+        Whether the user has the requested permission
+    """
+    def feature_permission(self, storage, feature_id, permission_type='read'):
+
+      if not hasattr(self.current_user, 'id'):
+        return False
+
+      UserFeatures = self.get_storage(self.validate_storage(str(storage + '_users')))
+
+      feature = UserFeatures.query.filter_by(user_id=self.current_user.id, feature_id=feature_id).first()
+
+      if feature is None:
+        return False
+
+      return bool(getattr(feature, permission_type, False))
+
+
     def feature_create_check_access(self, Template_):
 
       """
@@ -1341,8 +3057,7 @@ class Feature(CommonsModel):
       If Feature ACL is enabled, then we need to do some more digging
       """
       if Template_.has_acl:
-        allowed_features = self.allowed_features(storage=storage_, permission_type="read")
-        if result['id'] in allowed_features:
+        if self.feature_permission(storage_, result['id'], 'read'):
           return result
 
       """
@@ -1369,8 +3084,7 @@ class Feature(CommonsModel):
       If Feature ACL is enabled, then we need to do some more digging
       """
       if Template_.has_acl:
-        allowed_features = self.allowed_features(storage=storage_, permission_type="write")
-        if feature.id in allowed_features:
+        if self.feature_permission(storage_, feature.id, 'write'):
           return True
 
       return False
@@ -1391,7 +3105,7 @@ class Feature(CommonsModel):
       FeatureUsers_ = FeatureUsers.query.filter_by(feature_id=feature_id).all()
 
       storage_ = self.validate_storage(storage)
-      Template_ = Template.query.filter_by(storage=storage_).first()
+      Template_ = get_template(storage_)
       Feature_ = self.get_storage(Template_, Template_.fields)
 
       feature = Feature_.query.get(feature_id)
@@ -1401,10 +3115,8 @@ class Feature(CommonsModel):
       if the current user is the owner of the originating Feature or is the user is a Feature admin
       then we need to allow them to see the list of users associate with this Feature
       """
-      allowed_features = self.allowed_features(storage=storage_, permission_type='is_admin')
-
       if self.current_user.id is feature.owner or \
-          feature.id in allowed_features or \
+          self.feature_permission(storage_, feature.id, 'is_admin') or \
           Template_.id in self.allowed_templates(permission_type='is_moderator') or \
           Template_.id in self.allowed_templates(permission_type='is_admin'):
         return self.feature_user_list(FeatureUsers_)
@@ -1430,7 +3142,7 @@ class Feature(CommonsModel):
         return status_.status_200('We couldn\'t find the user permissions you were looking for. This user may have been removed from the Feature or the Feature may have been deleted.'), 200
 
       storage_ = self.validate_storage(storage)
-      Template_ = Template.query.filter_by(storage=storage_).first()
+      Template_ = get_template(storage_)
       Feature_ = self.get_storage(Template_, Template_.fields)
 
       feature = Feature_.query.get(feature_id)
@@ -1440,11 +3152,9 @@ class Feature(CommonsModel):
       if the current user is the owner of the originating Feature or is the user is a Feature admin
       then we need to allow them to see the list of users associate with this Feature
       """
-      allowed_features = self.allowed_features(storage=storage_, permission_type='is_admin')
-
       if self.current_user.id is user_id or \
           self.current_user.id is feature.owner or \
-          feature.id in allowed_features or \
+          self.feature_permission(storage_, feature.id, 'is_admin') or \
           Template_.id in self.allowed_templates(permission_type='is_moderator') or \
           Template_.id in self.allowed_templates(permission_type='is_admin'):
         return {
@@ -1470,7 +3180,7 @@ class Feature(CommonsModel):
       FeatureUsers = self.get_storage(user_storage_)
 
       storage_ = self.validate_storage(storage)
-      Template_ = Template.query.filter_by(storage=storage_).first()
+      Template_ = get_template(storage_)
       Feature_ = self.get_storage(Template_, Template_.fields)
 
       feature = Feature_.query.get(feature_id)
@@ -1480,10 +3190,8 @@ class Feature(CommonsModel):
       if the current user is the owner of the originating Feature or is the user is a Feature admin
       then we need to allow them to see the list of users associate with this Feature
       """
-      allowed_features = self.allowed_features(storage=storage_, permission_type='is_admin')
-
       if self.current_user.id is feature.owner or \
-          feature.id in allowed_features or \
+          self.feature_permission(storage_, feature.id, 'is_admin') or \
           Template_.id in self.allowed_templates(permission_type='is_moderator') or \
           Template_.id in self.allowed_templates(permission_type='is_admin'):
         
@@ -1526,7 +3234,7 @@ class Feature(CommonsModel):
       FeatureUsers = self.get_storage(user_storage_)
 
       storage_ = self.validate_storage(storage)
-      Template_ = Template.query.filter_by(storage=storage_).first()
+      Template_ = get_template(storage_)
       Feature_ = self.get_storage(Template_, Template_.fields)
 
       feature = Feature_.query.get(feature_id)
@@ -1537,10 +3245,8 @@ class Feature(CommonsModel):
       if the current user is the owner of the originating Feature or is the user is a Feature admin
       then we need to allow them to see the list of users associate with this Feature
       """
-      allowed_features = self.allowed_features(storage=storage_, permission_type='is_admin')
-
       if self.current_user.id is feature.owner or \
-          feature.id in allowed_features or \
+          self.feature_permission(storage_, feature.id, 'is_admin') or \
           Template_.id in self.allowed_templates(permission_type='is_moderator') or \
           Template_.id in self.allowed_templates(permission_type='is_admin'):
         
@@ -1592,7 +3298,7 @@ class Feature(CommonsModel):
         return status_.status_404('We couldn\'t find the user permissions you were looking for. This user may have been removed from the Feature or the Feature may have been deleted.'), 404
 
       storage_ = self.validate_storage(storage)
-      Template_ = Template.query.filter_by(storage=storage_).first()
+      Template_ = get_template(storage_)
       Feature_ = self.get_storage(Template_, Template_.fields)
 
       feature = Feature_.query.get(feature_id)
@@ -1602,10 +3308,8 @@ class Feature(CommonsModel):
       if the current user is the owner of the originating Feature or is the user is a Feature admin
       then we need to allow them to see the list of users associate with this Feature
       """
-      allowed_features = self.allowed_features(storage=storage_, permission_type='is_admin')
-
       if self.current_user.id is feature.owner or \
-          feature.id in allowed_features or \
+          self.feature_permission(storage_, feature.id, 'is_admin') or \
           Template_.id in self.allowed_templates(permission_type='is_moderator') or \
           Template_.id in self.allowed_templates(permission_type='is_admin'):
         db.session.delete(permissions)
@@ -1634,7 +3338,7 @@ class Feature(CommonsModel):
 
         storage = self.validate_storage(storage_)
 
-        Template_ = Template.query.filter_by(storage=storage).first()
+        Template_ = get_template(storage)
 
         Model_ = self.get_storage(Template_, Template_.fields)
 
@@ -24,6 +24,7 @@ from functools import wraps
 Import Flask Dependencies
 """
 from flask import abort
+from flask import current_app
 
 
 """
@@ -36,8 +37,14 @@ from CommonsCloudAPI.extensions import logger
 from CommonsCloudAPI.extensions import sanitize
 from CommonsCloudAPI.extensions import status as status_
 
+from CommonsCloudAPI.utilities.permissions import get_permissions
+
 from CommonsCloudAPI.models.template import Template
 
+from CommonsCloudAPI.signals import trigger_field_created
+from CommonsCloudAPI.signals import trigger_field_updated
+from CommonsCloudAPI.signals import trigger_field_deleted
+
 
 """
 is_public allows us to check if feature collections are supposed to public, if
@@ -304,6 +311,15 @@ class Field(db.Model, CommonsModel):
               field_.relationship = field_storage['relationship']
               db.session.commit()
 
+        """
+        Trigger: trigger_field_created
+
+        Let the rest of the system know that the shape of this Template has
+        changed (e.g., so that cached models are rebuilt)
+        """
+        trigger_field_created.send(current_app._get_current_object(),
+                                   template=Template_, field=field_)
+
         return field_
 
     """
@@ -395,6 +411,12 @@ class Field(db.Model, CommonsModel):
 
         db.session.commit()
 
+        """
+        Trigger: trigger_field_updated
+        """
+        trigger_field_updated.send(current_app._get_current_object(),
+                                   template=Template.query.get(template_id), field=field_)
+
         return field_
 
 
@@ -645,6 +667,12 @@ class Field(db.Model, CommonsModel):
         if not 'fieldset' in field_.data_type:
           self.delete_storage_field(template_, field_)
 
+        """
+        Trigger: trigger_field_deleted
+        """
+        trigger_field_deleted.send(current_app._get_current_object(),
+                                   template=template_, field=field_)
+
         return True
 
 
@@ -701,12 +729,7 @@ class Field(db.Model, CommonsModel):
     """
     def public_templates(self):
 
-        templates_ = Template.query.filter_by(is_public=True).all()
-
-        public_ = []
-
-        for template in templates_:
-            public_.append(template.id)
+        public_ = list(get_permissions(getattr(self, 'current_user', None)).public_templates())
 
         return public_
 
@@ -733,16 +756,12 @@ class Field(db.Model, CommonsModel):
     """
     def explicitly_allowed_templates(self, permission_type='read'):
 
-        templates_ = []
-
         if not hasattr(self.current_user, 'id'):
           logger.warning('User did\'t submit their information %s', \
               self.current_user)
           return status_.status_401('You need to be logged in to access applications'), 401
 
-        for template in self.current_user.templates:
-          if permission_type and getattr(template, permission_type):
-            templates_.append(template.template_id)
+        templates_ = list(get_permissions(self.current_user).allowed('templates', permission_type))
 
         return templates_
 
@@ -754,15 +773,11 @@ class Field(db.Model, CommonsModel):
     """
     def explicitly_allowed_fields(self, permission_type='read'):
 
-        fields_ = []
-
         if not hasattr(self.current_user, 'id'):
           logger.warning('User did\'t submit their information %s', \
               self.current_user)
           return status_.status_401('You need to be logged in to access applications'), 401
 
-        for field in self.current_user.fields:
-          if permission_type and getattr(field, permission_type):
-            fields_.append(field.field_id)
+        fields_ = list(get_permissions(self.current_user).allowed('fields', permission_type))
 
         return fields_
@@ -37,6 +37,8 @@ from CommonsCloudAPI.extensions import logger
 from CommonsCloudAPI.extensions import sanitize
 from CommonsCloudAPI.extensions import status as status_
 
+from CommonsCloudAPI.utilities.permissions import get_permissions
+
 
 
 """
@@ -237,16 +239,12 @@ class Statistic(db.Model, CommonsModel):
     """
     def explicitly_allowed_templates(self, permission_type='read'):
 
-        templates_ = []
-
         if not hasattr(self.current_user, 'id'):
           logger.warning('User did\'t submit their information %s', \
               self.current_user)
           return status_.status_401('You need to be logged in to access applications'), 401
 
-        for template in self.current_user.templates:
-          if permission_type and getattr(template, permission_type):
-            templates_.append(template.template_id)
+        templates_ = list(get_permissions(self.current_user).allowed('templates', permission_type))
 
         return templates_
 
@@ -258,16 +256,12 @@ class Statistic(db.Model, CommonsModel):
     """
     def explicitly_allowed_fields(self, permission_type='write'):
 
-        fields_ = []
-
         if not hasattr(self.current_user, 'id'):
           logger.warning('User did\'t submit their information %s', \
               self.current_user)
           return status_.status_401('You need to be logged in to access applications'), 401
 
-        for field in self.current_user.fields:
-          if permission_type and getattr(field, permission_type):
-            fields_.append(field.field_id)
+        fields_ = list(get_permissions(self.current_user).allowed('fields', permission_type))
 
         return fields_
 
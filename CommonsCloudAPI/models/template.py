@@ -18,19 +18,43 @@ import json
 from datetime import datetime
 from functools import wraps
 
+
+"""
+Import Flask Dependencies
+"""
+from flask import current_app
+from flask import g
+from flask import has_app_context
+
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session
+
+
 """
 Import Commons Cloud Dependencies
 """
 from CommonsCloudAPI.models.base import CommonsModel
 
 from CommonsCloudAPI.extensions import db
+from CommonsCloudAPI.extensions import generations
 from CommonsCloudAPI.extensions import logger
+from CommonsCloudAPI.extensions import responses
 from CommonsCloudAPI.extensions import sanitize
 from CommonsCloudAPI.extensions import status as status_
+from CommonsCloudAPI.extensions import templates as template_cache
+
+from CommonsCloudAPI.utilities.permissions import get_permissions
+from CommonsCloudAPI.utilities.indexes import enqueue_indexes
 
 from CommonsCloudAPI.models.application import Application
 from CommonsCloudAPI.models.activity import Activity
 
+from CommonsCloudAPI.signals import trigger_template_updated
+from CommonsCloudAPI.signals import trigger_template_deleted
+from CommonsCloudAPI.signals import trigger_field_created
+from CommonsCloudAPI.signals import trigger_field_updated
+from CommonsCloudAPI.signals import trigger_field_deleted
+
 
 """
 is_public allows us to check if feature collections are supposed to public, if
@@ -398,6 +422,11 @@ class Template(db.Model, CommonsModel):
     """
     self.create_storage_permissions(storage_name)
 
+    """
+    Now that every table the Template needs exists, queue their indexes
+    """
+    enqueue_indexes(template_)
+
     return template_
 
 
@@ -507,6 +536,8 @@ class Template(db.Model, CommonsModel):
 
     db.session.commit()
 
+    trigger_template_updated.send(current_app._get_current_object(), template=template_)
+
     return template_
 
 
@@ -542,9 +573,13 @@ class Template(db.Model, CommonsModel):
       return status_.status_401('That isn\'t your template'), 401
 
     template_ = Template.query.get(template_id)
+    storage = template_.storage
+
     db.session.delete(template_)
     db.session.commit()
 
+    trigger_template_deleted.send(current_app._get_current_object(), storage=storage)
+
     return True
 
 
@@ -751,12 +786,7 @@ class Template(db.Model, CommonsModel):
   """
   def public_templates(self):
 
-    templates_ = Template.query.filter_by(is_public=True).all()
-
-    public_ = []
-
-    for template in templates_:
-      public_.append(template.id)
+    public_ = list(get_permissions(getattr(self, 'current_user', None)).public_templates())
 
     return public_
 
@@ -768,16 +798,138 @@ class Template(db.Model, CommonsModel):
   """
   def explicitly_allowed_templates(self, permission_type='read'):
 
-    templates_ = []
-
     if not hasattr(self.current_user, 'id'):
       logger.warning('User did\'t submit their information %s', \
           self.current_user)
       return status_.status_401('You need to be logged in to access applications'), 401
 
-    for template in self.current_user.templates:
-      if permission_type and getattr(template, permission_type):
-        templates_.append(template.template_id)
+    templates_ = list(get_permissions(self.current_user).allowed('templates', permission_type))
 
     return templates_
 
+
+"""
+Retrieve a Template, along with its Fields, based on its storage name
+
+Templates are looked up by storage on nearly every Feature request and we
+don't want to load the same Template and its Fields over and over again.
+
+1. Within a request the same Template object is handed back every time
+2. Across requests a detached copy of the Template and its Fields is kept
+   in the `templates` cache and merged into the request's session without
+   going back to the database
+
+Each worker process has its own cache, so the copy is kept with the
+Template's generation in Redis. Changing a Template or its Fields in any
+worker moves it on to the next generation, and every other worker loads it
+again on its next request instead of using an out of date `is_public` or
+list of Fields. If Redis can't be reached the Template is always loaded.
+
+@param (string) storage
+    The storage name of the Template (e.g., type_XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX)
+
+@return (object) template
+    A Template object attached to the current session or None if no
+    Template exists for the storage
+"""
+def get_template(storage):
+
+  storage = str(storage)
+
+  if not has_app_context():
+    return Template.query.filter_by(storage=storage).first()
+
+  if not hasattr(g, 'templates'):
+    g.templates = {}
+
+  if storage in g.templates:
+    return g.templates[storage]
+
+  generation = generations.get('templates:*', 'templates:' + storage)
+
+  cached_template = None
+
+  if generation is not None:
+    cached_template = template_cache.get(storage, generation)
+
+  if cached_template is None:
+    cached_template = load_template(storage, generation)
+
+  if cached_template is None:
+    template = None
+  else:
+    template = db.session.merge(cached_template, load=False)
+
+  g.templates[storage] = template
+
+  return template
+
+
+"""
+Load a Template and its Fields in a session of its own so that the objects
+we keep in the cache are never bound to, or expired by, a request's session
+
+@param (string) storage
+    The storage name of the Template
+
+@param (tuple) generation
+    The generation of the Template, read before it is loaded, or None if
+    it shouldn't be kept in the cache
+
+@return (object) template
+    A detached Template object or None if no Template exists for the storage
+"""
+def load_template(storage, generation=None):
+
+  session = Session(bind=db.engine)
+
+  try:
+    template = session.query(Template).options(joinedload(Template.fields)).filter_by(storage=storage).first()
+  finally:
+    session.close()
+
+  if template is None or generation is None:
+    return template
+
+  return template_cache.set(storage, template, generation)
+
+
+"""
+Remove a Template from the cache of every worker and from the current request,
+this should only be called once the change has been committed
+
+@param (string) storage
+    The storage name of the Template, when no storage is given every
+    Template is removed
+"""
+def forget_template(storage=None):
+
+  if storage is None:
+    template_cache.clear()
+    generations.increment('templates:*')
+  else:
+    template_cache.delete(str(storage))
+    generations.increment('templates:' + str(storage))
+
+  if has_app_context() and hasattr(g, 'templates'):
+    if storage is None:
+      g.templates = {}
+    else:
+      g.templates.pop(str(storage), None)
+
+
+"""
+Keep the Template cache and any cached responses in step with changes to
+Templates and their Fields
+"""
+def _trigger_template_changed(app, **data):
+  logger.debug('SIGNAL: _trigger_template_changed')
+  storage = data.get('storage', getattr(data.get('template', None), 'storage', None))
+  forget_template(storage)
+  responses.invalidate(storage)
+
+trigger_template_updated.connect(_trigger_template_changed)
+trigger_template_deleted.connect(_trigger_template_changed)
+trigger_field_created.connect(_trigger_template_changed)
+trigger_field_updated.connect(_trigger_template_changed)
+trigger_field_deleted.connect(_trigger_template_changed)
@@ -23,6 +23,7 @@ Import Application Dependencies
 """
 from CommonsCloudAPI.extensions import oauth
 from CommonsCloudAPI.extensions import logger
+from CommonsCloudAPI.extensions import responses
 from CommonsCloudAPI.extensions import status as status_
 
 from CommonsCloudAPI.models.feature import Feature
@@ -60,6 +61,14 @@ def features_intersects_preflight(storage, extension):
 def features_region_preflight(storage, extension):
     return status_.status_200(), 200
 
+@module.route('/v2/type_<string:storage>/nearest.<string:extension>', methods=['OPTIONS'])
+def features_nearest_preflight(storage, extension):
+    return status_.status_200(), 200
+
+@module.route('/v2/type_<string:storage>/tiles/<int:z>/<int:x>/<int:y>.<string:extension>', methods=['OPTIONS'])
+def features_tile_preflight(storage, z, x, y, extension):
+    return status_.status_200(), 200
+
 @module.route('/v2/type_<string:storage>/<int:feature_id>/attachment_<string:attachment_storage>/<int:attachment_id>.<string:extension>', methods=['OPTIONS'])
 def attachment_delete_preflight(storage, feature_id, attachment_storage, attachment_id, extension):
     return status_.status_200(), 200
@@ -104,20 +113,30 @@ def feature_list(oauth_request, storage, extension, is_public):
 
     Feature_ = Feature()
     Feature_.current_user = oauth_request.user
+
+    """
+    Public Feature Collections are served from the response cache whenever
+    nothing has changed since the response was built
+    """
+    cache = Feature_.feature_response_cache_key(storage, extension)
+    if cache:
+        cached_response = responses.get(**cache)
+        if cached_response is not None:
+            return Feature_.serve_cached_response(cached_response)
+
     feature_list = Feature_.feature_list(storage, results_per_page, show_statistics, show_relationship)
 
     if type(feature_list) is tuple:
         return feature_list
 
     feature_results = feature_list.get('results')
-    features_last_modified = Feature_.features_last_modified(feature_list.get('model'))
 
     """
     Get Statistics for this Feature set if they are requested by setting statistics to True
     """
     feature_statistics = None
     if show_statistics:
-        feature_statistics = Feature_.feature_statistic(feature_list.get('model'),feature_list.get('template'))
+        feature_statistics = Feature_.feature_statistic(feature_list.get('model'), feature_list.get('template'), feature_results.get('query'))
 
     arguments = {
         'the_content': feature_results.get('objects'),
@@ -128,10 +147,19 @@ def feature_list(oauth_request, storage, extension, is_public):
         'total_features': feature_results.get('num_results'),
         'features_per_page': results_per_page,
         'statistics': feature_statistics,
-        'last_modified': features_last_modified
+        'last_modified': feature_list.get('last_modified'),
+        'etag': feature_list.get('etag')
     }
 
-    return Feature_.endpoint_response(**arguments)
+    if 'next' in feature_results:
+        arguments['next'] = feature_results.get('next')
+
+    response, code = Feature_.endpoint_response(**arguments)
+
+    if cache and code == 200:
+        response = responses.set(response=response, **cache)
+
+    return response, code
 
 
 @module.route('/v2/type_<string:storage>/func.<string:extension>', methods=['GET'])
@@ -163,6 +191,13 @@ def feature_get(oauth_request, storage, feature_id, extension, is_public):
 
     Feature_ = Feature()
     Feature_.current_user = oauth_request.user
+
+    cache = Feature_.feature_response_cache_key(storage, extension)
+    if cache:
+        cached_response = responses.get(**cache)
+        if cached_response is not None:
+            return Feature_.serve_cached_response(cached_response)
+
     feature = Feature_.feature_get(storage, feature_id)
 
     if type(feature) is tuple:
@@ -174,7 +209,14 @@ def feature_get(oauth_request, storage, feature_id, extension, is_public):
         'code': 200
     }
 
-    return Feature_.endpoint_response(**arguments)
+    arguments.update(getattr(Feature_, 'validator', {}))
+
+    response, code = Feature_.endpoint_response(**arguments)
+
+    if cache and code == 200:
+        response = responses.set(response=response, **cache)
+
+    return response, code
 
 
 @module.route('/v2/type_<string:storage>/<int:feature_id>/attachment_<string:relationship>.<string:extension>', methods=['GET'])
@@ -306,7 +348,12 @@ def feature_intersects(oauth_request, storage, extension, is_public):
 
     Feature_ = Feature()
     Feature_.current_user = oauth_request.user
-    feature_list = Feature_.feature_get_intersection(storage, geometry)
+
+    geometry_options = Feature_.feature_geometry_options()
+    if type(geometry_options) is tuple:
+        return geometry_options
+
+    feature_list = Feature_.feature_get_intersection(storage, geometry, geometry_options)
 
     if type(feature_list) is tuple:
         return feature_list
@@ -329,7 +376,22 @@ def feature_region(oauth_request, storage, extension, is_public):
 
     Feature_ = Feature()
     Feature_.current_user = oauth_request.user
-    feature_list = Feature_.feature_get_content_for_region(storage, geometry)
+
+    geometry_options = Feature_.feature_geometry_options()
+    if type(geometry_options) is tuple:
+        return geometry_options
+
+    predicate = request.args.get('predicate', 'intersects')
+    distance = request.args.get('distance', None, type=float)
+
+    """
+    Count the Features in cells instead of listing them, when requested
+    """
+    if request.args.get('aggregate'):
+        show_statistics = 'true' == request.args.get('statistics')
+        feature_list = Feature_.feature_get_region_aggregate(storage, geometry, request.args.get('aggregate'), predicate, distance, show_statistics)
+    else:
+        feature_list = Feature_.feature_get_content_for_region(storage, geometry, geometry_options, predicate, distance)
 
     if type(feature_list) is tuple:
         return feature_list
@@ -343,6 +405,79 @@ def feature_region(oauth_request, storage, extension, is_public):
     return Feature_.endpoint_response(**arguments)
 
 
+@module.route('/v2/type_<string:storage>/nearest.<string:extension>', methods=['GET'])
+@is_public()
+@oauth.oauth_or_public()
+def feature_nearest(oauth_request, storage, extension, is_public):
+
+    Feature_ = Feature()
+    Feature_.current_user = oauth_request.user
+
+    cache = Feature_.feature_response_cache_key(storage, extension)
+    if cache:
+        cached_response = responses.get(**cache)
+        if cached_response is not None:
+            return Feature_.serve_cached_response(cached_response)
+
+    nearest = Feature_.feature_nearest(storage)
+
+    if type(nearest) is tuple:
+        return nearest
+
+    arguments = {
+        'the_content': nearest.get('content'),
+        'list_name': 'features',
+        'extension': extension,
+        'last_modified': nearest.get('last_modified'),
+        'etag': nearest.get('etag')
+    }
+
+    response, code = Feature_.endpoint_response(**arguments)
+
+    if cache and code == 200:
+        response = responses.set(response=response, **cache)
+
+    return response, code
+
+
+@module.route('/v2/type_<string:storage>/tiles/<int:z>/<int:x>/<int:y>.<string:extension>', methods=['GET'])
+@is_public()
+@oauth.oauth_or_public()
+def feature_tile(oauth_request, storage, z, x, y, extension, is_public):
+
+    if extension not in ('mvt', 'geojson'):
+        return status_.status_415('Tiles are available as Mapbox Vector Tiles (.mvt) or GeoJSON (.geojson)'), 415
+
+    Feature_ = Feature()
+    Feature_.current_user = oauth_request.user
+
+    cache = Feature_.feature_response_cache_key(storage, extension)
+    if cache:
+        cached_response = responses.get(**cache)
+        if cached_response is not None:
+            return Feature_.serve_cached_response(cached_response)
+
+    tile = Feature_.feature_tile(storage, z, x, y, extension)
+
+    if type(tile) is tuple:
+        return tile
+
+    arguments = {
+        'the_content': tile.get('content'),
+        'list_name': 'features',
+        'extension': extension,
+        'last_modified': tile.get('last_modified'),
+        'etag': tile.get('etag')
+    }
+
+    response, code = Feature_.endpoint_response(**arguments)
+
+    if cache and code == 200:
+        response = responses.set(response=response, **cache)
+
+    return response, code
+
+
 @module.route('/v2/type_<string:storage>/excel-template', methods=['GET'])
 @is_public()
 @oauth.oauth_or_public()
@@ -0,0 +1,55 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import Flask Dependencies
+"""
+from flask import jsonify
+
+
+"""
+Import Application Module Dependencies
+"""
+from CommonsCloudAPI.extensions import permissions
+from CommonsCloudAPI.extensions import registry
+from CommonsCloudAPI.extensions import responses
+from CommonsCloudAPI.extensions import templates
+from CommonsCloudAPI.extensions import status as status_
+
+from . import module
+
+
+@module.route('/v2/system/cache.<string:extension>', methods=['OPTIONS'])
+def system_cache_preflight(extension):
+  return status_.status_200(), 200
+
+
+"""
+Counters for the in-process caches, these are per worker process so that
+we can keep an eye on how each of them is behaving under load. The response
+cache lives in Redis, so its counters cover every worker.
+"""
+@module.route('/v2/system/cache.<string:extension>', methods=['GET'])
+def system_cache(extension):
+
+  if extension != 'json':
+    return status_.status_415(), 415
+
+  return jsonify({
+    "response": {
+      "models": registry.stats(),
+      "templates": templates.stats(),
+      "permissions": permissions.stats(),
+      "responses": responses.stats()
+    }
+  })
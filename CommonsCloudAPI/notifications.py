@@ -12,13 +12,22 @@ limitations under the License.
 
 import json
 
-from flask import abort
+from datetime import datetime
+from datetime import timedelta
+
 from flask import current_app
 from flask import render_template
 
+from flask.ext.rq import get_queue
+from flask.ext.rq import job
+
+from redis.exceptions import RedisError
+
 from CommonsCloudAPI.extensions import db
 from CommonsCloudAPI.extensions import logger
 
+from CommonsCloudAPI.importer import importer_context
+
 from flask.ext.mail import Message
 
 
@@ -136,34 +145,234 @@ class Action(db.Model):
   notification_id = db.Column(db.Integer, db.ForeignKey('notification.id'))
 
 
-def execute_notification(signal_type, app, **data):
+"""
+A Notification that couldn't be delivered after every retry, or couldn't be
+queued at all, kept with the payload it was sent so it can be looked into
+and sent again
+"""
+class NotificationFailure(db.Model):
+
+  __tablename__ = 'notification_failure'
+  __table_args__ = {
+    'extend_existing': True
+  }
+
+  id = db.Column(db.Integer, primary_key=True)
+  notification_id = db.Column(db.Integer, db.ForeignKey('notification.id', ondelete='SET NULL'), nullable=True)
+  signal = db.Column(db.String(255))
+  payload = db.Column(db.Text)
+  attempts = db.Column(db.Integer, nullable=False, default=0)
+  error = db.Column(db.Text)
+  created = db.Column(db.DateTime)
+
+
+"""
+A Notification that failed and is waiting for its next attempt, RQ doesn't
+have delayed jobs so retries wait here until they are due and are then
+queued by enqueue_due_notification_retries
+"""
+class NotificationRetry(db.Model):
+
+  __tablename__ = 'notification_retry'
+  __table_args__ = {
+    'extend_existing': True
+  }
+
+  id = db.Column(db.Integer, primary_key=True)
+  notification_id = db.Column(db.Integer, db.ForeignKey('notification.id', ondelete='CASCADE'), nullable=False)
+  signal = db.Column(db.String(255))
+  payload = db.Column(db.Text)
+  attempt = db.Column(db.Integer, nullable=False)
+  delivered = db.Column(db.Text)
+  error = db.Column(db.Text)
+  next_attempt = db.Column(db.DateTime, nullable=False, index=True)
+  created = db.Column(db.DateTime)
+
+
+"""
+Queue the Notifications for a signal, so that checking their Conditions,
+looking up their recipients, and sending their email happen on an RQ worker
+instead of while the user waits for their response
+
+@param (string) signal_type
+    The name of the signal (e.g., feature-created)
+
+@param (string) storage
+    The storage name of the Feature Collection
+
+@param (dict) feature_json
+    The Feature as it was serialized when the signal was sent, this snapshot
+    is all the job needs to know about the Feature
+
+"""
+def enqueue_notification(signal_type, storage, feature_json):
+
+  payload = json.dumps({
+    'storage': storage,
+    'feature': feature_json
+  })
+
+  try:
+    get_queue().enqueue_call(func=dispatch_notifications, args=(signal_type, payload))
+  except RedisError as error:
+    logger.error('Unable to queue the Notifications for %s in %s: %s', signal_type, storage, error)
+    record_notification_failure(None, signal_type, payload, 0, 'Unable to queue the Notifications: %s' % (error))
+
+
+"""
+Deliver every Notification for a signal, each Notification is delivered
+(and retried) on its own so that one failing doesn't hold up the others
+
+Any retries that have come due are queued as well, so retries keep moving
+whenever Notifications are being sent, even between sweeps (see
+manage_notifications.py)
+
+@param (string) signal_type
+    The name of the signal (e.g., feature-created)
 
-  # 1. Get a list of Notifications that match the `signal_type`
-  # logger.debug('data %s', dir(data))
-  notifications = Notification.query.all()
+@param (string) payload
+    The JSON payload created by enqueue_notification
 
-  # 2. Loop over Notifications 
-  for notification in notifications:
-    # logger.debug('Notification %s %s', notification.id, notification.label)
+"""
+@job
+def dispatch_notifications(signal_type, payload):
+
+  with importer_context():
 
-    # 3. Get all conditions that match this Notification
-    # logger.debug('Conditions %s', notification.conditions)
+    for notification in Notification.query.all():
+      deliver_notification(notification.id, signal_type, payload, 1, [])
 
-    # 4. Loop over conditions and execute each
-    should_execute_actions = execute_conditions(notification.conditions, **data)
-    # logger.debug('Should we execute the actions? %s', 
-    #     str(should_execute_actions))
+    enqueue_due_notification_retries()
 
-    # 5. If ALL return true, then get all Actions matching this Notification
-    if should_execute_actions:
 
-      # logger.debug('Actions %s', notification.actions)
+"""
+Retry a Notification that failed, queued by enqueue_due_notification_retries
+once its backoff has passed
+
+@param (int) notification_id
+    The unique ID of the Notification
 
-      # 6. Loop over Actions and execute each
-      execute_actions(notification.actions, **data)
+@param (string) signal_type
+    The name of the signal (e.g., feature-created)
 
-  # 7. Else just exit
-  return {}
+@param (string) payload
+    The JSON payload created by enqueue_notification
+
+@param (int) attempt
+    The number of this attempt, counting the first
+
+@param (list) delivered
+    The emails that were already delivered (see delivery_key), these are
+    never sent again
+
+"""
+@job
+def retry_notification(notification_id, signal_type, payload, attempt, delivered):
+
+  with importer_context():
+    deliver_notification(notification_id, signal_type, payload, attempt, delivered)
+
+
+"""
+Queue every retry whose backoff has passed
+
+The retries are locked while they are queued, so two sweeps running at the
+same time never queue the same retry twice. If they can't be queued they are
+left where they are for the next sweep.
+
+@return (int) queued
+    The number of retries that were queued
+"""
+def enqueue_due_notification_retries():
+
+  retries = NotificationRetry.query.filter(NotificationRetry.next_attempt <= datetime.now()) \
+      .order_by(NotificationRetry.next_attempt).with_for_update().all()
+
+  queued = 0
+
+  try:
+    for retry in retries:
+      get_queue().enqueue_call(func=retry_notification, args=(retry.notification_id, retry.signal, retry.payload, \
+          retry.attempt, json.loads(retry.delivered or '[]')))
+      db.session.delete(retry)
+      queued += 1
+  except RedisError as error:
+    logger.error('Unable to queue the retries of Notifications: %s', error)
+
+  db.session.commit()
+
+  return queued
+
+
+"""
+Check the Conditions of a single Notification and execute its Actions,
+scheduling a retry if anything goes wrong
+
+Every email that is sent is added to `delivered` as soon as it has been
+sent, so a retry only sends the emails that weren't delivered before
+"""
+def deliver_notification(notification_id, signal_type, payload, attempt, delivered):
+
+  notification = Notification.query.get(notification_id)
+
+  if notification is None:
+    return
+
+  content = json.loads(payload)
+
+  data = {
+    'storage': content.get('storage', None),
+    'feature': content.get('feature', None),
+    'feature_json': content.get('feature', None)
+  }
+
+  delivered = list(delivered or [])
+
+  try:
+    if execute_conditions(notification.conditions, **data):
+      execute_actions(notification.actions, delivered, **data)
+  except Exception as error:
+    db.session.rollback()
+    schedule_notification_retry(notification_id, signal_type, payload, attempt, error, delivered)
+
+
+"""
+Save the next attempt at a Notification with an exponential backoff
+(NOTIFICATION_RETRY_DELAY seconds, then twice that, and so on), or record it
+as a failure once NOTIFICATION_MAX_ATTEMPTS have been made
+"""
+def schedule_notification_retry(notification_id, signal_type, payload, attempt, error, delivered):
+
+  max_attempts = current_app.config.get('NOTIFICATION_MAX_ATTEMPTS', 5)
+
+  if delivered:
+    error = '%s (already delivered: %s)' % (error, ', '.join(delivered))
+
+  if attempt >= max_attempts:
+    logger.error('Notification %d failed after %d attempts: %s', notification_id, attempt, error)
+    record_notification_failure(notification_id, signal_type, payload, attempt, error)
+    return
+
+  delay = current_app.config.get('NOTIFICATION_RETRY_DELAY', 30) * 2 ** (attempt - 1)
+
+  logger.warning('Notification %d failed on attempt %d, retrying in %d seconds: %s', notification_id, attempt, delay, error)
+
+  now = datetime.now()
+
+  retry = NotificationRetry(notification_id=notification_id, signal=signal_type, payload=payload, attempt=attempt + 1, \
+      delivered=json.dumps(delivered), error=unicode(error), next_attempt=now + timedelta(seconds=delay), created=now)
+
+  db.session.add(retry)
+  db.session.commit()
+
+
+def record_notification_failure(notification_id, signal_type, payload, attempts, error):
+
+  failure = NotificationFailure(notification_id=notification_id, signal=signal_type, payload=payload, \
+      attempts=attempts, error=unicode(error), created=datetime.now())
+
+  db.session.add(failure)
+  db.session.commit()
 
 
 def execute_conditions(conditions, **data):
@@ -197,7 +406,7 @@ def condition_storage_type(required_value, **data):
   return False
 
 
-def execute_actions(actions, **data):
+def execute_actions(actions, delivered, **data):
 
   for action in actions:
     # logger.debug('Action <%s> %s', action.action, action.label)
@@ -209,6 +418,10 @@ def execute_actions(actions, **data):
       send_email = defaults.get('send_email', None)
       recipients = send_email.get('recipients', None)
 
+      copy_sender = None
+      copy_template = None
+      copy_subject = None
+
       if 'dynamic' in recipients.get('type', None) and \
             recipients.get('from_storage', None):
           feature = data.get('feature', None)
@@ -223,7 +436,7 @@ def execute_actions(actions, **data):
           copy = recipients.get('copy', False)
           if copy:
             this_field = copy.get('field', None)
-            user_email = getattr(feature, this_field, 'error@commonscloud.org')
+            user_email = feature.get(this_field, 'error@commonscloud.org')
             copy_sender = [user_email]
             copy_template = copy.get('template', None)
             copy_subject = copy.get('subject', None)
@@ -246,7 +459,9 @@ def execute_actions(actions, **data):
           "email_address": copy_sender,
           "template": copy_template,
           "subject": copy_subject
-        }
+        },
+        "action_id": action.id,
+        "delivered": delivered
       }
 
       send_notification_email(**options)
@@ -256,19 +471,21 @@ def fetch_dynamic_recipients(feature, **options):
 
   from CommonsCloudAPI.models.feature import Feature
 
-  if 'geometry_intersects' in options.get('conditions', None):
+  features = []
 
-    # logger.debug('Geometry %s', feature.geometry)
+  if 'geometry_intersects' in options.get('conditions', None):
 
-    if feature.geometry is None:
-      return abort(400)
+    # logger.debug('Geometry %s', feature.get('geometry'))
 
-    Feature_ = Feature()
-    intersection_options = {
-      "storage_": options.get('from_storage', None),
-      "geometry": feature.geometry
-    }
-    features = Feature_.feature_get_intersection(**intersection_options)
+    if feature.get('geometry', None) is None:
+      logger.warning('Feature %s has no geometry to find the recipients of a Notification with', feature.get('id', None))
+    else:
+      Feature_ = Feature()
+      intersection_options = {
+        "storage_": options.get('from_storage', None),
+        "geometry": feature.get('geometry')
+      }
+      features = Feature_.feature_get_intersection(**intersection_options)
 
     # logger.debug('features from get intersects %s', features)
 
@@ -300,6 +517,19 @@ def fetch_dynamic_recipients(feature, **options):
   }
 
 
+"""
+The name an email is recorded under once it has been delivered, so that a
+retry of the same Notification doesn't send it to the same recipient again
+
+action_id (int) The unique ID of the Action sending the email
+message (str) Which of the Action's emails it is (e.g., email, copy)
+email_address (str) The recipient
+
+"""
+def delivery_key(action_id, message, email_address):
+  return '%s:%s:%s' % (action_id, message, email_address)
+
+
 """
 Send an email notification
 
@@ -307,10 +537,14 @@ subject (str)
 recipients_emailaddresses (list)
 sender (str) "FirstName LastName <email@address.com>"
 template (str) Defines the html/txt template's to be used
+action_id (int) The Action sending the email
+delivered (list) The emails already delivered (see delivery_key), recipients
+    that already have an email aren't sent it again and the recipients of
+    each email are added as soon as it has been sent
 context (kwargs) Dictionary of data or anything else you need passed along
 
 """
-def send_notification_email(subject, recipients_emailaddresses, sender, template, copy, **context):
+def send_notification_email(subject, recipients_emailaddresses, sender, template, copy, action_id=None, delivered=None, **context):
     """Send an email via the Flask-Mail extension.
 
     :param subject: Email subject
@@ -318,20 +552,34 @@ def send_notification_email(subject, recipients_emailaddresses, sender, template
     :param template: The name of the email template
     :param context: The context to render the template with
     """
-    msg = Message(subject, sender=sender, recipients=recipients_emailaddresses)
+    if delivered is None:
+      delivered = []
+
+    recipients_emailaddresses = [email_address for email_address in recipients_emailaddresses \
+        if delivery_key(action_id, 'email', email_address) not in delivered]
+
+    if recipients_emailaddresses:
+      msg = Message(subject, sender=sender, recipients=recipients_emailaddresses)
 
-    ctx = ('notifications', template)
-    msg.body = render_template('%s/%s.txt' % ctx, **context)
-    msg.html = render_template('%s/%s.html' % ctx, **context)
+      ctx = ('notifications', template)
+      msg.body = render_template('%s/%s.txt' % ctx, **context)
+      msg.html = render_template('%s/%s.html' % ctx, **context)
 
-    mail = current_app.extensions.get('mail')
-    mail.send(msg)
+      mail = current_app.extensions.get('mail')
+      mail.send(msg)
 
-    if copy.get('email_address', None):
-      copy_msg = Message(copy.get('subject', None), sender=sender, recipients=copy.get('email_address', None))
+      delivered.extend(delivery_key(action_id, 'email', email_address) for email_address in recipients_emailaddresses)
+
+    copy_emailaddresses = [email_address for email_address in copy.get('email_address', None) or [] \
+        if delivery_key(action_id, 'copy', email_address) not in delivered]
+
+    if copy_emailaddresses:
+      copy_msg = Message(copy.get('subject', None), sender=sender, recipients=copy_emailaddresses)
       copy_ctx = ('notifications', copy.get('template', None))
       copy_msg.body = render_template('%s/%s.txt' % copy_ctx, **context)
       copy_msg.html = render_template('%s/%s.html' % copy_ctx, **context)
 
       copy_mail = current_app.extensions.get('mail')
       copy_mail.send(copy_msg)
+
+      delivered.extend(delivery_key(action_id, 'copy', email_address) for email_address in copy_emailaddresses)
@@ -13,8 +13,11 @@ limitations under the License.
 from contextlib import contextmanager
 
 from CommonsCloudAPI.extensions import logger
+from CommonsCloudAPI.extensions import registry
+from CommonsCloudAPI.extensions import responses
 from CommonsCloudAPI.extensions import signals
-from CommonsCloudAPI.notifications import execute_notification
+from CommonsCloudAPI.notifications import enqueue_notification
+from CommonsCloudAPI.utilities.indexes import enqueue_indexes
 
 """
 Users
@@ -39,6 +42,12 @@ trigger_template_created = signals.signal("template-created")
 trigger_template_updated = signals.signal("template-updated")
 trigger_template_deleted = signals.signal("template-deleted")
 
+def _trigger_template_deleted(app, **data):
+    logger.debug('SIGNAL: _trigger_template_deleted')
+    registry.invalidate(data.get('storage', None))
+
+trigger_template_deleted.connect(_trigger_template_deleted)
+
 
 """
 Fields
@@ -47,6 +56,24 @@ trigger_field_created = signals.signal("field-created")
 trigger_field_updated = signals.signal("field-updated")
 trigger_field_deleted = signals.signal("field-deleted")
 
+def _trigger_field_changed(app, **data):
+    logger.debug('SIGNAL: _trigger_field_changed')
+    template = data.get('template', None)
+    registry.invalidate(getattr(template, 'storage', None))
+
+def _trigger_field_indexed(app, **data):
+    logger.debug('SIGNAL: _trigger_field_indexed')
+    template = data.get('template', None)
+    if template is not None:
+        enqueue_indexes(template)
+
+trigger_field_created.connect(_trigger_field_changed)
+trigger_field_updated.connect(_trigger_field_changed)
+trigger_field_deleted.connect(_trigger_field_changed)
+
+trigger_field_created.connect(_trigger_field_indexed)
+trigger_field_updated.connect(_trigger_field_indexed)
+
 
 """
 Features
@@ -57,15 +84,16 @@ trigger_feature_deleted = signals.signal("feature-deleted")
 
 def _trigger_feature_created(app, **data):
     logger.warning('SIGNAL: _trigger_feature_created')
-    execute_notification('feature-created', app, **data)
+    responses.invalidate(data.get('storage', None))
+    enqueue_notification('feature-created', data.get('storage', None), data.get('feature_json', None))
 
 def _trigger_feature_updated(app, **data):
     logger.warning('SIGNAL: _trigger_feature_updated')
-    # feature_created.append(data)
+    responses.invalidate(data.get('storage', None))
 
 def _trigger_feature_deleted(app, **data):
     logger.warning('SIGNAL: _trigger_feature_deleted')
-    # feature_created.append(data)
+    responses.invalidate(data.get('storage', None))
 
 trigger_feature_created.connect(_trigger_feature_created)
 trigger_feature_updated.connect(_trigger_feature_updated)
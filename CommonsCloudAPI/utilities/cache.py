@@ -0,0 +1,219 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import threading
+import time
+
+from collections import OrderedDict
+
+
+"""
+A small, bounded, in-process cache that is shared across requests
+
+Entries expire after `ttl` seconds and once the cache holds `size` entries
+the least recently used entry is dropped to make room for the next one.
+Each worker process has its own copy. Values that other workers can change
+are saved with their generation (see CommonsGenerations) and are only handed
+back while the generation being asked for still matches.
+
+@method configure
+@method get
+@method set
+@method delete
+@method clear
+@method stats
+
+"""
+class CommonsCache():
+
+  """
+  Define our default variables
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (int) size
+      The maximum number of entries to keep
+
+  @param (int) ttl
+      The number of seconds an entry should be kept
+
+  """
+  def __init__(self, size=256, ttl=300):
+
+    self.entries = OrderedDict()
+    self.lock = threading.Lock()
+
+    self.size = size
+    self.ttl = ttl
+
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+
+  """
+  Change the size and ttl of the cache, usually from the application
+  configuration once it is available
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (int) size
+      The maximum number of entries to keep
+
+  @param (int) ttl
+      The number of seconds an entry should be kept
+
+  """
+  def configure(self, size=None, ttl=None):
+
+    with self.lock:
+
+      if size is not None:
+        self.size = size
+
+      if ttl is not None:
+        self.ttl = ttl
+
+      while len(self.entries) > self.size:
+        self.entries.popitem(last=False)
+        self.evictions += 1
+
+
+  """
+  Retrieve a value from the cache
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) key
+      The key the value was saved under
+
+  @param (object) generation
+      The current generation of the value, if it has one
+
+  @return (object) value
+      The cached value or None if it is missing, has expired, or belongs to
+      another generation
+
+  """
+  def get(self, key, generation=None):
+
+    with self.lock:
+
+      entry = self.entries.pop(key, None)
+
+      if entry is None:
+        self.misses += 1
+        return None
+
+      if entry[0] < time.time() or entry[2] != generation:
+        self.misses += 1
+        self.evictions += 1
+        return None
+
+      """
+      Put the entry back at the end so it is the most recently used
+      """
+      self.entries[key] = entry
+      self.hits += 1
+
+      return entry[1]
+
+
+  """
+  Save a value to the cache
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) key
+      The key to save the value under
+
+  @param (object) value
+      The value to save
+
+  @param (object) generation
+      The generation the value was loaded at, read before it was loaded
+
+  @return (object) value
+      The same value, so this can be used inline
+
+  """
+  def set(self, key, value, generation=None):
+
+    with self.lock:
+
+      self.entries.pop(key, None)
+      self.entries[key] = (time.time() + self.ttl, value, generation)
+
+      while len(self.entries) > self.size:
+        self.entries.popitem(last=False)
+        self.evictions += 1
+
+    return value
+
+
+  """
+  Remove a single value from the cache
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) key
+      The key the value was saved under
+
+  """
+  def delete(self, key):
+
+    with self.lock:
+      self.entries.pop(key, None)
+
+
+  """
+  Remove every value from the cache
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  """
+  def clear(self):
+
+    with self.lock:
+      self.entries = OrderedDict()
+
+
+  """
+  Counters that allow us to keep an eye on the cache under load
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (dict) stats
+      The number of entries, hits, misses, and evictions
+
+  """
+  def stats(self):
+
+    return {
+      'entries': len(self.entries),
+      'size': self.size,
+      'ttl': self.ttl,
+      'hits': self.hits,
+      'misses': self.misses,
+      'evictions': self.evictions
+    }
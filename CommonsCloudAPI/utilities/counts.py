@@ -0,0 +1,353 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import logging
+
+
+"""
+Import Flask Dependencies
+"""
+from flask.ext.rq import get_connection
+
+from redis.exceptions import RedisError
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+
+"""
+This module is loaded by CommonsCloudAPI.extensions, so it can't use the
+logger that is defined there
+"""
+logger = logging.getLogger(__name__)
+
+
+"""
+Adjust the counts only if they are already cached, and always move the
+counts on to their next version so an older refresh can't replace them
+"""
+INCREMENT_SCRIPT = """
+redis.call('INCR', KEYS[2])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  for index = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[index], ARGV[index + 1])
+  end
+end
+return 1
+"""
+
+"""
+Replace the counts only if nothing has changed them since they were counted
+"""
+SET_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+  return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('HMSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+"""
+The number of Features in each Feature Collection, by Feature status
+
+The counts are kept in Redis (the same server our RQ workers use) so that
+they are shared by every worker process. A Feature Collection's counts are
+loaded from the database the first time they are needed and from then on
+every Feature that is created, deleted, or has its status changed through
+the ORM adjusts them. Any change we can't follow one Feature at a time
+(e.g., a bulk import) forgets the counts so that they are loaded again.
+
+Every change moves the counts on to their next version. Counts loaded from
+the database are only saved if the version hasn't moved since before they
+were counted, so a change committed while they were being counted is never
+lost. The counts expire after `ttl` seconds, so anything we couldn't follow
+is corrected the next time they are loaded.
+
+If Redis can't be reached, every method behaves as if nothing is cached.
+
+@method configure
+@method get
+@method version
+@method set
+@method increment
+@method forget
+
+"""
+class CommonsCounts():
+
+  """
+  Define our default variables
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (int) ttl
+      The number of seconds counts should be kept
+
+  @param (string) prefix
+      The prefix of every key we keep in Redis
+
+  """
+  def __init__(self, ttl=3600, prefix='commonscloud:counts:'):
+
+    self.ttl = ttl
+    self.prefix = prefix
+
+
+  """
+  Change the ttl of the counts, usually from the application configuration
+  once it is available
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (int) ttl
+      The number of seconds counts should be kept
+
+  """
+  def configure(self, ttl=None):
+
+    if ttl is not None:
+      self.ttl = ttl
+
+
+  def _key(self, storage):
+    return '%s%s' % (self.prefix, storage)
+
+
+  def _version_key(self, storage):
+    return '%s%s:version' % (self.prefix, storage)
+
+
+  """
+  Retrieve the counts for a Feature Collection
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @return (dict) counts
+      The number of Features with each status, or None if we don't have
+      them yet
+  """
+  def get(self, storage):
+
+    try:
+      counts = get_connection().hgetall(self._key(storage))
+    except RedisError as error:
+      logger.warning('Unable to read the Feature counts for %s: %s', storage, error)
+      return None
+
+    if not counts:
+      return None
+
+    return dict((status, int(count)) for status, count in counts.items())
+
+
+  """
+  The current version of the counts for a Feature Collection, this should
+  be read before the counts are loaded from the database
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @return (string) version
+      The version, or None if Redis can't be reached
+  """
+  def version(self, storage):
+
+    try:
+      return get_connection().get(self._version_key(storage)) or '0'
+    except RedisError as error:
+      logger.warning('Unable to read the version of the Feature counts for %s: %s', storage, error)
+      return None
+
+
+  """
+  Save the counts for a Feature Collection, replacing any we already have,
+  as long as they haven't changed since `version` was read
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @param (dict) counts
+      The number of Features with each status
+
+  @param (string) version
+      The version read (see version) before the counts were loaded
+
+  """
+  def set(self, storage, counts, version):
+
+    if version is None:
+      return
+
+    """
+    An empty hash can't be saved in Redis, so an empty Feature Collection
+    is saved with a count of zero public Features
+    """
+    counts = dict((status or '', count) for status, count in counts.items()) or {'public': 0}
+
+    arguments = [version, self.ttl]
+
+    for status, count in counts.items():
+      arguments += [status, count]
+
+    try:
+      connection = get_connection()
+      connection.register_script(SET_SCRIPT)(keys=[self._key(storage), self._version_key(storage)], args=arguments)
+    except RedisError as error:
+      logger.warning('Unable to save the Feature counts for %s: %s', storage, error)
+
+
+  """
+  Adjust the counts of a Feature Collection, only if we already have them
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @param (dict) changes
+      The number to add to (or subtract from) each status
+
+  """
+  def increment(self, storage, changes):
+
+    arguments = []
+
+    for status, amount in changes.items():
+      if amount:
+        arguments += [status or '', amount]
+
+    try:
+      connection = get_connection()
+      connection.register_script(INCREMENT_SCRIPT)(keys=[self._key(storage), self._version_key(storage)], args=arguments)
+    except RedisError as error:
+      logger.warning('Unable to update the Feature counts for %s: %s', storage, error)
+
+
+  """
+  Forget the counts of a Feature Collection so they are loaded again
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  """
+  def forget(self, storage):
+
+    try:
+      pipeline = get_connection().pipeline()
+      pipeline.delete(self._key(storage))
+      pipeline.incr(self._version_key(storage))
+      pipeline.execute()
+    except RedisError as error:
+      logger.warning('Unable to forget the Feature counts for %s: %s', storage, error)
+
+
+"""
+Keep track of the Features created, deleted, or changed during a flush so
+that the counts can be adjusted once (and only if) the transaction commits
+"""
+def _counts_flushed(session, flush_context):
+
+  changes = session.info.setdefault('feature_counts', {})
+
+  for instances, amount in ((session.new, 1), (session.deleted, -1)):
+    for instance in instances:
+
+      storage = getattr(instance, '__tablename__', '')
+
+      if not storage.startswith('type_') or not hasattr(instance, 'status'):
+        continue
+
+      storage_changes = changes.setdefault(storage, {})
+
+      if storage_changes is not None:
+        storage_changes[instance.status] = storage_changes.get(instance.status, 0) + amount
+
+  for instance in session.dirty:
+
+    storage = getattr(instance, '__tablename__', '')
+
+    if not storage.startswith('type_') or not hasattr(instance, 'status'):
+      continue
+
+    history = get_history(instance, 'status')
+
+    if not history.has_changes():
+      continue
+
+    storage_changes = changes.setdefault(storage, {})
+
+    if storage_changes is None:
+      continue
+
+    """
+    If we don't know what the status was before it changed we can't adjust
+    the counts, so they need to be loaded again
+    """
+    if not history.deleted:
+      changes[storage] = None
+      continue
+
+    for status in history.deleted:
+      storage_changes[status] = storage_changes.get(status, 0) - 1
+    for status in history.added:
+      storage_changes[status] = storage_changes.get(status, 0) + 1
+
+
+def _counts_committed(session):
+
+  from CommonsCloudAPI.extensions import counts
+
+  for storage, storage_changes in session.info.pop('feature_counts', {}).items():
+    if storage_changes is None:
+      counts.forget(storage)
+    else:
+      counts.increment(storage, storage_changes)
+
+
+"""
+A rollback may have undone changes we were going to count, so forget the
+counts of those Feature Collections instead of adjusting them
+"""
+def _counts_rolled_back(session, previous_transaction):
+
+  changes = session.info.get('feature_counts', {})
+
+  for storage in changes:
+    changes[storage] = None
+
+event.listen(Session, 'after_flush', _counts_flushed)
+event.listen(Session, 'after_commit', _counts_committed)
+event.listen(Session, 'after_soft_rollback', _counts_rolled_back)
@@ -0,0 +1,98 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import base64
+import json
+
+from datetime import datetime
+
+
+"""
+The columns a list of Features can be paged through with a cursor, the
+Feature `id` is always last so that every position in the list is unique
+"""
+CURSOR_KEYS = {
+  'id': ['id'],
+  'updated': ['updated', 'id']
+}
+
+_DATETIME_FORMATS = ['%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S']
+
+
+"""
+Build an opaque cursor pointing at a position in a list of Features
+
+@param (string) key
+    The name of the ordering the list is paged by (see CURSOR_KEYS)
+
+@param (list) values
+    The values of the ordering columns for the last Feature on the page
+
+@return (string) cursor
+    A URL safe string that can be handed back to request the next page
+"""
+def encode_cursor(key, values):
+
+  values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+
+  return base64.urlsafe_b64encode(json.dumps([key, values])).rstrip('=')
+
+
+"""
+Read a cursor created by encode_cursor
+
+@param (string) cursor
+    The cursor the user sent with their request
+
+@return (tuple) position
+    The name of the ordering and the values of its columns
+
+@raise (ValueError)
+    When the cursor wasn't created by encode_cursor
+"""
+def decode_cursor(cursor):
+
+  try:
+    key, values = json.loads(base64.urlsafe_b64decode(str(cursor) + '=' * (-len(cursor) % 4)))
+  except (TypeError, ValueError):
+    raise ValueError('The cursor is not valid')
+
+  if key not in CURSOR_KEYS or not isinstance(values, list) or len(values) != len(CURSOR_KEYS[key]):
+    raise ValueError('The cursor is not valid')
+
+  position = []
+
+  for column, value in zip(CURSOR_KEYS[key], values):
+
+    if column == 'updated' and value is not None:
+      value = _parse_datetime(value)
+    elif column == 'id' and not isinstance(value, (int, long)):
+      raise ValueError('The cursor is not valid')
+
+    position.append(value)
+
+  return key, position
+
+
+def _parse_datetime(value):
+
+  for format_ in _DATETIME_FORMATS:
+    try:
+      return datetime.strptime(value, format_)
+    except (TypeError, ValueError):
+      continue
+
+  raise ValueError('The cursor is not valid')
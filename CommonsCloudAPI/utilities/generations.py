@@ -0,0 +1,107 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import logging
+
+
+"""
+Import Flask Dependencies
+"""
+from flask.ext.rq import get_connection
+
+from redis.exceptions import RedisError
+
+
+"""
+This module is loaded by CommonsCloudAPI.extensions, so it can't use the
+logger that is defined there
+"""
+logger = logging.getLogger(__name__)
+
+
+"""
+Generation numbers kept in Redis, so that every worker process can tell when
+something it keeps in its own memory (see CommonsCache) has been changed by
+another worker
+
+Read the generation before loading the value it describes and save the value
+with that generation. Anything that changes the value moves it on to the next
+generation once the change has been committed, and every worker stops
+trusting its copy on its next read.
+
+If Redis can't be reached there is no generation, and nothing should be
+trusted from memory until it can be reached again.
+
+@method get
+@method increment
+
+"""
+class CommonsGenerations():
+
+  """
+  Define our default variables
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) prefix
+      The prefix of every key we keep in Redis
+
+  """
+  def __init__(self, prefix='commonscloud:generations:'):
+
+    self.prefix = prefix
+
+
+  """
+  Retrieve the current generation of one or more names
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (list) names
+      The names of the values (e.g., templates:type_XXXX)
+
+  @return (tuple) generation
+      The generation of each name, or None if Redis can't be reached
+  """
+  def get(self, *names):
+
+    try:
+      values = get_connection().mget(['%s%s' % (self.prefix, name) for name in names])
+    except RedisError as error:
+      logger.warning('Unable to read the generation of %s: %s', ', '.join(names), error)
+      return None
+
+    return tuple(int(value or 0) for value in values)
+
+
+  """
+  Move a name on to its next generation
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) name
+      The name of the value that changed
+
+  """
+  def increment(self, name):
+
+    try:
+      get_connection().incr('%s%s' % (self.prefix, name))
+    except RedisError as error:
+      logger.warning('Unable to move %s on to its next generation: %s', name, error)
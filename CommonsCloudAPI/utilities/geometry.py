@@ -10,13 +10,183 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+"""
+Import Python Dependencies
+"""
+import json
+import struct
+
 """
 Import Flask Dependencies
 """
 from geoalchemy2 import Geometry
 from geoalchemy2.functions import GenericFunction
 
+from sqlalchemy import func
+
 
 class ST_GeomFromGeoJSON(GenericFunction):
     name = 'ST_GeomFromGeoJSON'
-    type = Geometry
\ No newline at end of file
+    type = Geometry
+
+
+"""
+The spatial relationships a Feature can be searched by, each is named for
+how the Feature relates to the geometry in the request (e.g., `within` finds
+the Features that are within the requested geometry)
+"""
+SPATIAL_PREDICATES = ['intersects', 'within', 'contains', 'dwithin']
+
+
+"""
+A Geometry column that is selected as GeoJSON
+
+Every time a Feature is read, PostGIS converts the geometry to GeoJSON as
+part of the same SELECT, so serializing a Feature never needs to go back to
+the database. Writing to the column works exactly like a normal Geometry.
+"""
+class GeoJSONGeometry(Geometry):
+
+    def column_expression(self, col):
+      return func.ST_AsGeoJSON(col, type_=self)
+
+    def result_processor(self, dialect, coltype):
+      def process(value):
+        if value is None:
+          return None
+        return json.loads(value)
+      return process
+
+
+"""
+Convert a WKB or EWKB geometry to a GeoJSON geometry dictionary without
+asking the database to do it for us. This is only used for geometries that
+weren't selected through a GeoJSONGeometry column.
+
+@param (str) data
+    The binary representation of the geometry (e.g., WKBElement.data)
+
+@return (dict) geometry
+    A GeoJSON geometry dictionary
+"""
+def wkb_to_geojson(data):
+
+  geometry, offset = _read_wkb(bytes(data), 0)
+
+  return geometry
+
+
+_WKB_TYPES = {
+  1: 'Point',
+  2: 'LineString',
+  3: 'Polygon',
+  4: 'MultiPoint',
+  5: 'MultiLineString',
+  6: 'MultiPolygon',
+  7: 'GeometryCollection'
+}
+
+
+def _read_wkb(data, offset):
+
+  byte_order = '<' if struct.unpack_from('B', data, offset)[0] == 1 else '>'
+  offset += 1
+
+  wkb_type = struct.unpack_from(byte_order + 'I', data, offset)[0]
+  offset += 4
+
+  """
+  EWKB keeps the dimensions and SRID in the high bits of the type, ISO WKB
+  adds 1000 (Z), 2000 (M) or 3000 (ZM) to the type instead. GeoJSON has no
+  place for M, so it is read and left out of the coordinates.
+  """
+  has_z = bool(wkb_type & 0x80000000)
+  has_m = bool(wkb_type & 0x40000000)
+
+  if wkb_type & 0x20000000:
+    offset += 4
+
+  wkb_type = wkb_type & 0x0fffffff
+
+  if wkb_type > 1000:
+    has_z = has_z or wkb_type // 1000 in (1, 3)
+    has_m = has_m or wkb_type // 1000 in (2, 3)
+    wkb_type = wkb_type % 1000
+
+  dimensions = 2 + has_z + has_m
+
+  geometry_type = _WKB_TYPES[wkb_type]
+
+  def read_point(offset):
+    point = struct.unpack_from(byte_order + ('d' * dimensions), data, offset)
+    return list(point[:3] if has_z else point[:2]), offset + (8 * dimensions)
+
+  def read_count(offset):
+    return struct.unpack_from(byte_order + 'I', data, offset)[0], offset + 4
+
+  def read_ring(offset):
+    count, offset = read_count(offset)
+    points = []
+    for index in range(count):
+      point, offset = read_point(offset)
+      points.append(point)
+    return points, offset
+
+  def read_polygon(offset):
+    count, offset = read_count(offset)
+    rings = []
+    for index in range(count):
+      ring, offset = read_ring(offset)
+      rings.append(ring)
+    return rings, offset
+
+  if geometry_type == 'Point':
+    coordinates, offset = read_point(offset)
+  elif geometry_type == 'LineString':
+    coordinates, offset = read_ring(offset)
+  elif geometry_type == 'Polygon':
+    coordinates, offset = read_polygon(offset)
+  else:
+    count, offset = read_count(offset)
+    members = []
+    for index in range(count):
+      member, offset = _read_wkb(data, offset)
+      members.append(member)
+
+    if geometry_type == 'GeometryCollection':
+      return {'type': geometry_type, 'geometries': members}, offset
+
+    coordinates = [member['coordinates'] for member in members]
+
+  return {'type': geometry_type, 'coordinates': coordinates}, offset
+
+
+"""
+Half the width of the world in Web Mercator (EPSG:3857) meters
+"""
+WEB_MERCATOR_EXTENT = 20037508.342789244
+
+
+"""
+The bounds of a web map tile in Web Mercator (EPSG:3857) meters
+
+@param (int) z
+    The zoom level of the tile
+
+@param (int) x
+    The column of the tile, counted from the left
+
+@param (int) y
+    The row of the tile, counted from the top
+
+@return (tuple) bounds
+    The (xmin, ymin, xmax, ymax) of the tile
+"""
+def tile_bounds(z, x, y):
+
+  size = (2 * WEB_MERCATOR_EXTENT) / (2 ** z)
+
+  xmin = -WEB_MERCATOR_EXTENT + (x * size)
+  ymax = WEB_MERCATOR_EXTENT - (y * size)
+
+  return (xmin, ymax - size, xmin + size, ymax)
@@ -0,0 +1,303 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import hashlib
+import logging
+
+
+"""
+Import Flask Dependencies
+"""
+from flask.ext.rq import get_queue
+from flask.ext.rq import job
+
+from redis.exceptions import RedisError
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+
+"""
+This module is loaded by CommonsCloudAPI.extensions, so it can't use the
+logger that is defined there
+"""
+logger = logging.getLogger(__name__)
+
+
+"""
+PostgreSQL truncates identifiers longer than this, so longer index names are
+shortened with a hash before they ever reach the database
+"""
+MAX_IDENTIFIER_LENGTH = 63
+
+"""
+Field data types that are stored as a column we can put a B-tree index on,
+`textarea` isn't included because its values can be larger than a B-tree
+index entry is allowed to be
+"""
+INDEXED_DATA_TYPES = ['float', 'whole_number', 'text', 'email', 'phone', 'url', 'boolean', 'date', 'time', 'list']
+
+
+"""
+The indexes every Feature Collection should have
+
+The Feature storage tables, their `_users` permission tables, and the `ref_`
+association tables of relationship and file fields are all created while the
+application is running, so none of them are covered by our migrations. This
+keeps a list of the indexes each of them should have, creates the ones that
+are missing, and reports the Feature Collections that are still missing any.
+
+Indexes are built with CREATE INDEX CONCURRENTLY so that a Feature Collection
+can keep being read and written while its indexes are being built. Building
+them can take a long time on a large table, so when a Template or Field is
+created or updated they are built by an RQ worker (see enqueue_indexes)
+rather than while the user waits for their response.
+
+@method definitions
+@method missing
+@method ensure
+@method report
+
+"""
+class CommonsIndexes():
+
+  """
+  Every index a Template's tables should have
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (object) template
+      A fully qualified Template object
+
+  @return (list) definitions
+      One dictionary per index with the `name`, `table` and the `sql` that
+      will create it
+  """
+  def definitions(self, template):
+
+    storage = template.storage
+
+    if not storage:
+      return []
+
+    definitions = [
+      self._definition(storage, 'geometry', 'USING gist (geometry)'),
+      self._definition(storage, 'geography', 'USING gist (geography(geometry))'),
+      self._definition(storage, 'public', '(id) WHERE status = \'public\''),
+      self._definition(storage, 'owner', '(owner) WHERE owner IS NOT NULL'),
+      self._definition(storage, 'updated', '(updated, id)'),
+      self._definition(storage + '_users', 'feature', '(feature_id)')
+    ]
+
+    for field in template.fields:
+
+      if not field.status:
+        continue
+
+      """
+      Association tables only have a primary key of (parent_id, child_id),
+      which can't be used to find the Features that point at a child
+      """
+      if field.data_type in ('relationship', 'file') and field.association:
+        definitions.append(self._definition(field.association, 'child', '(child_id)'))
+
+      elif field.is_searchable and field.data_type in INDEXED_DATA_TYPES:
+        definitions.append(self._definition(storage, field.name, '("%s")' % (field.name)))
+
+    return definitions
+
+
+  def _definition(self, table, suffix, expression):
+
+    name = '%s_%s_idx' % (table, suffix)
+
+    if len(name) > MAX_IDENTIFIER_LENGTH:
+      name = '%s_%s_idx' % (table, hashlib.md5(suffix).hexdigest()[:10])
+
+    return {
+      'name': name,
+      'table': table,
+      'sql': 'CREATE INDEX CONCURRENTLY "%s" ON "%s" %s' % (name, table, expression)
+    }
+
+
+  def _existing(self, connection, tables):
+
+    result = connection.execute(text(
+      'SELECT c.relname, i.indisvalid FROM pg_index i '
+      'JOIN pg_class c ON c.oid = i.indexrelid '
+      'JOIN pg_class t ON t.oid = i.indrelid '
+      'WHERE t.relname = ANY(:tables)'), tables=list(tables))
+
+    return dict((name, valid) for name, valid in result)
+
+
+  """
+  The indexes a Template's tables should have but don't
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (object) template
+      A fully qualified Template object
+
+  @return (list) definitions
+      The definitions of the indexes that are missing, an index that failed
+      part way through being built is counted as missing
+  """
+  def missing(self, template):
+
+    from CommonsCloudAPI.extensions import db
+
+    definitions = self.definitions(template)
+
+    if not definitions:
+      return []
+
+    existing = self._existing(db.engine, set(definition['table'] for definition in definitions))
+
+    return [definition for definition in definitions if not existing.get(definition['name'], False)]
+
+
+  """
+  Create every index a Template's tables are missing
+
+  This is run by an RQ worker when a Template or Field is created or updated
+  (see ensure_indexes), if an index can't be built the error is logged and
+  the Feature Collection will show up in the report until it has been
+  backfilled
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (object) template
+      A fully qualified Template object
+
+  @return (list) created
+      The names of the indexes that were created
+  """
+  def ensure(self, template):
+
+    from CommonsCloudAPI.extensions import db
+
+    created = []
+
+    try:
+      missing = self.missing(template)
+    except SQLAlchemyError as error:
+      logger.warning('Unable to check the indexes of %s: %s', template.storage, error)
+      return created
+
+    if not missing:
+      return created
+
+    """
+    CREATE INDEX CONCURRENTLY can't be run inside of a transaction
+    """
+    connection = db.engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+
+    try:
+      existing = self._existing(connection, set(definition['table'] for definition in missing))
+
+      for definition in missing:
+        try:
+          if definition['name'] in existing:
+            connection.execute('DROP INDEX CONCURRENTLY IF EXISTS "%s"' % (definition['name']))
+          connection.execute(definition['sql'])
+          created.append(definition['name'])
+        except SQLAlchemyError as error:
+          logger.warning('Unable to create the index %s: %s', definition['name'], error)
+    finally:
+      connection.close()
+
+    return created
+
+
+  """
+  The Feature Collections that are missing any of their indexes
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (list) templates
+      Fully qualified Template objects
+
+  @return (list) report
+      One dictionary per Feature Collection that is missing indexes, with
+      the Template `id`, `name`, `storage` and the names of the `missing`
+      indexes
+  """
+  def report(self, templates):
+
+    report = []
+
+    for template in templates:
+
+      missing = self.missing(template)
+
+      if missing:
+        report.append({
+          'id': template.id,
+          'name': template.name,
+          'storage': template.storage,
+          'missing': [definition['name'] for definition in missing]
+        })
+
+    return report
+
+
+"""
+Queue the indexes of a Template to be built by an RQ worker, if they can't
+be queued the Feature Collection will show up in the report until it has
+been backfilled
+
+@param (object) template
+    A fully qualified Template object, it must already be committed
+
+"""
+def enqueue_indexes(template):
+
+  try:
+    get_queue().enqueue_call(func=ensure_indexes, args=(template.id,), timeout=3600)
+  except RedisError as error:
+    logger.warning('Unable to queue the indexes of %s: %s', template.storage, error)
+
+
+"""
+Create every index a Template's tables are missing, on an RQ worker
+
+@param (int) template_id
+    The unique ID of the Template
+
+@return (list) created
+    The names of the indexes that were created
+"""
+@job
+def ensure_indexes(template_id):
+
+  from CommonsCloudAPI.extensions import indexes
+  from CommonsCloudAPI.importer import importer_context
+  from CommonsCloudAPI.models.template import Template
+
+  with importer_context():
+
+    template = Template.query.get(template_id)
+
+    if template is None:
+      return []
+
+    return indexes.ensure(template)
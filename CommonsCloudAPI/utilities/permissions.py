@@ -0,0 +1,244 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import Flask Dependencies
+"""
+from flask import g
+from flask import has_app_context
+
+from sqlalchemy import event
+from sqlalchemy import literal
+from sqlalchemy import null
+from sqlalchemy import select
+from sqlalchemy import union_all
+from sqlalchemy.orm import Session
+
+
+"""
+Import Commons Cloud Dependencies
+"""
+from CommonsCloudAPI.extensions import db
+from CommonsCloudAPI.extensions import generations
+from CommonsCloudAPI.extensions import logger
+from CommonsCloudAPI.extensions import permissions as permission_cache
+
+
+"""
+The permission types that can be granted on Applications, Templates, and
+Fields. Only Templates have `is_moderator`.
+"""
+PERMISSION_TYPES = ['read', 'write', 'is_moderator', 'is_admin']
+
+GRANT_TABLES = {
+  'applications': ('user_applications', 'application_id'),
+  'templates': ('user_templates', 'template_id'),
+  'fields': ('user_fields', 'field_id')
+}
+
+
+"""
+The Application, Template, and Field permissions of a single User
+
+Every grant the User has is loaded with one query the first time it is
+needed and kept in sets, so checking a permission any number of times
+during a request never goes back to the database.
+
+@method allowed
+@method public_templates
+
+"""
+class CommonsPermissions():
+
+  """
+  Define our default variables
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (object) user
+      The User we are resolving permissions for
+
+  """
+  def __init__(self, user):
+
+    self.user_id = getattr(user, 'id', None)
+    self.grants = None
+
+
+  """
+  Load every Application, Template, and Field grant for the User
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  """
+  def load(self):
+
+    self.grants = {}
+
+    for kind in GRANT_TABLES:
+      self.grants[kind] = dict((permission_type, set()) for permission_type in PERMISSION_TYPES)
+
+    if self.user_id is None:
+      return
+
+    selects = []
+
+    for kind, (table_name, id_column) in GRANT_TABLES.items():
+
+      table = db.metadata.tables[table_name]
+
+      columns = [
+        literal(kind).label('kind'),
+        table.c[id_column].label('id')
+      ]
+
+      for permission_type in PERMISSION_TYPES:
+        if permission_type in table.c:
+          columns.append(table.c[permission_type].label(permission_type))
+        else:
+          columns.append(null().label(permission_type))
+
+      selects.append(select(columns).where(table.c.user_id == self.user_id))
+
+    for grant in db.session.execute(union_all(*selects)):
+      for permission_type in PERMISSION_TYPES:
+        if grant[permission_type]:
+          self.grants[grant['kind']][permission_type].add(grant['id'])
+
+
+  """
+  The IDs of the Applications, Templates, or Fields the User has been
+  explicitly granted a specific permission on
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) kind
+      One of `applications`, `templates`, or `fields`
+
+  @param (string) permission_type
+      The permission to check for (e.g., read, write, is_admin)
+
+  @return (set) ids
+      The IDs the User has the requested permission on
+  """
+  def allowed(self, kind, permission_type='read'):
+
+    if self.grants is None:
+      self.load()
+
+    if not permission_type:
+      return set()
+
+    return self.grants[kind].get(permission_type, set())
+
+
+  """
+  The IDs of every Template that is marked as `is_public`. These are the
+  same for every User, so they are shared across requests for as long as
+  their generation in Redis doesn't change (see _permissions_committed).
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (frozenset) ids
+      The IDs of all public Templates
+  """
+  def public_templates(self):
+
+    generation = generations.get('public_templates')
+
+    public_templates_ = None
+
+    if generation is not None:
+      public_templates_ = permission_cache.get('public_templates', generation)
+
+    if public_templates_ is None:
+
+      table = db.metadata.tables['template']
+      statement = select([table.c.id]).where(table.c.is_public == True)
+
+      public_templates_ = frozenset([row[0] for row in db.session.execute(statement)])
+
+      if generation is not None:
+        permission_cache.set('public_templates', public_templates_, generation)
+
+    return public_templates_
+
+
+"""
+Get the permission resolver for a User, creating it the first time it is
+needed during the current request
+
+@param (object) user
+    The User we are resolving permissions for
+
+@return (object) permissions
+    A CommonsPermissions object
+"""
+def get_permissions(user):
+
+  user_id = getattr(user, 'id', None)
+
+  if not has_app_context():
+    return CommonsPermissions(user)
+
+  if not hasattr(g, 'permissions'):
+    g.permissions = {}
+
+  if user_id not in g.permissions:
+    g.permissions[user_id] = CommonsPermissions(user)
+
+  return g.permissions[user_id]
+
+
+"""
+Whenever grants or Templates are added, changed, or removed, forget what we
+have already resolved so that the next check sees the change
+"""
+def _permissions_changed(session, flush_context):
+
+  table_names = set()
+
+  for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+    table_names.add(getattr(instance, '__tablename__', None))
+
+  if 'template' in table_names:
+    session.info['public_templates_changed'] = True
+
+  if table_names & set(['user_applications', 'user_templates', 'user_fields']):
+    if has_app_context() and hasattr(g, 'permissions'):
+      g.permissions = {}
+
+
+"""
+Other workers keep their own copy of the public Templates, so they are only
+told about a change once it has been committed, otherwise they could load
+the Templates again before the change is visible and keep the old ones
+"""
+def _permissions_committed(session):
+
+  if session.info.pop('public_templates_changed', False):
+    logger.debug('Templates changed, clearing the public Template cache')
+    permission_cache.delete('public_templates')
+    generations.increment('public_templates')
+
+
+def _permissions_rolled_back(session, previous_transaction):
+  session.info.pop('public_templates_changed', None)
+
+event.listen(Session, 'after_flush', _permissions_changed)
+event.listen(Session, 'after_commit', _permissions_committed)
+event.listen(Session, 'after_soft_rollback', _permissions_rolled_back)
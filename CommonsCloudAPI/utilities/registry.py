@@ -0,0 +1,189 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import hashlib
+import threading
+
+
+"""
+An in-process registry of the dynamic Feature models that are built by
+CommonsModel.get_storage
+
+Building a model means reflecting the `type_` table and each of its
+association tables and then mapping a brand new class with `type()`, so we
+only want to do that when the Template or its Fields have actually changed.
+Models are keyed by the storage name and a flavor (e.g., full or slim) and
+every entry remembers the schema version it was built from (see
+CommonsModel.storage_version, which includes the Fields of related Templates).
+
+@method get
+@method set
+@method version
+@method invalidate
+@method stats
+
+"""
+class CommonsModelRegistry():
+
+  """
+  Define our default variables
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  """
+  def __init__(self):
+
+    self.models = {}
+    self.lock = threading.Lock()
+
+    self.hits = 0
+    self.misses = 0
+    self.rebuilds = 0
+
+
+  """
+  Retrieve a previously built model from the registry
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (tuple) key
+      The storage name and model flavor we are looking for
+
+  @param (string) version
+      The schema version the caller expects the model to be built from
+
+  @return (object) model
+      The mapped class or None if it needs to be (re)built
+
+  """
+  def get(self, key, version=None):
+
+    with self.lock:
+
+      entry = self.models.get(key, None)
+
+      if entry is None:
+        self.misses += 1
+        return None
+
+      if entry[0] != version:
+        self.rebuilds += 1
+        del self.models[key]
+        return None
+
+      self.hits += 1
+
+      return entry[1]
+
+
+  """
+  Save a newly built model to the registry
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (tuple) key
+      The storage name and model flavor of the model
+
+  @param (string) version
+      The schema version the model was built from
+
+  @param (object) model
+      The mapped class to hand back on future requests
+
+  @return (object) model
+      The same mapped class, so this can be used inline
+
+  """
+  def set(self, key, version, model):
+
+    with self.lock:
+      self.models[key] = (version, model)
+
+    return model
+
+
+  """
+  Create a short, stable version string based on the Fields that make up
+  a Template. Any change to a Field that affects the shape of the model
+  (e.g., name, data type, relationship) results in a new version.
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (list) fields
+      A list of fully qualified Field objects
+
+  @return (string) version
+      A hash representing the current schema of the Template
+
+  """
+  def version(self, fields):
+
+    signature = []
+
+    for field in fields:
+      signature.append((field.id, field.name, field.data_type, field.relationship, field.association))
+
+    return hashlib.md5(repr(sorted(signature))).hexdigest()
+
+
+  """
+  Remove every model that was built for a specific storage, or every model
+  in the registry when no storage is given. Models that reference the
+  storage through a relationship are removed as well.
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name (e.g., type_XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX)
+
+  """
+  def invalidate(self, storage=None):
+
+    with self.lock:
+
+      if storage is None:
+        self.models = {}
+        return
+
+      for key in self.models.keys():
+        model = self.models[key][1]
+        if key[0] == storage or storage in getattr(model, '__relationships__', []):
+          del self.models[key]
+
+
+  """
+  Counters that allow us to keep an eye on the registry under load
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (dict) stats
+      The number of models, hits, misses, and rebuilds
+
+  """
+  def stats(self):
+
+    return {
+      'models': len(self.models),
+      'hits': self.hits,
+      'misses': self.misses,
+      'rebuilds': self.rebuilds
+    }
@@ -0,0 +1,286 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System Dependencies
+"""
+import json
+import logging
+
+
+"""
+Import Flask Dependencies
+"""
+from flask import Response
+
+from flask.ext.rq import get_connection
+
+from redis.exceptions import RedisError
+
+
+"""
+This module is loaded by CommonsCloudAPI.extensions, so it can't use the
+logger that is defined there
+"""
+logger = logging.getLogger(__name__)
+
+
+"""
+A cache of complete responses for public Feature Collections, kept in Redis
+so that it is shared by every worker process
+
+Every Feature Collection has a generation number that is part of the key of
+each of its responses. Changing a Feature, the Template, or its Fields moves
+the Feature Collection on to the next generation, which makes every response
+that was cached for it unreachable at once. Old responses expire on their
+own after `ttl` seconds.
+
+The generation is read once, with `key`, before the response is built. The
+response is then read and saved under that exact key, so a response built
+while the Feature Collection was being changed is saved under the old
+generation, where it can never be read.
+
+If Redis can't be reached, every response is treated as a miss.
+
+@method configure
+@method key
+@method get
+@method set
+@method invalidate
+@method stats
+
+"""
+class CommonsResponseCache():
+
+  """
+  Define our default variables
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (int) ttl
+      The number of seconds a response should be kept
+
+  @param (string) prefix
+      The prefix of every key we keep in Redis
+
+  """
+  def __init__(self, ttl=300, prefix='commonscloud:responses:'):
+
+    self.ttl = ttl
+    self.prefix = prefix
+
+
+  """
+  Change the ttl of the cache, usually from the application configuration
+  once it is available
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (int) ttl
+      The number of seconds a response should be kept
+
+  """
+  def configure(self, ttl=None):
+
+    if ttl is not None:
+      self.ttl = ttl
+
+
+  """
+  The key a response is read and saved under, this includes the current
+  generation of the Feature Collection and must be read before the
+  response is built
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @param (string) key
+      A key that describes the response (e.g., a hash of the request)
+
+  @return (string) key
+      The key to read and save the response under, or None if Redis can't
+      be reached
+  """
+  def key(self, storage, key):
+
+    try:
+      generation = get_connection().get('%s%s:generation' % (self.prefix, storage)) or 0
+    except RedisError as error:
+      logger.warning('Unable to read the response cache generation for %s: %s', storage, error)
+      return None
+
+    return '%s%s:%s:%s' % (self.prefix, storage, generation, key)
+
+
+  def _count(self, connection, counter):
+    connection.hincrby('%sstats' % (self.prefix), counter, 1)
+
+
+  """
+  Retrieve a response from the cache
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @param (string) key
+      The key the response was saved under (see key)
+
+  @return (object) response
+      A new Flask response, or None if there isn't one in the cache
+  """
+  def get(self, storage, key):
+
+    try:
+      connection = get_connection()
+
+      entry = connection.hgetall(key)
+
+      self._count(connection, 'hits' if entry else 'misses')
+    except RedisError as error:
+      logger.warning('Unable to read a cached response for %s: %s', storage, error)
+      return None
+
+    if not entry:
+      return None
+
+    response = Response(entry['body'], status=int(entry['status']), mimetype=entry['mimetype'])
+
+    for header, value in json.loads(entry['headers']):
+      if header.lower() not in ('content-type', 'content-length'):
+        response.headers.add(header, value)
+
+    return response
+
+
+  """
+  Save a response to the cache
+
+  Responses that are streamed are saved once the last chunk has been sent
+  to the user, so a response is never read into memory just to cache it.
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  @param (string) key
+      The key to save the response under, read (see key) before the
+      response was built
+
+  @param (object) response
+      The Flask response being sent to the user
+
+  @return (object) response
+      The response that should be sent to the user instead
+
+  """
+  def set(self, storage, key, response):
+
+    if response.status_code != 200:
+      return response
+
+    entry = {
+      'status': response.status_code,
+      'mimetype': response.mimetype,
+      'headers': json.dumps(response.headers.to_list())
+    }
+
+    def save(body):
+      entry['body'] = body
+      try:
+        pipeline = get_connection().pipeline()
+        pipeline.hmset(key, entry)
+        pipeline.expire(key, self.ttl)
+        pipeline.execute()
+      except RedisError as error:
+        logger.warning('Unable to cache a response for %s: %s', storage, error)
+
+    if not response.is_streamed:
+      save(response.get_data())
+      return response
+
+    chunks = response.response
+
+    def stream():
+
+      body = []
+
+      for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+
+      save(''.join(body))
+
+    response.response = stream()
+
+    return response
+
+
+  """
+  Make every response cached for a Feature Collection unreachable
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @param (string) storage
+      The storage name of the Feature Collection
+
+  """
+  def invalidate(self, storage):
+
+    if not storage:
+      return
+
+    try:
+      get_connection().incr('%s%s:generation' % (self.prefix, storage))
+    except RedisError as error:
+      logger.warning('Unable to invalidate the cached responses for %s: %s', storage, error)
+
+
+  """
+  Counters that allow us to keep an eye on the cache under load, these are
+  shared by every worker process
+
+  @param (object) self
+      The object we are acting on behalf of
+
+  @return (dict) stats
+      The number of hits and misses and the ratio of hits to requests
+
+  """
+  def stats(self):
+
+    try:
+      counters = get_connection().hgetall('%sstats' % (self.prefix))
+    except RedisError as error:
+      logger.warning('Unable to read the response cache stats: %s', error)
+      counters = {}
+
+    hits = int(counters.get('hits', 0))
+    misses = int(counters.get('misses', 0))
+
+    return {
+      'ttl': self.ttl,
+      'hits': hits,
+      'misses': misses,
+      'hit_ratio': round(hits / float(hits + misses), 4) if hits + misses else None
+    }
@@ -0,0 +1,364 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Encode GeoJSON Features as a TopoJSON Topology
+
+Every line and polygon ring is broken into arcs wherever it meets another
+line or ring, and each arc is only stored once no matter how many geometries
+use it (in either direction). Boundaries shared by adjacent polygons, which
+GeoJSON repeats for both polygons, are stored a single time.
+
+When `quantization` is given, coordinates are snapped to a grid of that many
+points across the bounding box of every Feature and arcs are delta encoded,
+so most coordinates become small integers.
+
+@see https://github.com/topojson/topojson-specification
+
+@param (list) features
+    Feature dictionaries, each with a GeoJSON `geometry`, an `id` and any
+    number of other properties
+
+@param (string) name
+    The name of the GeometryCollection in the Topology's `objects`
+
+@param (int) quantization
+    The number of distinct values along each axis, or 0 to keep the original
+    coordinates
+
+@return (dict) topology
+    A TopoJSON Topology
+"""
+def encode_topology(features, name='features', quantization=10000):
+
+  geometries = [feature.get('geometry', None) for feature in features]
+
+  bbox = _bounding_box(geometries)
+
+  if quantization and bbox is not None:
+    transform = _transform(bbox, quantization)
+  else:
+    transform = None
+
+  topology = _Topology(transform)
+
+  collection = []
+
+  for feature, geometry in zip(features, geometries):
+
+    properties = {}
+
+    for property_ in feature:
+      if property_ != 'geometry':
+        properties[property_] = feature[property_]
+
+    object_ = topology.geometry(geometry)
+    object_['id'] = feature.get('id', None)
+    object_['properties'] = properties
+
+    collection.append(object_)
+
+  topology.cut()
+
+  result = {
+    'type': 'Topology',
+    'objects': {
+      name: {
+        'type': 'GeometryCollection',
+        'geometries': collection
+      }
+    },
+    'arcs': topology.encode_arcs()
+  }
+
+  if bbox is not None:
+    result['bbox'] = bbox
+
+  if transform is not None:
+    result['transform'] = {
+      'scale': [transform[0], transform[1]],
+      'translate': [transform[2], transform[3]]
+    }
+
+  return result
+
+
+def _bounding_box(geometries):
+
+  x0 = y0 = float('inf')
+  x1 = y1 = float('-inf')
+
+  for geometry in geometries:
+    for point in _points(geometry):
+      x0 = min(x0, point[0])
+      y0 = min(y0, point[1])
+      x1 = max(x1, point[0])
+      y1 = max(y1, point[1])
+
+  if x0 > x1:
+    return None
+
+  return [x0, y0, x1, y1]
+
+
+def _points(geometry):
+
+  if not geometry:
+    return
+
+  if geometry.get('type') == 'GeometryCollection':
+    for member in geometry.get('geometries', []):
+      for point in _points(member):
+        yield point
+    return
+
+  def walk(coordinates):
+    if coordinates and isinstance(coordinates[0], (int, long, float)):
+      yield coordinates
+    else:
+      for member in coordinates or []:
+        for point in walk(member):
+          yield point
+
+  for point in walk(geometry.get('coordinates', [])):
+    yield point
+
+
+def _transform(bbox, quantization):
+
+  x0, y0, x1, y1 = bbox
+
+  kx = (x1 - x0) / float(quantization - 1) if x1 > x0 else 1
+  ky = (y1 - y0) / float(quantization - 1) if y1 > y0 else 1
+
+  return (kx, ky, x0, y0)
+
+
+"""
+Collects the lines and rings of every geometry, finds the junctions where
+they meet, and cuts them into shared arcs
+"""
+class _Topology():
+
+  def __init__(self, transform):
+
+    self.transform = transform
+
+    """
+    Lines and rings in the order they were added, and the placeholders in
+    the output geometries that are filled in with arc indexes once every
+    line and ring is known
+    """
+    self.lines = []
+    self.references = []
+
+    self.arcs = []
+    self.arc_indexes = {}
+    self.ring_indexes = {}
+
+
+  def point(self, coordinates):
+
+    if self.transform is None:
+      return (coordinates[0], coordinates[1])
+
+    kx, ky, x0, y0 = self.transform
+
+    return (int(round((coordinates[0] - x0) / kx)), int(round((coordinates[1] - y0) / ky)))
+
+
+  def line(self, coordinates, ring=False):
+
+    points = []
+
+    for coordinates_ in coordinates:
+      point = self.point(coordinates_)
+      if not points or points[-1] != point:
+        points.append(point)
+
+    if ring and len(points) > 1 and points[0] == points[-1]:
+      points.pop()
+
+    reference = []
+
+    self.lines.append((points, ring))
+    self.references.append(reference)
+
+    return reference
+
+
+  def geometry(self, geometry):
+
+    if not geometry:
+      return {'type': None}
+
+    type_ = geometry.get('type')
+    coordinates = geometry.get('coordinates', [])
+
+    if type_ == 'GeometryCollection':
+      return {
+        'type': type_,
+        'geometries': [self.geometry(member) for member in geometry.get('geometries', [])]
+      }
+    elif type_ == 'Point':
+      return {'type': type_, 'coordinates': list(self.point(coordinates))}
+    elif type_ == 'MultiPoint':
+      return {'type': type_, 'coordinates': [list(self.point(point)) for point in coordinates]}
+    elif type_ == 'LineString':
+      return {'type': type_, 'arcs': self.line(coordinates)}
+    elif type_ == 'MultiLineString':
+      return {'type': type_, 'arcs': [self.line(line) for line in coordinates]}
+    elif type_ == 'Polygon':
+      return {'type': type_, 'arcs': [self.line(ring, ring=True) for ring in coordinates]}
+    elif type_ == 'MultiPolygon':
+      return {'type': type_, 'arcs': [[self.line(ring, ring=True) for ring in polygon] for polygon in coordinates]}
+
+    return {'type': None}
+
+
+  def junctions(self):
+
+    neighbors = {}
+    junctions = set()
+
+    for points, ring in self.lines:
+
+      count = len(points)
+
+      for index, point in enumerate(points):
+
+        if ring:
+          previous_ = points[index - 1]
+          next_ = points[(index + 1) % count]
+        elif index == 0 or index == count - 1:
+          junctions.add(point)
+          continue
+        else:
+          previous_ = points[index - 1]
+          next_ = points[index + 1]
+
+        """
+        A point is a junction when the lines passing through it don't all
+        come from and go to the same neighboring points
+        """
+        pair = (previous_, next_) if previous_ < next_ else (next_, previous_)
+
+        seen = neighbors.get(point, None)
+
+        if seen is None:
+          neighbors[point] = pair
+        elif seen != pair:
+          junctions.add(point)
+
+    return junctions
+
+
+  def cut(self):
+
+    junctions = self.junctions()
+
+    for (points, ring), reference in zip(self.lines, self.references):
+
+      if not points:
+        continue
+
+      if ring:
+
+        """
+        Start each ring at one of its junctions so that it is cut into the
+        same arcs as its neighbors, a ring without any junctions is kept
+        whole and started at its smallest point so that identical rings are
+        stored once
+        """
+        starts = [index for index, point in enumerate(points) if point in junctions]
+
+        if not starts:
+          reference.append(self.ring_arc(points))
+          continue
+
+        points = points[starts[0]:] + points[:starts[0]] + [points[starts[0]]]
+
+      elif len(points) == 1:
+        points = points * 2
+
+      start = 0
+
+      for index in range(1, len(points)):
+        if points[index] in junctions or index == len(points) - 1:
+          reference.append(self.arc(points[start:index + 1]))
+          start = index
+
+
+  def arc(self, points):
+
+    key = tuple(points)
+
+    if key in self.arc_indexes:
+      return self.arc_indexes[key]
+
+    reversed_key = tuple(reversed(points))
+
+    if reversed_key in self.arc_indexes:
+      return ~self.arc_indexes[reversed_key]
+
+    self.arc_indexes[key] = len(self.arcs)
+    self.arcs.append(points)
+
+    return self.arc_indexes[key]
+
+
+  def ring_arc(self, points):
+
+    forward = _rotate(points)
+    backward = _rotate(list(reversed(points)))
+
+    key = tuple(forward)
+
+    if key in self.ring_indexes:
+      return self.ring_indexes[key]
+
+    if tuple(backward) in self.ring_indexes:
+      return ~self.ring_indexes[tuple(backward)]
+
+    self.ring_indexes[key] = len(self.arcs)
+    self.arcs.append(forward + [forward[0]])
+
+    return self.ring_indexes[key]
+
+
+  def encode_arcs(self):
+
+    if self.transform is None:
+      return [[list(point) for point in arc] for arc in self.arcs]
+
+    encoded = []
+
+    for arc in self.arcs:
+
+      x, y = 0, 0
+      deltas = []
+
+      for point in arc:
+        deltas.append([point[0] - x, point[1] - y])
+        x, y = point
+
+      encoded.append(deltas)
+
+    return encoded
+
+
+def _rotate(points):
+
+  start = points.index(min(points))
+
+  return points[start:] + points[:start]
@@ -0,0 +1,24 @@
+"""Add chunks_total and chunks_complete columns to Activity
+
+Revision ID: 4a7c2e91d3f5
+Revises: b2b288b8170
+Create Date: 2026-10-17 09:12:41.203318
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '4a7c2e91d3f5'
+down_revision = 'b2b288b8170'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('activity', sa.Column('chunks_total', sa.Integer, nullable=False, server_default='0'))
+    op.add_column('activity', sa.Column('chunks_complete', sa.Integer, nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('activity', 'chunks_complete')
+    op.drop_column('activity', 'chunks_total')
@@ -0,0 +1,30 @@
+"""Add a notification_failure table for Notifications that couldn't be delivered
+
+Revision ID: 5d81b3f60c2a
+Revises: 4a7c2e91d3f5
+Create Date: 2026-10-17 15:40:07.518264
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '5d81b3f60c2a'
+down_revision = '4a7c2e91d3f5'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('notification_failure',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('notification_id', sa.Integer, sa.ForeignKey('notification.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('signal', sa.String(255)),
+        sa.Column('payload', sa.Text),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('error', sa.Text),
+        sa.Column('created', sa.DateTime)
+    )
+
+
+def downgrade():
+    op.drop_table('notification_failure')
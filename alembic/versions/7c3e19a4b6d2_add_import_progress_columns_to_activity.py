@@ -0,0 +1,32 @@
+"""Add import progress columns to Activity
+
+Revision ID: 7c3e19a4b6d2
+Revises: 5d81b3f60c2a
+Create Date: 2026-10-17 17:05:32.841907
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '7c3e19a4b6d2'
+down_revision = '5d81b3f60c2a'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('activity', sa.Column('started', sa.DateTime, nullable=True))
+    op.add_column('activity', sa.Column('rows_processed', sa.Integer, nullable=False, server_default='0'))
+    op.add_column('activity', sa.Column('rows_created', sa.Integer, nullable=False, server_default='0'))
+    op.add_column('activity', sa.Column('rows_failed', sa.Integer, nullable=False, server_default='0'))
+    op.add_column('activity', sa.Column('rows_per_second', sa.Float, nullable=False, server_default='0'))
+    op.add_column('activity', sa.Column('peak_rss_kb', sa.Integer, nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('activity', 'peak_rss_kb')
+    op.drop_column('activity', 'rows_per_second')
+    op.drop_column('activity', 'rows_failed')
+    op.drop_column('activity', 'rows_created')
+    op.drop_column('activity', 'rows_processed')
+    op.drop_column('activity', 'started')
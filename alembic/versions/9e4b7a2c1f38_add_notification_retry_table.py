@@ -0,0 +1,34 @@
+"""Add a notification_retry table for Notifications waiting to be retried
+
+Revision ID: 9e4b7a2c1f38
+Revises: 7c3e19a4b6d2
+Create Date: 2026-10-17 19:12:44.302187
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '9e4b7a2c1f38'
+down_revision = '7c3e19a4b6d2'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table('notification_retry',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('notification_id', sa.Integer, sa.ForeignKey('notification.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('signal', sa.String(255)),
+        sa.Column('payload', sa.Text),
+        sa.Column('attempt', sa.Integer, nullable=False),
+        sa.Column('delivered', sa.Text),
+        sa.Column('error', sa.Text),
+        sa.Column('next_attempt', sa.DateTime, nullable=False),
+        sa.Column('created', sa.DateTime)
+    )
+    op.create_index('ix_notification_retry_next_attempt', 'notification_retry', ['next_attempt'])
+
+
+def downgrade():
+    op.drop_index('ix_notification_retry_next_attempt', 'notification_retry')
+    op.drop_table('notification_retry')
@@ -0,0 +1,59 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System/Python level dependencies
+"""
+import json
+import sys
+
+
+"""
+Import Application specific dependencies
+"""
+from CommonsCloudAPI import create_application
+
+from CommonsCloudAPI.extensions import indexes
+
+from CommonsCloudAPI.models.template import Template
+
+
+"""
+Report or backfill the indexes of every Feature Collection
+
+    python manage_indexes.py <environment> report
+    python manage_indexes.py <environment> backfill
+
+`report` lists the Feature Collections that are missing indexes, `backfill`
+creates them. Feature Collections created before indexes were managed by
+the application need to be backfilled once.
+
+"""
+if __name__ == "__main__":
+
+    if len(sys.argv) < 3 or sys.argv[2] not in ('report', 'backfill'):
+        sys.exit('Usage: python manage_indexes.py <environment> report|backfill')
+
+    CommonsCloudAPI = create_application(__name__, env=sys.argv[1])
+
+    with CommonsCloudAPI.app_context():
+
+        templates = Template.query.filter(Template.storage != None).order_by(Template.id).all()
+
+        if sys.argv[2] == 'backfill':
+            for template in templates:
+                created = indexes.ensure(template)
+                if created:
+                    print 'Template %d (%s): created %s' % (template.id, template.storage, ', '.join(created))
+
+        print json.dumps(indexes.report(templates), indent=2)
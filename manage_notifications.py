@@ -0,0 +1,48 @@
+"""
+For CommonsCloud copyright information please see the LICENSE document
+(the "License") included with this software package. This file may not
+be used in any manner except in compliance with the License
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Import System/Python level dependencies
+"""
+import sys
+
+
+"""
+Import Application specific dependencies
+"""
+from CommonsCloudAPI import create_application
+
+from CommonsCloudAPI.notifications import enqueue_due_notification_retries
+
+
+"""
+Queue the retries of Notifications that have come due
+
+    python manage_notifications.py <environment> sweep
+
+Notifications that fail wait in the notification_retry table until their
+backoff has passed. Run this every minute (e.g., from cron) so that retries
+are queued even when no new Notifications are being sent. The retries are
+run by the same RQ workers as every other job (`rqworker`).
+
+"""
+if __name__ == "__main__":
+
+    if len(sys.argv) < 3 or sys.argv[2] != 'sweep':
+        sys.exit('Usage: python manage_notifications.py <environment> sweep')
+
+    CommonsCloudAPI = create_application(__name__, env=sys.argv[1])
+
+    with CommonsCloudAPI.app_context():
+
+        print 'Queued %d Notification retries' % (enqueue_due_notification_retries())